@@ -1,11 +1,74 @@
-from .toolkit import WikESToolkit
+"""Public names are imported on first access (PEP 562), so `import wikes_toolkit` does not load networkx, pandas or
+the graph backends until they are used."""
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-from wikes_toolkit.esbm.esbm_versions import ESBMVersions
-from wikes_toolkit.esbm.esbm_graph import ESBMGraph as ESBMGraph
-from wikes_toolkit.esbm.esbm_pandas_graph import PandasESBMGraph as PandasESBMGraph
-from wikes_toolkit.esbm.esbm_graph_components import ESBMEntity, ESBMPredicate, ESBMRootEntity
+_LAZY_IMPORTS = {
+    'WikESToolkit': 'wikes_toolkit.toolkit',
+    'AsyncWikESToolkit': 'wikes_toolkit.async_toolkit',
+    'DatasetStore': 'wikes_toolkit.base.dataset_store',
+    'Vocabulary': 'wikes_toolkit.base.vocabulary',
+    'shared_vocabulary': 'wikes_toolkit.base.vocabulary',
 
-from wikes_toolkit.wikes.wikes_versions import WikESVersions
-from wikes_toolkit.wikes.wikes_graph import WikESGraph
-from wikes_toolkit.wikes.wikes_pandas_graph import PandasWikESGraph
-from wikes_toolkit.wikes.wikies_graph_components import WikiEntity, WikiPredicate, WikiRootEntity
+    'ESBMVersions': 'wikes_toolkit.esbm.esbm_versions',
+    'ESBMGraph': 'wikes_toolkit.esbm.esbm_graph',
+    'PandasESBMGraph': 'wikes_toolkit.esbm.esbm_pandas_graph',
+    'ESBMEntity': 'wikes_toolkit.esbm.esbm_graph_components',
+    'ESBMPredicate': 'wikes_toolkit.esbm.esbm_graph_components',
+    'ESBMRootEntity': 'wikes_toolkit.esbm.esbm_graph_components',
+
+    'WikESVersions': 'wikes_toolkit.wikes.wikes_versions',
+    'WikESGraph': 'wikes_toolkit.wikes.wikes_graph',
+    'PandasWikESGraph': 'wikes_toolkit.wikes.wikes_pandas_graph',
+    'WikiEntity': 'wikes_toolkit.wikes.wikies_graph_components',
+    'WikiPredicate': 'wikes_toolkit.wikes.wikies_graph_components',
+    'WikiRootEntity': 'wikes_toolkit.wikes.wikies_graph_components',
+
+    'SyntheticVersions': 'wikes_toolkit.synthetic.synthetic_versions',
+    'SyntheticGraphGenerator': 'wikes_toolkit.synthetic.synthetic_generator',
+    'generate_synthetic_dataset': 'wikes_toolkit.synthetic.synthetic_generator',
+
+    'set_instrumentation': 'wikes_toolkit.base.instrumentation',
+    'Instrumentation': 'wikes_toolkit.base.instrumentation',
+    'RecordingInstrumentation': 'wikes_toolkit.base.instrumentation',
+    'JsonLinesExporter': 'wikes_toolkit.base.instrumentation',
+    'PrometheusTextExporter': 'wikes_toolkit.base.instrumentation',
+    'InMemoryExporter': 'wikes_toolkit.base.instrumentation',
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_IMPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
+
+if TYPE_CHECKING:
+    from .toolkit import WikESToolkit
+    from .async_toolkit import AsyncWikESToolkit
+    from wikes_toolkit.base.dataset_store import DatasetStore
+    from wikes_toolkit.base.vocabulary import Vocabulary, shared_vocabulary
+
+    from wikes_toolkit.esbm.esbm_versions import ESBMVersions
+    from wikes_toolkit.esbm.esbm_graph import ESBMGraph as ESBMGraph
+    from wikes_toolkit.esbm.esbm_pandas_graph import PandasESBMGraph as PandasESBMGraph
+    from wikes_toolkit.esbm.esbm_graph_components import ESBMEntity, ESBMPredicate, ESBMRootEntity
+
+    from wikes_toolkit.wikes.wikes_versions import WikESVersions
+    from wikes_toolkit.wikes.wikes_graph import WikESGraph
+    from wikes_toolkit.wikes.wikes_pandas_graph import PandasWikESGraph
+    from wikes_toolkit.wikes.wikies_graph_components import WikiEntity, WikiPredicate, WikiRootEntity
+
+    from wikes_toolkit.synthetic.synthetic_versions import SyntheticVersions
+    from wikes_toolkit.synthetic.synthetic_generator import SyntheticGraphGenerator, generate_synthetic_dataset
+
+    from wikes_toolkit.base.instrumentation import set_instrumentation, Instrumentation, RecordingInstrumentation, \
+        JsonLinesExporter, PrometheusTextExporter, InMemoryExporter
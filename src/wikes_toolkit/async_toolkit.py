@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Type, Union, Dict, Tuple, Optional, TypeVar, Callable, List, Iterable, TYPE_CHECKING
+
+from wikes_toolkit.base import instrumentation
+from wikes_toolkit.base.dataset_store import DatasetStore
+from wikes_toolkit.base.versions import DatasetName
+from wikes_toolkit.toolkit import WikESToolkit
+
+if TYPE_CHECKING:
+    from wikes_toolkit.base.graph_components import BaseESGraph, RootEntity, Triple
+    from wikes_toolkit.base.vocabulary import Vocabulary
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncWikESToolkit:
+    """Asyncio facade over `WikESToolkit`.
+
+    Downloads are streamed by a worker thread into a bounded queue which the event loop drains to disk, so a slow
+    disk throttles the network instead of buffering the whole file. Unpickling, graph initialisation and scoring
+    run in an executor, at most `max_concurrency` at a time. Cancelling an awaiting task stops a running download;
+    CPU bound work already handed to the executor finishes in the background and its result is discarded.
+    """
+    T = TypeVar('T', bound='BaseESGraph')
+
+    def __init__(self, save_path: Union[str, Path] = None, log_level: int = logging.DEBUG,
+                 max_concurrency: int = 2, max_concurrent_downloads: int = 4,
+                 chunk_size: int = 1 << 20, max_pending_chunks: int = 16,
+                 executor: Optional[Executor] = None, store: Optional[DatasetStore] = None,
+                 allow_pickle: bool = True, vocabulary: Optional[Vocabulary] = None):
+        self._toolkit = WikESToolkit(save_path, log_level, store, allow_pickle, vocabulary)
+        self.save_path = self._toolkit.save_path
+        self.chunk_size = chunk_size
+        self.max_pending_chunks = max_pending_chunks
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=max_concurrency,
+                                                        thread_name_prefix='wikes-cpu')
+        self._io_executor = ThreadPoolExecutor(max_workers=max_concurrent_downloads * 2,
+                                               thread_name_prefix='wikes-io')
+        self._cpu_semaphore = asyncio.Semaphore(max_concurrency)
+        self._download_semaphore = asyncio.Semaphore(max_concurrent_downloads)
+        self._downloads: Dict[Tuple[str, str], List] = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self._io_executor.shutdown(wait=False, cancel_futures=True)
+        if self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, function: Callable, *args):
+        async with self._cpu_semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    def _stream_response(self, dataset: DatasetName, queue: asyncio.Queue, loop: asyncio.AbstractEventLoop,
+                         cancelled: threading.Event):
+        import requests
+
+        try:
+            url = dataset.get_dataset_url()
+            with requests.get(url, stream=True) as response:
+                response.raise_for_status()
+                for data in response.iter_content(self.chunk_size):
+                    if cancelled.is_set():
+                        return
+                    asyncio.run_coroutine_threadsafe(queue.put(data), loop).result()
+        finally:
+            if not cancelled.is_set():
+                asyncio.run_coroutine_threadsafe(queue.put(None), loop).result()
+
+    async def _download(self, dataset: DatasetName) -> Path:
+        async with self._download_semaphore:
+            loop = asyncio.get_running_loop()
+            dataset_path = await loop.run_in_executor(self._io_executor, self._toolkit.locate, dataset)
+            if dataset_path is not None:
+                return dataset_path
+            queue = asyncio.Queue(maxsize=self.max_pending_chunks)
+            cancelled = threading.Event()
+            temporary_path = self._toolkit.download_target(dataset)
+            digest = hashlib.sha256()
+            with instrumentation.span('toolkit.download', dataset=dataset.value, mode='async'):
+                producer = loop.run_in_executor(
+                    self._io_executor, self._stream_response, dataset, queue, loop, cancelled
+                )
+                total_size = 0
+                try:
+                    with open(temporary_path, 'wb') as file:
+                        while (data := await queue.get()) is not None:
+                            await loop.run_in_executor(self._io_executor, file.write, data)
+                            digest.update(data)
+                            total_size += len(data)
+                    await producer
+                except BaseException:
+                    cancelled.set()
+                    while not queue.empty():
+                        queue.get_nowait()
+                    temporary_path.unlink(missing_ok=True)
+                    raise
+                dataset_path = await loop.run_in_executor(
+                    self._io_executor, self._toolkit.complete_download, dataset, temporary_path, digest.hexdigest()
+                )
+            instrumentation.count('toolkit.downloaded_bytes', total_size, dataset=dataset.value)
+            logger.debug(f"Dataset [{dataset}] downloaded to {dataset_path}.")
+            return dataset_path
+
+    async def download(self, dataset: DatasetName) -> Path:
+        key = (dataset.get_version(), dataset.value)
+        if key not in self._downloads:
+            task = asyncio.ensure_future(self._download(dataset))
+            task.add_done_callback(lambda _: self._downloads.pop(key, None))
+            self._downloads[key] = [task, 0]
+        download = self._downloads[key]
+        download[1] += 1
+        try:
+            return await asyncio.shield(download[0])
+        except asyncio.CancelledError:
+            if download[1] == 1:
+                download[0].cancel()
+            raise
+        finally:
+            download[1] -= 1
+
+    async def prefetch(self, *datasets: Union[DatasetName, Iterable[DatasetName]]) -> List[Path]:
+        flattened = []
+        for dataset in datasets:
+            if isinstance(dataset, DatasetName):
+                flattened.append(dataset)
+            else:
+                flattened.extend(dataset)
+        return list(await asyncio.gather(*(self.download(dataset) for dataset in flattened)))
+
+    async def load_graph(
+            self,
+            implementation_class: Type[T],
+            dataset: DatasetName,
+            root_entity_formatter: Optional[callable] = None,
+            entity_formatter: Optional[Callable] = None,
+            predicate_formatter: Optional[Callable] = None,
+            triple_formatter: Optional[Callable] = None,
+            keep_networkx: bool = True,
+            offload_text: bool = False) -> T:
+        if self._toolkit.allow_pickle:
+            converted_path = await asyncio.get_running_loop().run_in_executor(
+                self._io_executor, self._toolkit.locate_converted, dataset
+            )
+            if converted_path is None:
+                await self.download(dataset)
+        return await self._run(
+            self._toolkit.load_graph,
+            implementation_class, dataset,
+            root_entity_formatter, entity_formatter, predicate_formatter, triple_formatter, keep_networkx,
+            offload_text
+        )
+
+    async def mark_predictions(
+            self,
+            G: BaseESGraph,
+            predictions: Dict[
+                Union[RootEntity, str],
+                List[Union[Triple, Tuple[str, str, str]]]
+            ]
+    ):
+        return await self._run(WikESToolkit.apply_predictions, G, predictions)
+
+    @staticmethod
+    def _evaluate(G: BaseESGraph, k: Optional[int], no_rel: bool, metrics: Tuple[str, ...]) -> Dict[str, float]:
+        scores = {}
+        for metric in metrics:
+            if metric == 'f1':
+                scores[metric] = G.f1_score(k, no_rel)
+            elif metric == 'map':
+                scores[metric] = G.map_score(k, no_rel)
+            else:
+                raise ValueError(f"Unknown metric: {metric}")
+        return scores
+
+    async def evaluate(self, G: BaseESGraph, k: int = None, no_rel: bool = False,
+                       metrics: Tuple[str, ...] = ('f1', 'map')) -> Dict[str, float]:
+        return await self._run(AsyncWikESToolkit._evaluate, G, k, no_rel, tuple(metrics))
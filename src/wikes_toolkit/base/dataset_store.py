@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, Optional, Union, List
+
+from wikes_toolkit.base.versions import DatasetName
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FORMAT = 1
+HASH_CHUNK_SIZE = 1 << 20
+GC_GRACE_SECONDS = 60 * 60
+
+
+def sha256_file(path: Union[str, Path]) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class DerivedRecord:
+    format_version: int
+    sha256: str
+    size: int
+    source_sha256: str
+    created: float
+
+
+@dataclass
+class DatasetRecord:
+    dataset: str
+    version: str
+    sha256: str
+    size: int
+    source_url: Optional[str]
+    created: float
+    derived: Dict[str, DerivedRecord] = field(default_factory=dict)
+
+    @staticmethod
+    def from_json(data: Dict) -> DatasetRecord:
+        derived = {kind: DerivedRecord(**record) for kind, record in data.pop('derived', {}).items()}
+        return DatasetRecord(**data, derived=derived)
+
+
+class DatasetStore:
+    """Content-addressed store of dataset files and of the caches derived from them.
+
+    Files are kept under `blobs/<sha256[:2]>/<sha256>` and the manifest maps every dataset to its blob, size and source
+    URL, and to the derived caches built from it. Blobs and the manifest are written to a temporary file, fsynced
+    and renamed into place, so readers never see a partial file. Looking a dataset up only reads the manifest and
+    compares file sizes; `verify` rehashes the blobs.
+
+    A store opened with `read_only=True` never writes, which makes it safe to share over NFS with many hosts while a
+    single writer populates it.
+    """
+
+    def __init__(self, root: Union[str, Path], read_only: bool = False):
+        self.root = Path(root)
+        self.read_only = read_only
+        self._manifest_path = self.root / 'manifest.json'
+        self._blobs_path = self.root / 'blobs'
+        self._temporary_path = self.root / 'tmp'
+        self._records: Dict[str, DatasetRecord] = {}
+        self._manifest_mtime: Optional[int] = None
+        if read_only:
+            if not self._manifest_path.exists():
+                raise FileNotFoundError(f"No dataset store manifest found under {self.root}.")
+        else:
+            self._blobs_path.mkdir(parents=True, exist_ok=True)
+            self._temporary_path.mkdir(parents=True, exist_ok=True)
+        self._reload()
+
+    @staticmethod
+    def key(dataset: DatasetName) -> str:
+        return f"{dataset.get_version()}/{dataset.value}"
+
+    def _reload(self):
+        try:
+            mtime = self._manifest_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._records, self._manifest_mtime = {}, None
+            return
+        if mtime == self._manifest_mtime:
+            return
+        with open(self._manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('format') != MANIFEST_FORMAT:
+            raise ValueError(f"Unsupported dataset store manifest format: {manifest.get('format')}.")
+        self._records = {key: DatasetRecord.from_json(record) for key, record in manifest['datasets'].items()}
+        self._manifest_mtime = mtime
+
+    def _write_manifest(self):
+        manifest = {
+            'format': MANIFEST_FORMAT,
+            'datasets': {key: asdict(record) for key, record in sorted(self._records.items())}
+        }
+        self._atomic_write_text(self._manifest_path, json.dumps(manifest, indent=2))
+        self._manifest_mtime = self._manifest_path.stat().st_mtime_ns
+
+    def _atomic_write_text(self, path: Path, text: str):
+        temporary_path = self.temporary_path()
+        with open(temporary_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary_path, path)
+
+    def _check_writable(self):
+        if self.read_only:
+            raise PermissionError(f"Dataset store {self.root} is opened read-only.")
+
+    @contextmanager
+    def _locked(self):
+        """Serialises manifest updates of concurrent writers and reloads the manifest they may have changed."""
+        self._check_writable()
+        with open(self.root / 'manifest.lock', 'a') as lock:
+            if fcntl is not None:
+                fcntl.lockf(lock, fcntl.LOCK_EX)
+            try:
+                self._reload()
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.lockf(lock, fcntl.LOCK_UN)
+
+    def blob_path(self, sha256: str) -> Path:
+        return self._blobs_path / sha256[:2] / sha256
+
+    def temporary_path(self) -> Path:
+        """A fresh path on the store's file system, to be filled and handed to `commit`/`commit_derived`."""
+        self._check_writable()
+        return self._temporary_path / f"{uuid.uuid4().hex}.part"
+
+    def _store_blob(self, temporary_path: Path, sha256: Optional[str]) -> str:
+        with open(temporary_path, 'rb+') as f:
+            os.fsync(f.fileno())
+        if sha256 is None:
+            sha256 = sha256_file(temporary_path)
+        blob_path = self.blob_path(sha256)
+        if blob_path.exists():
+            temporary_path.unlink()
+        else:
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(temporary_path, blob_path)
+        return sha256
+
+    def record(self, dataset: DatasetName) -> Optional[DatasetRecord]:
+        self._reload()
+        return self._records.get(self.key(dataset))
+
+    def datasets(self) -> List[DatasetRecord]:
+        self._reload()
+        return list(self._records.values())
+
+    def path(self, dataset: DatasetName) -> Optional[Path]:
+        """Blob of `dataset`, or `None` when the store has no intact copy. Only sizes are checked."""
+        record = self.record(dataset)
+        if record is None:
+            return None
+        blob_path = self.blob_path(record.sha256)
+        try:
+            if blob_path.stat().st_size == record.size:
+                return blob_path
+        except FileNotFoundError:
+            pass
+        logger.warning(f"Dataset [{dataset}] is missing or truncated in the store {self.root}.")
+        return None
+
+    def __contains__(self, dataset: DatasetName) -> bool:
+        return self.path(dataset) is not None
+
+    def commit(self, dataset: DatasetName, temporary_path: Union[str, Path], source_url: Optional[str] = None,
+               sha256: Optional[str] = None) -> Path:
+        """Moves a fully written file into the store as the content of `dataset`."""
+        temporary_path = Path(temporary_path)
+        size = temporary_path.stat().st_size
+        sha256 = self._store_blob(temporary_path, sha256)
+        with self._locked():
+            previous = self._records.get(self.key(dataset))
+            derived = previous.derived if previous is not None and previous.sha256 == sha256 else {}
+            self._records[self.key(dataset)] = DatasetRecord(
+                dataset.value, dataset.get_version(), sha256, size, source_url, time.time(), derived
+            )
+            self._write_manifest()
+        return self.blob_path(sha256)
+
+    def add_file(self, dataset: DatasetName, path: Union[str, Path], source_url: Optional[str] = None) -> Path:
+        """Copies an existing dataset file, e.g. from the plain `<version>/<name>.pkl` layout, into the store."""
+        temporary_path = self.temporary_path()
+        shutil.copyfile(path, temporary_path)
+        return self.commit(dataset, temporary_path, source_url)
+
+    def derived_path(self, dataset: DatasetName, kind: str, format_version: int) -> Optional[Path]:
+        """Cache of `kind` built from the current content of `dataset`, if it exists in `format_version`."""
+        record = self.record(dataset)
+        if record is None or kind not in record.derived:
+            return None
+        derived = record.derived[kind]
+        if derived.format_version != format_version or derived.source_sha256 != record.sha256:
+            return None
+        blob_path = self.blob_path(derived.sha256)
+        try:
+            return blob_path if blob_path.stat().st_size == derived.size else None
+        except FileNotFoundError:
+            return None
+
+    def commit_derived(self, dataset: DatasetName, kind: str, format_version: int,
+                       temporary_path: Union[str, Path]) -> Path:
+        temporary_path = Path(temporary_path)
+        size = temporary_path.stat().st_size
+        sha256 = self._store_blob(temporary_path, None)
+        with self._locked():
+            record = self._records.get(self.key(dataset))
+            if record is None:
+                raise ValueError(f"Dataset [{dataset}] is not part of the store, add it before its caches.")
+            record.derived[kind] = DerivedRecord(format_version, sha256, size, record.sha256, time.time())
+            self._write_manifest()
+        return self.blob_path(sha256)
+
+    def verify(self) -> Dict[str, bool]:
+        """Rehashes every dataset and derived cache and reports which of them are intact."""
+        results = {}
+        for record in self.datasets():
+            key = f"{record.version}/{record.dataset}"
+            entries = [(key, record.sha256)] + [
+                (f"{key}#{kind}", derived.sha256) for kind, derived in record.derived.items()
+            ]
+            for name, sha256 in entries:
+                blob_path = self.blob_path(sha256)
+                results[name] = blob_path.exists() and sha256_file(blob_path) == sha256
+        return results
+
+    def gc(self, current_formats: Optional[Dict[str, int]] = None, dry_run: bool = False) -> List[Path]:
+        """Drops derived caches built from older dataset contents or, if given, other format versions, then removes
+        blobs no longer referenced by the manifest and temporary files left behind by crashed writers.
+
+        Files younger than `GC_GRACE_SECONDS` are kept, they may belong to a commit in progress. Returns the removed
+        (or, with `dry_run`, removable) files.
+        """
+        current_formats = current_formats or {}
+        with self._locked():
+            stale = [
+                (record, kind) for record in self._records.values() for kind, derived in record.derived.items()
+                if derived.source_sha256 != record.sha256
+                or current_formats.get(kind, derived.format_version) != derived.format_version
+            ]
+            referenced = set()
+            for record in self._records.values():
+                referenced.add(record.sha256)
+                referenced.update(
+                    derived.sha256 for kind, derived in record.derived.items() if (record, kind) not in stale
+                )
+            if stale and not dry_run:
+                for record, kind in stale:
+                    del record.derived[kind]
+                self._write_manifest()
+
+            now = time.time()
+            removable = [
+                path for path in self._blobs_path.glob('*/*')
+                if path.is_file() and path.name not in referenced and now - path.stat().st_mtime > GC_GRACE_SECONDS
+            ]
+            removable.extend(
+                path for path in self._temporary_path.glob('*.part')
+                if now - path.stat().st_mtime > GC_GRACE_SECONDS
+            )
+            if not dry_run:
+                for path in removable:
+                    path.unlink(missing_ok=True)
+        return removable
@@ -1,3 +1,8 @@
+"""Reference F1 and MAP of one root entity, as used for the published WikES and ESBM scores.
+
+The graphs score all root entities at once with `wikes_toolkit.base.metrics`; `tests/test_metrics.py` checks that
+both give the same scores.
+"""
 from typing import List, Tuple, Union
 
 
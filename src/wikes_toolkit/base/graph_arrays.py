@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict
+
+import numpy as np
+
+ENTITY_COLUMNS = ('entity', 'subject', 'object', 'root_entity')
+PREDICATE_COLUMNS = ('predicate',)
+TRIPLE_COLUMNS = ('triple',)
+
+
+@dataclass
+class GraphArrays:
+    """Integer coded tables of a graph.
+
+    Entity and predicate columns hold positions into the shared `entity_ids`/`predicate_ids` dictionaries, triple
+    columns hold triple ids, i.e. row numbers of `tables['triples']`. Every column is a contiguous NumPy array, the
+    triple columns are the arrays of `graph_index()` themselves.
+    """
+    entity_ids: np.ndarray
+    predicate_ids: np.ndarray
+    tables: Dict[str, Dict[str, np.ndarray]] = field(default_factory=dict)
+
+    def __getitem__(self, table: str) -> Dict[str, np.ndarray]:
+        return self.tables[table]
+
+    def decode_entities(self, codes: np.ndarray) -> np.ndarray:
+        return self.entity_ids[codes]
+
+    def decode_predicates(self, codes: np.ndarray) -> np.ndarray:
+        return self.predicate_ids[codes]
+
+    def to_arrow(self):
+        """Converts every table to a `pyarrow.Table`.
+
+        Entity and predicate columns become dictionary arrays whose indices wrap the NumPy buffers without copying
+        and whose dictionaries are converted once and shared by all tables. Codes of -1, e.g. ground-truth triples
+        missing from the graph, become nulls.
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("Arrow export needs PyArrow, install it with `pip install wikes-toolkit[arrow]`.")
+
+        def codes(values: np.ndarray):
+            missing = values < 0
+            return pa.array(values, mask=missing) if missing.any() else pa.array(values)
+
+        entity_dictionary = pa.array(self.entity_ids, type=pa.string())
+        predicate_dictionary = pa.array(self.predicate_ids, type=pa.string())
+        result = {}
+        for name, columns in self.tables.items():
+            arrays = {}
+            for column, values in columns.items():
+                if column in ENTITY_COLUMNS:
+                    arrays[column] = pa.DictionaryArray.from_arrays(codes(values), entity_dictionary)
+                elif column in PREDICATE_COLUMNS:
+                    arrays[column] = pa.DictionaryArray.from_arrays(codes(values), predicate_dictionary)
+                elif column in TRIPLE_COLUMNS:
+                    arrays[column] = codes(values)
+                else:
+                    arrays[column] = pa.array(values)
+            result[name] = pa.table(arrays)
+        return result
@@ -4,12 +4,19 @@ import logging
 from abc import abstractmethod, ABC
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Optional, Union, Dict, Tuple, Callable, List, TypeVar, Type
+from itertools import islice
+from pathlib import Path
+from typing import Optional, Union, Dict, Tuple, Callable, List, TypeVar, Type, Sequence, Set, Iterable, Iterator
 
 import networkx as nx
+import numpy as np
 import pandas as pd
 
+from wikes_toolkit.base import instrumentation, metrics, predictions
+from wikes_toolkit.base.graph_arrays import GraphArrays
+from wikes_toolkit.base.graph_index import GraphIndex, SubgraphBatch, CandidateIndex, index_dtype
 from wikes_toolkit.base.versions import DatasetName
+from wikes_toolkit.base.vocabulary import Vocabulary
 
 logger = logging.getLogger(__name__)
 
@@ -108,7 +115,10 @@ class BaseESGraph(ABC):
     _triples: Union[Dict[Tuple[str, str, str], Triple], pd.DataFrame]
     _ground_truths: Union[Dict[str, List[Tuple[str, str, str]]], pd.DataFrame]
     _predicted_summaries: Dict[str, List[Tuple[str, str, str]]] = defaultdict(list)
-    _G: nx.MultiDiGraph
+    _G: Optional[nx.MultiDiGraph]
+    _index: Optional[GraphIndex] = None
+    _root_entity_ids: Optional[pd.Index] = None
+    _metric_cache: Optional[Dict[Tuple[Optional[int], bool], Tuple[Dict[str, np.ndarray], Set[str]]]] = None
     _root_entity_formatter: Callable
     _entity_formatter: Callable
     _predicate_formatter: Callable
@@ -122,6 +132,7 @@ class BaseESGraph(ABC):
                  predicate_formatter: Optional[callable] = None,
                  triple_formatter: Optional[callable] = None):
         self._G: nx.MultiDiGraph = G
+        self._predicted_summaries = defaultdict(list)
         self._dataset_name = dataset
         self._root_type = root_type
         self._entity_type = entity_type
@@ -171,6 +182,36 @@ class BaseESGraph(ABC):
         else:
             return list(self._predicates.values())
 
+    @staticmethod
+    def _iter_items(items: Union[Dict, pd.DataFrame], batch_size: Optional[int]):
+        """Single items without a `batch_size`, as the `fetch_*` methods return them, otherwise batches."""
+        if isinstance(items, pd.DataFrame):
+            if batch_size is None:
+                for _, row in items.iterrows():
+                    yield row
+            else:
+                for start in range(0, items.shape[0], batch_size):
+                    yield items.iloc[start:start + batch_size]
+        else:
+            values = iter(items.values())
+            if batch_size is None:
+                yield from values
+            else:
+                while batch := list(islice(values, batch_size)):
+                    yield batch
+
+    def iter_root_entities(self, batch_size: Optional[int] = None):
+        return self._iter_items(self._root_entities, batch_size)
+
+    def iter_entities(self, batch_size: Optional[int] = None):
+        return self._iter_items(self._entities, batch_size)
+
+    def iter_triples(self, batch_size: Optional[int] = None):
+        return self._iter_items(self._triples, batch_size)
+
+    def iter_predicates(self, batch_size: Optional[int] = None):
+        return self._iter_items(self._predicates, batch_size)
+
     def total_entities(self) -> int:
         if isinstance(self._entities, pd.DataFrame):
             return self._entities.shape[0]
@@ -289,7 +330,8 @@ class BaseESGraph(ABC):
         pd.Series
     ]) -> Tuple[str, str, str]:
         if isinstance(self._triples, pd.DataFrame):
-            return self.fetch_triple(triple)[['subject', 'predicate', 'object']].apply(tuple, axis=1)
+            triple = self.fetch_triple(triple)
+            return triple['subject'], triple['predicate'], triple['object']
         else:
             triple = self.fetch_triple(triple)
             return triple.subject_entity.identifier, triple.predicate.predicate_id, triple.object_entity.identifier
@@ -302,6 +344,10 @@ class BaseESGraph(ABC):
                 (self._triples['subject'] == entity.name) |
                 (self._triples['object'] == entity.name)
                 ]
+        elif self._G is None:
+            index = self.graph_index()
+            position = index.entity_positions([self.fetch_entity(entity).identifier])[0]
+            return [self._triples[key] for key in self.triple_ids_to_keys(index.incident_triples(position))]
         else:
             entity = self.fetch_entity(entity)
             entity_id = entity.identifier
@@ -315,16 +361,314 @@ class BaseESGraph(ABC):
             ])
             return neighbors
 
+    @staticmethod
+    def _entity_identifier(entity: Union[Entity, str, pd.Series]) -> str:
+        if isinstance(entity, pd.Series):
+            return str(entity.name)
+        if isinstance(entity, Entity):
+            return entity.identifier
+        return entity
+
+    @staticmethod
+    def _predicate_identifier(predicate: Union[Predicate, str, pd.Series]) -> str:
+        if isinstance(predicate, pd.Series):
+            return str(predicate.name)
+        if isinstance(predicate, Predicate):
+            return predicate.predicate_id
+        return predicate
+
+    def _triple_key(self, triple: Union[Triple, Tuple, pd.Series]) -> Tuple[str, str, str]:
+        if isinstance(triple, pd.Series):
+            return triple['subject'], triple['predicate'], triple['object']
+        if isinstance(triple, Triple):
+            return triple.key()
+        return (self._entity_identifier(triple[0]), self._predicate_identifier(triple[1]),
+                self._entity_identifier(triple[2]))
+
+    def _triple_columns(self, triples) -> Tuple[Sequence[str], Sequence[str], Sequence[str]]:
+        if isinstance(triples, pd.DataFrame):
+            return triples['subject'].to_numpy(), triples['predicate'].to_numpy(), triples['object'].to_numpy()
+        keys = [self._triple_key(triple) for triple in triples]
+        return tuple(zip(*keys)) if keys else ((), (), ())
+
+    @staticmethod
+    def _take_rows(table: Union[Dict, pd.DataFrame], positions: np.ndarray, labels: Sequence):
+        if isinstance(table, pd.DataFrame):
+            return table.reindex(labels)
+        values = list(table.values())
+        return [values[position] if position >= 0 else None for position in positions.tolist()]
+
+    def fetch_entities(self, entities: Sequence[Union[Entity, str, pd.Series]]):
+        """Looks up many entities at once.
+
+        Returns the entities aligned with the input, `None` or a row of missing values where an entity does not
+        exist, and a boolean mask of the missing ones.
+        """
+        identifiers = [self._entity_identifier(entity) for entity in entities]
+        positions = self.graph_index().entity_positions(identifiers)
+        return self._take_rows(self._entities, positions, identifiers), positions < 0
+
+    def fetch_predicates(self, predicates: Sequence[Union[Predicate, str, pd.Series]]):
+        identifiers = [self._predicate_identifier(predicate) for predicate in predicates]
+        positions = self.graph_index().predicate_positions(identifiers)
+        return self._take_rows(self._predicates, positions, identifiers), positions < 0
+
+    def fetch_triples(self, triples: Union[Sequence[Union[Triple, Tuple, pd.Series]], pd.DataFrame]):
+        """Looks up many triples at once, given as triples, key tuples or a table of subject, predicate and object.
+
+        Works like `fetch_entities`, the pandas backend labels the rows with their triple ids, -1 for missing ones.
+        """
+        triple_ids = self._encode_triples(*self._triple_columns(triples))
+        return self._take_rows(self._triples, triple_ids, triple_ids), triple_ids < 0
+
+    def _build_graph_index(self) -> GraphIndex:
+        if isinstance(self._triples, pd.DataFrame):
+            subjects = self._triples['subject'].to_numpy()
+            predicates = self._triples['predicate'].to_numpy()
+            objects = self._triples['object'].to_numpy()
+        elif self._triples:
+            subjects, predicates, objects = zip(*self._triples.keys())
+        else:
+            subjects, predicates, objects = [], [], []
+        if isinstance(self._entities, pd.DataFrame):
+            entity_ids, predicate_ids = self._entities.index, self._predicates.index
+        else:
+            entity_ids, predicate_ids = list(self._entities.keys()), list(self._predicates.keys())
+        return GraphIndex(entity_ids, predicate_ids, subjects, predicates, objects, self.root_entity_ids())
+
+    def _encode_triples(self, subjects: Sequence[str], predicates: Sequence[str],
+                        objects: Sequence[str]) -> np.ndarray:
+        index = self.graph_index()
+        subjects, objects = index.entity_positions(subjects), index.entity_positions(objects)
+        predicates = index.predicate_positions(predicates)
+        found = (subjects >= 0) & (predicates >= 0) & (objects >= 0)
+        triple_ids = np.full(subjects.shape[0], -1, dtype=np.int64)
+        triple_ids[found] = index.triple_positions(subjects[found], predicates[found], objects[found])
+        return triple_ids
+
+    def triple_keys_to_ids(self, triples: Sequence[Tuple[str, str, str]]) -> np.ndarray:
+        if len(triples) == 0:
+            return np.empty(0, dtype=np.int64)
+        subjects, predicates, objects = zip(*triples)
+        return self._encode_triples(subjects, predicates, objects)
+
+    def _ground_truth_labels(self, ground_truths: List[List[Tuple[str, str, str]]]) -> np.ndarray:
+        """1 for the triple ids in any of `ground_truths`, 0 for the others."""
+        triples = [triple for ground_truth in ground_truths for triple in ground_truth]
+        triple_ids = self.triple_keys_to_ids(triples)
+        return (np.bincount(triple_ids[triple_ids >= 0], minlength=self.total_triples()) > 0).astype(np.int8)
+
+    def _ground_truth_arrays(self) -> Dict[str, Dict[str, np.ndarray]]:
+        return {}
+
+    def _encode_ground_truth_table(self, root_entity_ids: Sequence[str], subjects: Sequence[str],
+                                   predicates: Sequence[str], objects: Sequence[str],
+                                   **columns: Sequence[int]) -> Dict[str, np.ndarray]:
+        index = self.graph_index()
+        table = {'root_entity': index.entity_positions(root_entity_ids).astype(index.subjects.dtype)}
+        table.update({name: np.asarray(values, dtype=np.int32) for name, values in columns.items()})
+        table['triple'] = self._encode_triples(subjects, predicates, objects).astype(index_dtype(index.total_triples))
+        return table
+
+    def as_arrays(self) -> GraphArrays:
+        """Integer coded entity, predicate, triple and ground-truth tables sharing one dictionary per kind of id.
+
+        Ground-truth triples which are not part of the graph are coded as -1.
+        """
+        index = self.graph_index()
+        with instrumentation.span('graph.as_arrays', graph=type(self).__name__):
+            tables = {
+                'entities': {'entity': np.arange(index.total_entities, dtype=index.subjects.dtype)},
+                'root_entities': {'entity': index.root_entities},
+                'predicates': {'predicate': np.arange(index.total_predicates, dtype=index.predicates.dtype)},
+                'triples': {'subject': index.subjects, 'predicate': index.predicates, 'object': index.objects},
+            }
+            tables.update(self._ground_truth_arrays())
+            return GraphArrays(
+                index.entity_ids.to_numpy(dtype=object), index.predicate_ids.to_numpy(dtype=object), tables
+            )
+
+    def as_arrow(self):
+        return self.as_arrays().to_arrow()
+
+    def to_sparse(self, kind: str = 'adjacency'):
+        """CSR matrices over the toolkit's integer ids, see `graph_index()` for the vocabulary.
+
+        `adjacency` is entities x entities with multi-triples summed, `incidence` is entities x triples and
+        `per_predicate` is a list of entities x entities matrices, one per predicate id.
+        """
+        with instrumentation.span('graph.to_sparse', kind=kind):
+            return self.graph_index().to_sparse(kind)
+
+    def entity_codes(self, vocabulary: Vocabulary) -> np.ndarray:
+        """Ids of the entities of `graph_index()` in `vocabulary`, comparable across the graphs sharing it."""
+        return vocabulary.codes(self.graph_index().entity_ids)
+
+    def predicate_codes(self, vocabulary: Vocabulary) -> np.ndarray:
+        return vocabulary.codes(self.graph_index().predicate_ids)
+
+    def graph_index(self) -> GraphIndex:
+        if self._index is None:
+            with instrumentation.span('graph.build_index', graph=type(self).__name__):
+                self._index = self._build_graph_index()
+        return self._index
+
+    def subgraph(self,
+                 root_entities: Optional[Sequence[Union[RootEntity, str, pd.Series]]] = None,
+                 hops: int = 1,
+                 max_edges: Optional[int] = None) -> SubgraphBatch:
+        if hops < 0:
+            raise ValueError("hops should be a non-negative integer.")
+        index = self.graph_index()
+        if root_entities is None:
+            seeds = index.root_entities
+        else:
+            if isinstance(root_entities, (str, Entity, pd.Series)):
+                root_entities = [root_entities]
+            identifiers = [self._entity_identifier(root_entity) for root_entity in root_entities]
+            seeds = index.entity_positions(identifiers)
+            if (seeds < 0).any():
+                missing = [identifiers[i] for i in np.flatnonzero(seeds < 0)[:5]]
+                raise ValueError(f"Entities with identifiers: {missing} not found.")
+        with instrumentation.span('graph.subgraph', roots=len(seeds), hops=hops):
+            return index.k_hop(seeds, hops, max_edges)
+
+    def _summary_codes(self, summaries: Sequence[Sequence[Tuple[str, str, str]]],
+                       no_rel: bool = False) -> List[np.ndarray]:
+        """Integer codes of the triples of every summary: triple ids, or subject and object pairs with `no_rel`."""
+        lengths = [len(summary) for summary in summaries]
+        triples = [triple for summary in summaries for triple in summary]
+        subjects, predicates, objects = zip(*triples) if triples else ((), (), ())
+        if no_rel:
+            index = self.graph_index()
+            subjects, objects = index.entity_positions(subjects), index.entity_positions(objects)
+            codes = np.where((subjects >= 0) & (objects >= 0),
+                             subjects.astype(np.int64) * index.total_entities + objects, -1)
+        else:
+            codes = self._encode_triples(subjects, predicates, objects)
+        return np.split(codes, np.cumsum(lengths)[:-1]) if summaries else []
+
+    @abstractmethod
+    def _hit_matrix(self, k: int, no_rel: bool, positions: np.ndarray) -> metrics.HitMatrix:
+        """Hit matrix of the root entities at `positions` of `root_entity_ids()`."""
+        pass
+
+    def _root_entity_index(self) -> pd.Index:
+        if self._root_entity_ids is None:
+            self._root_entity_ids = pd.Index(self.root_entity_ids())
+        return self._root_entity_ids
+
+    def _invalidate_summaries(self, root_entity_ids: Iterable[str]):
+        """Marks the cached metrics of root entities whose predicted summaries changed as stale."""
+        if self._metric_cache:
+            root_entity_ids = set(root_entity_ids)
+            for _, stale in self._metric_cache.values():
+                stale.update(root_entity_ids)
+
+    def invalidate_metrics(self):
+        """Drops all cached metrics, needed only after editing `predications()` in place."""
+        self._metric_cache = None
+
+    def entity_metrics(self, names: Sequence[str] = metrics.DEFAULT_METRICS, k: int = None,
+                       no_rel: bool = False) -> Dict[str, np.ndarray]:
+        """Scores of the marked summaries for every root entity, aligned with `root_entity_ids()`.
+
+        All metrics reduce one hit matrix of the integer coded gold and predicted summaries, see `base.metrics`.
+        Scores are cached per root entity; marking or clearing summaries only invalidates the roots it touches, and
+        the next call rescores just those.
+        """
+        if self._metric_cache is None:
+            self._metric_cache = {}
+        scores, stale = self._metric_cache.setdefault((k, no_rel), ({}, set()))
+        with instrumentation.span('evaluate.metrics', graph=type(self).__name__, top_k=k, no_rel=no_rel):
+            if stale and scores:
+                positions = self._root_entity_index().get_indexer(list(stale))
+                positions = positions[positions >= 0]
+                for name, values in metrics.evaluate(self._hit_matrix(k, no_rel, positions), list(scores)).items():
+                    scores[name][positions] = values
+                instrumentation.count('evaluate.rescored_roots', positions.shape[0])
+            stale.clear()
+            missing = [name for name in dict.fromkeys(names) if name not in scores]
+            if missing:
+                positions = np.arange(len(self._root_entity_index()))
+                scores.update(metrics.evaluate(self._hit_matrix(k, no_rel, positions), missing))
+            return {name: scores[name].copy() for name in names}
+
+    def evaluate(self, names: Sequence[str] = metrics.DEFAULT_METRICS, k: int = None,
+                 no_rel: bool = False) -> Dict[str, float]:
+        return {name: float(scores.mean()) if scores.shape[0] else 0.0
+                for name, scores in self.entity_metrics(names, k, no_rel).items()}
+
+    def candidate_index(self) -> CandidateIndex:
+        return self.graph_index().candidate_index()
+
+    def _candidate_row(self, root_entity: Union[RootEntity, str, pd.Series]) -> int:
+        identifier = self._entity_identifier(root_entity)
+        row = self.candidate_index().rows([identifier])[0]
+        if row < 0:
+            raise ValueError(f"Entity with identifier: '{identifier}' not found in root entities.")
+        return row
+
+    def candidate_triple_ids(self, root_entity: Union[RootEntity, str, pd.Series]) -> np.ndarray:
+        return self.candidate_index().candidates(self._candidate_row(root_entity))
+
+    def are_candidates(self,
+                       root_entities: Sequence[Union[RootEntity, str, pd.Series]],
+                       triple_ids: Sequence[int]) -> np.ndarray:
+        candidate_index = self.candidate_index()
+        if isinstance(root_entities, (str, Entity, pd.Series)):
+            rows = np.full(len(triple_ids), self._candidate_row(root_entities))
+        else:
+            rows = candidate_index.rows([self._entity_identifier(r) for r in root_entities])
+        return candidate_index.is_candidate(rows, triple_ids)
+
+    def iter_candidates(self):
+        return iter(self.candidate_index())
+
     def degree(self, entity: Union[Entity, str, pd.Series]) -> int:
         if isinstance(self._entities, pd.DataFrame):
             return self.neighbors(entity).shape[0]
+        elif self._G is None:
+            index = self.graph_index()
+            position = index.entity_positions([self.fetch_entity(entity).identifier])[0]
+            return index.incident_triples(position).shape[0]
         else:
             entity = self.fetch_entity(entity)
             return self._G.degree(entity.identifier)
 
+    def release_networkx(self):
+        """Builds the graph index and drops the networkx graph the backend was initialised from.
+
+        `neighbors` and `degree` are then served from the index, and `networkx_graph` rebuilds a graph on demand.
+        """
+        self._G = None
+        self.graph_index()
+
+    @staticmethod
+    def _table_rows(table, columns: List[str], attributes: List[str]) -> Iterator[Tuple]:
+        """Rows of identifier and `columns` of a pandas or Polars table, or of `attributes` of dict backend items."""
+        if isinstance(table, dict):
+            return ((key, *(getattr(item, name) for name in attributes)) for key, item in table.items())
+        if isinstance(table, pd.DataFrame):
+            return zip(table.index, *(table[column].astype(object).where(table[column].notna(), None)
+                                      for column in columns))
+        return table.select('identifier', *columns).iter_rows()
+
+    def networkx_graph(self) -> nx.MultiDiGraph:
+        if self._G is not None:
+            return self._G
+        with instrumentation.span('graph.rebuild_networkx', graph=type(self).__name__):
+            return self._rebuild_networkx()
+
+    def _rebuild_networkx(self) -> nx.MultiDiGraph:
+        raise NotImplementedError(
+            f"{type(self).__name__} cannot rebuild its networkx graph, load it with `keep_networkx=True`."
+        )
+
     def _add_predication_if_not_exists(self, root_entity: str, triple: Tuple[str, str, str]):
         if triple not in self._predicted_summaries[root_entity]:
             self._predicted_summaries[root_entity].append(triple)
+            self._invalidate_summaries([root_entity])
 
     def mark_triple_as_summary(self, root_entity: Union[RootEntity, str, pd.Series], triple: Union[
         str,
@@ -361,7 +705,54 @@ class BaseESGraph(ABC):
                 )
             )
 
+    def triple_ids_to_keys(self, triple_ids: Sequence[int]) -> List[Tuple[str, str, str]]:
+        index = self.graph_index()
+        triple_ids = np.asarray(triple_ids, dtype=np.int64)
+        return list(zip(
+            index.entity_ids[index.subjects[triple_ids]].tolist(),
+            index.predicate_ids[index.predicates[triple_ids]].tolist(),
+            index.entity_ids[index.objects[triple_ids]].tolist()
+        ))
+
+    def mark_triple_ids_as_summaries(self, root_entity: Union[RootEntity, str, pd.Series],
+                                     triple_ids: Sequence[int], replace: bool = False):
+        self._candidate_row(root_entity)
+        self.mark_all_triple_ids_as_summaries({self._entity_identifier(root_entity): triple_ids}, replace)
+
+    def mark_all_triple_ids_as_summaries(self, predictions: Dict[Union[RootEntity, str], Sequence[int]],
+                                         replace: bool = False):
+        """Marks the triple ids of every root entity in `predictions` as its summary. Like `mark_triple_as_summary`
+        they are appended to the summary already marked, skipping repeats; with `replace` they replace it."""
+        root_entity_ids = [self._entity_identifier(root_entity) for root_entity in predictions.keys()]
+        rankings = [np.asarray(triple_ids, dtype=np.int64) for triple_ids in predictions.values()]
+        lengths = [ranking.shape[0] for ranking in rankings]
+        triple_ids = np.concatenate(rankings) if rankings else np.empty(0, dtype=np.int64)
+        root_rows = self.candidate_index().rows(root_entity_ids)
+        if (root_rows < 0).any():
+            missing = root_entity_ids[int(np.flatnonzero(root_rows < 0)[0])]
+            raise ValueError(f"Entity with identifier: '{missing}' not found in root entities.")
+        rows = np.repeat(root_rows, lengths)
+        incident = self.candidate_index().is_candidate(rows, triple_ids)
+        if not incident.all():
+            position = int(np.flatnonzero(~incident)[0])
+            raise ValueError(
+                f"Root entity: {root_entity_ids[int(np.searchsorted(np.cumsum(lengths), position, 'right'))]} "
+                f"should be either a subject or an object of the triple in a summary.")
+        keys = self.triple_ids_to_keys(triple_ids)
+        start = 0
+        for root_entity_id, length in zip(root_entity_ids, lengths):
+            summaries = [] if replace else self._predicted_summaries[root_entity_id]
+            seen = set(summaries)
+            for triple in keys[start:start + length]:
+                if triple not in seen:
+                    seen.add(triple)
+                    summaries.append(triple)
+            self._predicted_summaries[root_entity_id] = summaries
+            start += length
+        self._invalidate_summaries(root_entity_ids)
+
     def clear_summaries(self):
+        self._invalidate_summaries(self._predicted_summaries.keys())
         self._predicted_summaries.clear()
 
     def mark_triples_as_summaries(
@@ -371,14 +762,22 @@ class BaseESGraph(ABC):
     ):
         if isinstance(triples, (Tuple, pd.Series)):
             return self.mark_triple_as_summary(root_entity, triples)
-        if isinstance(triples, pd.DataFrame):
-            for index, triple in triples.iterrows():
-                self.mark_triple_as_summary(root_entity, triple)
-        elif isinstance(triples, list):
-            for triple in triples:
-                self.mark_triple_as_summary(root_entity, triple)
-        else:
-            raise ValueError("Please pass a valid triple list")
+        with instrumentation.span('graph.mark_triples_as_summaries'):
+            if isinstance(triples, pd.DataFrame):
+                for index, triple in triples.iterrows():
+                    self.mark_triple_as_summary(root_entity, triple)
+            elif isinstance(triples, list):
+                for triple in triples:
+                    self.mark_triple_as_summary(root_entity, triple)
+            else:
+                raise ValueError("Please pass a valid triple list")
+            instrumentation.count('graph.marked_triples', len(triples))
+
+    def load_predictions(self, path: Union[str, Path], format: Optional[str] = None, top_k: Optional[int] = None,
+                         errors: str = 'raise', chunk_size: int = predictions.DEFAULT_CHUNK_SIZE,
+                         replace: bool = True) -> predictions.PredictionsReport:
+        """Streams a JSONL, TSV or Parquet predictions file into the summaries, see `base.predictions`."""
+        return predictions.load_predictions(self, path, format, chunk_size, top_k, errors, replace)
 
     def predications(self) -> Dict[str, List[Tuple[str, str, str]]]:
         return self._predicted_summaries
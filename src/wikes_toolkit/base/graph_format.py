@@ -0,0 +1,201 @@
+"""Pickle free dataset format.
+
+A graph is stored as a NumPy `.npz` archive, read with `allow_pickle=False`, so opening a file never executes code.
+The archive holds
+
+* `metadata`: UTF-8 JSON as a uint8 array with `format`, `format_version`, the graph attributes and, for the `nodes`
+  and `edges` tables, the row count and the type of every attribute column.
+* `nodes__id__data`/`nodes__id__offsets`: node identifiers, UTF-8 bytes and int64 offsets, string `i` being
+  `data[offsets[i]:offsets[i + 1]]`.
+* `edges__subject`, `edges__object` and `edges__key`: int64 node positions and multigraph keys of every edge.
+* one entry group per attribute column, named `<table>__<column>__<part>`:
+
+  * `string` columns are dictionary encoded, int32 `codes` (-1 for a missing value) into `dictionary_data` and
+    `dictionary_offsets`, laid out like the node identifiers;
+  * `int`, `float` and `bool` columns store a boolean `valid` mask and the `values` of the valid rows only, which
+    keeps sparse columns such as the ESBM gold orders small.
+"""
+from __future__ import annotations
+
+import json
+import pickle
+from pathlib import Path
+from typing import Dict, List, Union, Tuple, Optional, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+FORMAT_NAME = 'wikes-npz'
+FORMAT_VERSION = 1
+GRAPH_FORMAT_KIND = 'npz'
+
+
+def encode_strings(values: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+
+def decode_strings(data: np.ndarray, offsets: np.ndarray) -> List[str]:
+    buffer = data.tobytes()
+    bounds = offsets.tolist()
+    return [buffer[start:end].decode('utf-8') for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def _column_type(name: str, values: List) -> str:
+    """Type of an attribute column. Booleans mixed with numbers are widened to the numbers' type."""
+    types = {type(value) for value in values if value is not None}
+    if not types or types == {str}:
+        return 'string'
+    if types == {bool}:
+        return 'bool'
+    if types <= {bool, int, np.int64, np.int32}:
+        return 'int'
+    if types <= {bool, int, float, np.float64}:
+        return 'float'
+    raise ValueError(f"Column [{name}] mixes unsupported value types: {sorted(t.__name__ for t in types)}.")
+
+
+def _encode_column(prefix: str, name: str, values: List, arrays: Dict[str, np.ndarray]) -> str:
+    column_type = _column_type(name, values)
+    key = f"{prefix}__{name}"
+    if column_type == 'string':
+        import pandas as pd
+
+        codes, dictionary = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=True)
+        arrays[f"{key}__codes"] = codes.astype(np.int32)
+        arrays[f"{key}__dictionary_data"], arrays[f"{key}__dictionary_offsets"] = encode_strings(list(dictionary))
+    else:
+        dtype = {'int': np.int64, 'float': np.float64, 'bool': bool}[column_type]
+        arrays[f"{key}__valid"] = np.array([value is not None for value in values], dtype=bool)
+        arrays[f"{key}__values"] = np.array([value for value in values if value is not None], dtype=dtype)
+    return column_type
+
+
+def _decode_column(archive, prefix: str, name: str, column_type: str) -> Tuple[np.ndarray, List]:
+    """Positions of the rows holding a value and their values."""
+    key = f"{prefix}__{name}"
+    if column_type == 'string':
+        codes = archive[f"{key}__codes"]
+        positions = np.flatnonzero(codes >= 0)
+        dictionary = decode_strings(archive[f"{key}__dictionary_data"], archive[f"{key}__dictionary_offsets"])
+        return positions, np.array(dictionary, dtype=object)[codes[positions]].tolist()
+    return np.flatnonzero(archive[f"{key}__valid"]), archive[f"{key}__values"].tolist()
+
+
+def _attribute_columns(records: List[Dict]) -> Dict[str, List]:
+    names = {}
+    for record in records:
+        names.update(dict.fromkeys(record))
+    return {name: [record.get(name) for record in records] for name in names}
+
+
+def _rows(archive, prefix: str, columns: Dict[str, str], total: int) -> List[Dict]:
+    rows = [{} for _ in range(total)]
+    for name, column_type in columns.items():
+        positions, values = _decode_column(archive, prefix, name, column_type)
+        for position, value in zip(positions.tolist(), values):
+            rows[position][name] = value
+    return rows
+
+
+def write_graph(G: nx.MultiDiGraph, path: Union[str, Path], compress: bool = False) -> Path:
+    path = Path(path)
+    arrays: Dict[str, np.ndarray] = {}
+    node_ids, node_records = [], []
+    for node, data in G.nodes(data=True):
+        if not isinstance(node, str):
+            raise ValueError(f"Node identifiers should be strings, found {type(node).__name__}.")
+        node_ids.append(node)
+        node_records.append(data)
+    arrays['nodes__id__data'], arrays['nodes__id__offsets'] = encode_strings(node_ids)
+    positions = {node: position for position, node in enumerate(node_ids)}
+    del node_ids
+
+    subjects, objects, keys, edge_records = [], [], [], []
+    for u, v, key, data in G.edges(keys=True, data=True):
+        if not isinstance(key, int):
+            raise ValueError(f"Edge keys should be integers, found {type(key).__name__}.")
+        subjects.append(positions[u])
+        objects.append(positions[v])
+        keys.append(key)
+        edge_records.append(data)
+    arrays['edges__subject'] = np.array(subjects, dtype=np.int64)
+    arrays['edges__object'] = np.array(objects, dtype=np.int64)
+    arrays['edges__key'] = np.array(keys, dtype=np.int64)
+    del subjects, objects, keys, positions
+
+    metadata = {
+        'format': FORMAT_NAME,
+        'format_version': FORMAT_VERSION,
+        'graph': dict(G.graph),
+        'nodes': {'count': G.number_of_nodes(), 'columns': {}},
+        'edges': {'count': G.number_of_edges(), 'columns': {}},
+    }
+    for table, records in (('nodes', node_records), ('edges', edge_records)):
+        for name, values in _attribute_columns(records).items():
+            metadata[table]['columns'][name] = _encode_column(table, name, values, arrays)
+    arrays['metadata'] = np.frombuffer(json.dumps(metadata).encode('utf-8'), dtype=np.uint8)
+
+    with open(path, 'wb') as f:
+        (np.savez_compressed if compress else np.savez)(f, **arrays)
+    return path
+
+
+def read_metadata(path: Union[str, Path]) -> Dict:
+    with np.load(path, allow_pickle=False) as archive:
+        return _read_metadata(archive)
+
+
+def _read_metadata(archive) -> Dict:
+    metadata = json.loads(archive['metadata'].tobytes().decode('utf-8'))
+    if metadata.get('format') != FORMAT_NAME:
+        raise ValueError(f"Unknown dataset format: {metadata.get('format')}.")
+    if metadata.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported {FORMAT_NAME} version: {metadata.get('format_version')}.")
+    return metadata
+
+
+def read_root_entity_ids(path: Union[str, Path]) -> List[str]:
+    """Identifiers of the nodes flagged `is_root`, read without building the graph."""
+    with np.load(path, allow_pickle=False) as archive:
+        metadata = _read_metadata(archive)
+        column_type = metadata['nodes']['columns'].get('is_root')
+        if column_type is None:
+            return []
+        positions, values = _decode_column(archive, 'nodes', 'is_root', column_type)
+        positions = positions[np.array(values, dtype=bool)] if values else positions[:0]
+        data, offsets = archive['nodes__id__data'], archive['nodes__id__offsets']
+        return [data[offsets[position]:offsets[position + 1]].tobytes().decode('utf-8')
+                for position in positions.tolist()]
+
+
+def read_graph(path: Union[str, Path]) -> nx.MultiDiGraph:
+    import networkx as nx
+
+    with np.load(path, allow_pickle=False) as archive:
+        metadata = _read_metadata(archive)
+        node_ids = decode_strings(archive['nodes__id__data'], archive['nodes__id__offsets'])
+        G = nx.MultiDiGraph(**metadata['graph'])
+        G.add_nodes_from(zip(node_ids, _rows(archive, 'nodes', metadata['nodes']['columns'], len(node_ids))))
+
+        nodes = np.array(node_ids, dtype=object)
+        G.add_edges_from(zip(
+            nodes[archive['edges__subject']].tolist(),
+            nodes[archive['edges__object']].tolist(),
+            archive['edges__key'].tolist(),
+            _rows(archive, 'edges', metadata['edges']['columns'], metadata['edges']['count'])
+        ))
+    return G
+
+
+def convert_pickle(pickle_path: Union[str, Path], output_path: Union[str, Path], compress: bool = False) -> Path:
+    """Converts a released `.pkl` dataset. This unpickles the file, run it on a trusted host only."""
+    with open(pickle_path, 'rb') as f:
+        G: Optional[nx.MultiDiGraph] = pickle.load(f)
+    if not G:
+        raise ValueError("Could not load the graph from the dataset file.")
+    return write_graph(G, output_path, compress)
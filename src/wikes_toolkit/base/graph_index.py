@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Optional, Sequence, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def index_dtype(size: int) -> np.dtype:
+    return np.dtype(np.int32) if size < np.iinfo(np.int32).max else np.dtype(np.int64)
+
+
+def _gather_ranges(offsets: np.ndarray, values: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Concatenates `values[offsets[r]:offsets[r + 1]]` for every `r` in `rows`.
+
+    Returns the gathered values and, for each of them, the position in `rows` it was gathered for.
+    """
+    starts = offsets[rows]
+    lengths = offsets[rows + 1] - starts
+    total = int(lengths.sum())
+    owners = np.repeat(np.arange(rows.shape[0]), lengths)
+    if total == 0:
+        return values[:0], owners
+    shifts = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return values[np.arange(total) + shifts], owners
+
+
+class GraphIndex:
+    """Integer encoding of a graph.
+
+    Entities, predicates and triples are numbered in the order of the backend's own tables, so entity `i` is the
+    `i`-th row of `entities()` and triple `t` is the `t`-th row of `triples()`. Incident triples of every entity
+    are stored in CSR layout, outgoing and incoming separately.
+    """
+
+    def __init__(self,
+                 entity_ids: Sequence[str],
+                 predicate_ids: Sequence[str],
+                 subject_ids: Sequence[str],
+                 predicate_of_triples: Sequence[str],
+                 object_ids: Sequence[str],
+                 root_entity_ids: Sequence[str]):
+        self.entity_ids = pd.Index(entity_ids)
+        self.predicate_ids = pd.Index(predicate_ids)
+        entity_dtype = index_dtype(len(self.entity_ids))
+        self.subjects = self.entity_ids.get_indexer(subject_ids).astype(entity_dtype)
+        self.objects = self.entity_ids.get_indexer(object_ids).astype(entity_dtype)
+        self.predicates = self.predicate_ids.get_indexer(predicate_of_triples).astype(
+            index_dtype(len(self.predicate_ids))
+        )
+        self.root_entities = self.entity_ids.get_indexer(root_entity_ids).astype(entity_dtype)
+        if (self.subjects < 0).any() or (self.objects < 0).any() or (self.predicates < 0).any():
+            raise ValueError("Triples refer to entities or predicates which are not part of the graph.")
+        self.out_offsets, self.out_triples = self._csr(self.subjects)
+        self.in_offsets, self.in_triples = self._csr(self.objects)
+        self._candidates: Optional[CandidateIndex] = None
+        self._triple_lookup: Optional[Tuple[pd.MultiIndex, np.ndarray]] = None
+
+    @property
+    def total_entities(self) -> int:
+        return len(self.entity_ids)
+
+    @property
+    def total_triples(self) -> int:
+        return self.subjects.shape[0]
+
+    @property
+    def total_predicates(self) -> int:
+        return len(self.predicate_ids)
+
+    def _csr(self, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        offsets = np.zeros(self.total_entities + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys, minlength=self.total_entities), out=offsets[1:])
+        return offsets, np.argsort(keys, kind='stable').astype(index_dtype(keys.shape[0]))
+
+    def entity_positions(self, identifiers: Sequence[str]) -> np.ndarray:
+        return self.entity_ids.get_indexer(identifiers)
+
+    def predicate_positions(self, identifiers: Sequence[str]) -> np.ndarray:
+        return self.predicate_ids.get_indexer(identifiers)
+
+    def triple_positions(self, subjects: np.ndarray, predicates: np.ndarray, objects: np.ndarray) -> np.ndarray:
+        """Maps encoded (subject, predicate, object) triples to triple ids, -1 where the triple does not exist."""
+        if self._triple_lookup is None:
+            keys = pd.MultiIndex.from_arrays([self.subjects, self.predicates, self.objects])
+            first = ~keys.duplicated()
+            self._triple_lookup = keys[first], np.flatnonzero(first)
+        lookup, positions = self._triple_lookup
+        found = lookup.get_indexer(pd.MultiIndex.from_arrays([subjects, predicates, objects]))
+        return np.where(found >= 0, positions[found], -1)
+
+    def to_sparse(self, kind: str = 'adjacency'):
+        try:
+            from scipy import sparse
+        except ImportError:
+            raise ImportError("Sparse export needs SciPy, install it with `pip install wikes-toolkit[sparse]`.")
+
+        total_entities, total_triples = self.total_entities, self.total_triples
+        if kind == 'adjacency':
+            return sparse.csr_matrix(
+                (np.ones(total_triples, dtype=np.float32), (self.subjects, self.objects)),
+                shape=(total_entities, total_entities)
+            )
+        elif kind == 'incidence':
+            triple_ids = np.arange(total_triples)
+            return sparse.csr_matrix(
+                (np.ones(2 * total_triples, dtype=np.float32),
+                 (np.concatenate([self.subjects, self.objects]), np.concatenate([triple_ids, triple_ids]))),
+                shape=(total_entities, total_triples)
+            )
+        elif kind == 'per_predicate':
+            order = np.argsort(self.predicates, kind='stable')
+            bounds = np.searchsorted(self.predicates[order], np.arange(self.total_predicates + 1))
+            matrices = []
+            for predicate in range(self.total_predicates):
+                selected = order[bounds[predicate]:bounds[predicate + 1]]
+                matrices.append(sparse.csr_matrix(
+                    (np.ones(selected.shape[0], dtype=np.float32), (self.subjects[selected], self.objects[selected])),
+                    shape=(total_entities, total_entities)
+                ))
+            return matrices
+        raise ValueError("kind should be one of 'adjacency', 'incidence' or 'per_predicate'.")
+
+    def degrees(self) -> np.ndarray:
+        return np.diff(self.out_offsets) + np.diff(self.in_offsets)
+
+    def incident_triples(self, entity: int) -> np.ndarray:
+        return np.concatenate([
+            self.out_triples[self.out_offsets[entity]:self.out_offsets[entity + 1]],
+            self.in_triples[self.in_offsets[entity]:self.in_offsets[entity + 1]],
+        ])
+
+    def candidate_index(self) -> CandidateIndex:
+        if self._candidates is None:
+            self._candidates = CandidateIndex(self)
+        return self._candidates
+
+    def k_hop(self, seeds: np.ndarray, hops: int = 1, max_edges: Optional[int] = None) -> SubgraphBatch:
+        seeds = np.asarray(seeds, dtype=np.int64)
+        batch_size = seeds.shape[0]
+        entities = np.int64(self.total_entities)
+        triples = np.int64(max(self.total_triples, 1))
+        batch = np.arange(batch_size, dtype=np.int64)
+
+        node_batch, node_ids = [batch], [seeds]
+        visited = np.unique(batch * entities + seeds)
+        edge_batch, edge_ids = [], []
+        seen_edges = np.empty(0, dtype=np.int64)
+        edge_counts = np.zeros(batch_size, dtype=np.int64)
+        frontier_batch, frontier = batch, seeds
+
+        for _ in range(hops):
+            if frontier.shape[0] == 0:
+                break
+            out_triples, out_owner = _gather_ranges(self.out_offsets, self.out_triples, frontier)
+            in_triples, in_owner = _gather_ranges(self.in_offsets, self.in_triples, frontier)
+            owners = np.concatenate([frontier_batch[out_owner], frontier_batch[in_owner]])
+            keys = np.unique(owners * triples + np.concatenate([out_triples, in_triples]).astype(np.int64))
+            keys = keys[~np.isin(keys, seen_edges, assume_unique=True)]
+            hop_batch, hop_triples = keys // triples, keys % triples
+
+            if max_edges is not None:
+                group_starts = np.searchsorted(hop_batch, hop_batch, side='left')
+                ranks = np.arange(hop_batch.shape[0]) - group_starts
+                keep = ranks < (max_edges - edge_counts[hop_batch])
+                keys, hop_batch, hop_triples = keys[keep], hop_batch[keep], hop_triples[keep]
+            edge_counts += np.bincount(hop_batch, minlength=batch_size)
+            seen_edges = np.union1d(seen_edges, keys)
+            edge_batch.append(hop_batch)
+            edge_ids.append(hop_triples)
+
+            endpoints = np.concatenate([hop_batch * entities + self.subjects[hop_triples],
+                                        hop_batch * entities + self.objects[hop_triples]])
+            discovered = np.setdiff1d(endpoints, visited, assume_unique=False)
+            visited = np.union1d(visited, discovered)
+            frontier_batch, frontier = discovered // entities, discovered % entities
+            node_batch.append(frontier_batch)
+            node_ids.append(frontier)
+
+        return SubgraphBatch.build(self, np.concatenate(node_batch), np.concatenate(node_ids),
+                                   np.concatenate(edge_batch) if edge_batch else np.empty(0, dtype=np.int64),
+                                   np.concatenate(edge_ids) if edge_ids else np.empty(0, dtype=np.int64),
+                                   batch_size)
+
+
+class CandidateIndex:
+    """Triples incident to every root entity, stored as one contiguous, sorted range of triple ids per root.
+
+    Rows follow the order of `root_entity_ids()`.
+    """
+
+    def __init__(self, index: GraphIndex):
+        self._index = index
+        self.root_entities = index.root_entities
+        out_triples, out_owner = _gather_ranges(index.out_offsets, index.out_triples, self.root_entities)
+        in_triples, in_owner = _gather_ranges(index.in_offsets, index.in_triples, self.root_entities)
+        triples = np.int64(max(index.total_triples, 1))
+        keys = np.unique(np.concatenate([out_owner, in_owner]).astype(np.int64) * triples +
+                         np.concatenate([out_triples, in_triples]).astype(np.int64))
+        rows = keys // triples
+        self.triple_ids = (keys % triples).astype(index_dtype(index.total_triples))
+        self.offsets = np.zeros(self.root_entities.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=self.root_entities.shape[0]), out=self.offsets[1:])
+        self._rows = pd.Index(index.entity_ids[self.root_entities])
+
+    def __len__(self) -> int:
+        return self.root_entities.shape[0]
+
+    def rows(self, root_entity_ids: Sequence[str]) -> np.ndarray:
+        return self._rows.get_indexer(root_entity_ids)
+
+    def candidates(self, row: int) -> np.ndarray:
+        return self.triple_ids[self.offsets[row]:self.offsets[row + 1]]
+
+    def counts(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def is_candidate(self, rows: np.ndarray, triple_ids: np.ndarray) -> np.ndarray:
+        rows, triple_ids = np.asarray(rows), np.asarray(triple_ids)
+        valid = (rows >= 0) & (triple_ids >= 0) & (triple_ids < self._index.total_triples)
+        safe_rows, safe_triples = np.where(valid, rows, 0), np.where(valid, triple_ids, 0)
+        roots = self.root_entities[safe_rows]
+        return valid & ((self._index.subjects[safe_triples] == roots) | (self._index.objects[safe_triples] == roots))
+
+    def __iter__(self):
+        for row, identifier in enumerate(self._rows):
+            yield identifier, self.candidates(row)
+
+
+@dataclass
+class Subgraph:
+    node_ids: np.ndarray
+    edge_index: np.ndarray
+    edge_type: np.ndarray
+    triple_ids: np.ndarray
+    entity_identifiers: List[str]
+
+    def to_local(self, global_ids: Sequence[int]) -> np.ndarray:
+        order = np.argsort(self.node_ids)
+        positions = np.searchsorted(self.node_ids, global_ids, sorter=order)
+        positions = np.minimum(positions, self.node_ids.shape[0] - 1)
+        local = order[positions]
+        return np.where(self.node_ids[local] == np.asarray(global_ids), local, -1)
+
+
+@dataclass
+class SubgraphBatch:
+    """k-hop neighbourhoods of several root entities, concatenated in the layout GNN libraries expect.
+
+    `node_ids[node_ptr[i]:node_ptr[i + 1]]` are the global entity ids of the `i`-th neighbourhood, its root first.
+    `edge_index` is a 2 x E COO array into the concatenated node array, `edge_type` holds predicate ids and
+    `triple_ids` maps every edge back to the graph's triple ids.
+    """
+    node_ids: np.ndarray
+    node_ptr: np.ndarray
+    edge_index: np.ndarray
+    edge_type: np.ndarray
+    edge_ptr: np.ndarray
+    triple_ids: np.ndarray
+    _index: GraphIndex = field(repr=False)
+
+    @staticmethod
+    def build(index: GraphIndex, node_batch: np.ndarray, node_ids: np.ndarray, edge_batch: np.ndarray,
+              edge_ids: np.ndarray, batch_size: int) -> SubgraphBatch:
+        node_order = np.argsort(node_batch, kind='stable')
+        node_batch, node_ids = node_batch[node_order], node_ids[node_order]
+        edge_order = np.lexsort((edge_ids, edge_batch))
+        edge_batch, edge_ids = edge_batch[edge_order], edge_ids[edge_order]
+
+        entities = np.int64(index.total_entities)
+        node_keys = node_batch * entities + node_ids
+        key_order = np.argsort(node_keys)
+        sorted_keys = node_keys[key_order]
+        sources = key_order[np.searchsorted(sorted_keys, edge_batch * entities + index.subjects[edge_ids])]
+        targets = key_order[np.searchsorted(sorted_keys, edge_batch * entities + index.objects[edge_ids])]
+
+        node_ptr = np.zeros(batch_size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(node_batch, minlength=batch_size), out=node_ptr[1:])
+        edge_ptr = np.zeros(batch_size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(edge_batch, minlength=batch_size), out=edge_ptr[1:])
+        return SubgraphBatch(
+            node_ids=node_ids,
+            node_ptr=node_ptr,
+            edge_index=np.stack([sources, targets]).astype(np.int64),
+            edge_type=index.predicates[edge_ids].astype(np.int64),
+            edge_ptr=edge_ptr,
+            triple_ids=edge_ids,
+            _index=index
+        )
+
+    def __len__(self) -> int:
+        return self.node_ptr.shape[0] - 1
+
+    def __getitem__(self, i: int) -> Subgraph:
+        if not 0 <= i < len(self):
+            raise IndexError(f"Subgraph index {i} out of range.")
+        node_start, node_end = self.node_ptr[i], self.node_ptr[i + 1]
+        edge_start, edge_end = self.edge_ptr[i], self.edge_ptr[i + 1]
+        node_ids = self.node_ids[node_start:node_end]
+        return Subgraph(
+            node_ids=node_ids,
+            edge_index=self.edge_index[:, edge_start:edge_end] - node_start,
+            edge_type=self.edge_type[edge_start:edge_end],
+            triple_ids=self.triple_ids[edge_start:edge_end],
+            entity_identifiers=self._index.entity_ids[node_ids].tolist()
+        )
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def entity_identifiers(self) -> List[str]:
+        return self._index.entity_ids[self.node_ids].tolist()
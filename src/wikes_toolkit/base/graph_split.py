@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import functools
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union, TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from wikes_toolkit.base import metrics, predictions
+from wikes_toolkit.base.versions import DatasetName
+
+if TYPE_CHECKING:
+    from wikes_toolkit.base.graph_components import BaseESGraph
+    from wikes_toolkit.base.graph_index import SubgraphBatch
+
+# Graph methods taking a root entity as their first argument, refused for root entities of other splits.
+_ROOT_ENTITY_METHODS = frozenset({
+    'fetch_root_entity', 'fetch_root_entity_id', 'candidate_triple_ids', 'are_candidates', 'predications_for_root',
+    'mark_triple_as_summary', 'mark_triples_as_summaries', 'mark_triple_ids_as_summaries', 'mark_nt_file_as_summary',
+    'ground_truths', 'ground_truth_triple_ids', 'gold_top_5', 'gold_top_10',
+})
+# Graph-wide exports which include the ground truths of every split.
+_FULL_GRAPH_METHODS = frozenset({'as_arrays', 'as_arrow'})
+
+
+class GraphSplit:
+    """One split of a dataset as a view of the loaded full graph.
+
+    The view only stores the positions of its root entities in `graph.root_entity_ids()` and a boolean `root_mask`
+    over them; entities, triples, ground truths and the marked summaries are those of the shared graph. Root entity,
+    candidate, summary and scoring methods are restricted to the split, every other attribute is looked up on the
+    graph.
+    """
+
+    def __init__(self, graph: BaseESGraph, dataset: DatasetName, root_entity_ids: Sequence[str]):
+        self.graph = graph
+        self.dataset = dataset
+        positions = graph._root_entity_index().get_indexer(list(root_entity_ids))
+        if (positions < 0).any():
+            missing = [root_entity_ids[i] for i in np.flatnonzero(positions < 0)[:5].tolist()]
+            raise ValueError(f"Split [{dataset}] has root entities missing from the full graph, e.g. {missing}.")
+        self.positions = np.sort(positions)
+        self.root_mask = np.zeros(len(graph._root_entity_index()), dtype=bool)
+        self.root_mask[self.positions] = True
+
+    def __getattr__(self, name: str):
+        if name in _FULL_GRAPH_METHODS:
+            raise AttributeError(f"{name} covers every split, call it on {type(self).__name__}.graph instead.")
+        attribute = getattr(self.graph, name)
+        if name not in _ROOT_ENTITY_METHODS:
+            return attribute
+
+        @functools.wraps(attribute)
+        def restricted(root_entity, *args, **kwargs):
+            self._check_root_entity(root_entity)
+            return attribute(root_entity, *args, **kwargs)
+        return restricted
+
+    def __len__(self) -> int:
+        return self.positions.shape[0]
+
+    def __repr__(self) -> str:
+        return f"GraphSplit({self.dataset}, {len(self)} of {self.root_mask.shape[0]} root entities)"
+
+    def _check_root_entity(self, root_entity) -> str:
+        if isinstance(root_entity, int):
+            root_entity = self.graph.fetch_root_entity(root_entity)
+        identifier = self.graph._entity_identifier(root_entity)
+        position = self.graph._root_entity_index().get_indexer([identifier])[0]
+        if position < 0:
+            raise ValueError(f"Entity with identifier: '{identifier}' not found in root entities.")
+        if not self.root_mask[position]:
+            raise ValueError(f"Root entity: '{identifier}' is not part of split [{self.dataset}].")
+        return identifier
+
+    def root_entity_ids(self) -> List[str]:
+        return self.graph._root_entity_index()[self.positions].tolist()
+
+    def root_entities(self):
+        root_entities = self.graph.root_entities()
+        if isinstance(root_entities, list):
+            return [root_entities[position] for position in self.positions.tolist()]
+        if isinstance(root_entities, pd.DataFrame):
+            return root_entities.iloc[self.positions]
+        return root_entities[self.positions]
+
+    def iter_root_entities(self, batch_size: Optional[int] = None):
+        root_entities = self.root_entities()
+        if isinstance(root_entities, list):
+            root_entities = dict(zip(self.root_entity_ids(), root_entities))
+        return self.graph._iter_items(root_entities, batch_size)
+
+    def iter_ground_truths(self, k: int = None) -> Iterator[Tuple[str, List[Tuple[str, str, str]]]]:
+        root_entity_ids = set(self.root_entity_ids())
+        for root_entity, ground_truth in self.graph.iter_ground_truths(k):
+            if root_entity in root_entity_ids:
+                yield root_entity, ground_truth
+
+    def all_ground_truth_triple_ids(self, k: int = None) -> Dict[str, List[Tuple[str, str, str]]]:
+        return dict(self.iter_ground_truths(k))
+
+    def all_gold_top_k(self, k: int) -> Dict[str, List[List[Tuple[str, str, str]]]]:
+        gold = self.graph.all_gold_top_k(k)
+        return {identifier: gold[identifier] for identifier in self.root_entity_ids() if identifier in gold}
+
+    def iter_gold_top_k(self, k: int) -> Iterator[Tuple[str, List[List[Tuple[str, str, str]]]]]:
+        yield from self.all_gold_top_k(k).items()
+
+    def ground_truth_labels(self, *args, **kwargs) -> np.ndarray:
+        """Labels of the triples in the gold summaries of the split's root entities, see the graph's method."""
+        return type(self.graph).ground_truth_labels(self, *args, **kwargs)
+
+    def gold_tensor(self, k: int = 5, no_rel: bool = False):
+        return self.graph.gold_tensor(k, no_rel).take(self.positions)
+
+    def annotator_agreement(self, k: int = 5) -> Dict[str, float]:
+        candidates = self.graph.candidate_index().counts()[self.positions]
+        return self.graph._annotator_agreement(self.gold_tensor(k), candidates)
+
+    def mark_all_triple_ids_as_summaries(self, predictions: Dict[str, Sequence[int]], replace: bool = False):
+        for root_entity in predictions:
+            self._check_root_entity(root_entity)
+        self.graph.mark_all_triple_ids_as_summaries(predictions, replace)
+
+    def iter_candidates(self):
+        candidate_index = self.graph.candidate_index()
+        for row, identifier in zip(self.positions.tolist(), self.root_entity_ids()):
+            yield identifier, candidate_index.candidates(row)
+
+    def subgraph(self, root_entities=None, hops: int = 1, max_edges: Optional[int] = None) -> SubgraphBatch:
+        """k-hop neighbourhoods of the split's root entities, or of `root_entities`, which must all belong to the split.
+        Neighbourhoods still reach into the entities and triples of the full graph."""
+        if root_entities is None:
+            root_entities = self.root_entity_ids()
+        else:
+            if isinstance(root_entities, (str, pd.Series)) or not isinstance(root_entities, Iterable):
+                root_entities = [root_entities]
+            root_entities = [self._check_root_entity(root_entity) for root_entity in root_entities]
+        return self.graph.subgraph(root_entities, hops, max_edges)
+
+    def predications(self) -> Dict[str, List[Tuple[str, str, str]]]:
+        summaries = self.graph.predications()
+        return {identifier: summaries[identifier] for identifier in self.root_entity_ids() if identifier in summaries}
+
+    def clear_summaries(self):
+        """Clears the summaries of the split's root entities only."""
+        self.graph.mark_all_triple_ids_as_summaries({identifier: [] for identifier in self.root_entity_ids()},
+                                                    replace=True)
+
+    def load_predictions(self, path: Union[str, Path], format: Optional[str] = None, top_k: Optional[int] = None,
+                         errors: str = 'raise', chunk_size: int = predictions.DEFAULT_CHUNK_SIZE,
+                         replace: bool = True) -> predictions.PredictionsReport:
+        """Streams a predictions file into the shared graph. Only rows of the split's root entities are loaded, rows
+        of other root entities are counted as `outside_mask`, and `replace` only clears the split's summaries."""
+        return predictions.load_predictions(self.graph, path, format, chunk_size, top_k, errors, replace,
+                                            root_mask=self.root_mask)
+
+    def entity_metrics(self, names: Sequence[str] = metrics.DEFAULT_METRICS, k: int = None,
+                       no_rel: bool = False) -> Dict[str, np.ndarray]:
+        """Scores of the split's root entities, aligned with `root_entity_ids()`."""
+        return {name: scores[self.positions]
+                for name, scores in self.graph.entity_metrics(names, k, no_rel).items()}
+
+    def evaluate(self, names: Sequence[str] = metrics.DEFAULT_METRICS, k: int = None,
+                 no_rel: bool = False) -> Dict[str, float]:
+        return {name: float(scores.mean()) if scores.shape[0] else 0.0
+                for name, scores in self.entity_metrics(names, k, no_rel).items()}
+
+    def entity_scores(self, metric: str = 'f1', k: int = None, no_rel: bool = False) -> np.ndarray:
+        return self.graph.entity_scores(metric, k, no_rel)[self.positions]
+
+    def f1_score(self, k: int = None, no_rel: bool = False) -> float:
+        return float(self.entity_scores(metrics.F1, k, no_rel).mean())
+
+    def map_score(self, k: int = None, no_rel: bool = False) -> float:
+        return float(self.entity_scores(metrics.MAP, k, no_rel).mean())
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+_NULL_SPAN = nullcontext()
+_parent_span: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('wikes_parent_span', default=None)
+
+
+@dataclass
+class SpanRecord:
+    name: str
+    start: float
+    duration: float
+    parent: Optional[str] = None
+    attributes: Dict[str, object] = field(default_factory=dict)
+
+
+class Instrumentation:
+    """No-op instrumentation, the default. Spans and counters cost a single method call."""
+
+    enabled = False
+
+    def span(self, name: str, **attributes):
+        return _NULL_SPAN
+
+    def count(self, name: str, value: int = 1, **attributes):
+        pass
+
+    def flush(self):
+        pass
+
+
+class Exporter:
+
+    def export_span(self, record: SpanRecord):
+        pass
+
+    def export_counter(self, name: str, value: int, attributes: Dict[str, object]):
+        pass
+
+    def flush(self):
+        pass
+
+
+class _Span:
+    __slots__ = ('_instrumentation', '_name', '_attributes', '_start', '_token')
+
+    def __init__(self, instrumentation: RecordingInstrumentation, name: str, attributes: Dict[str, object]):
+        self._instrumentation = instrumentation
+        self._name = name
+        self._attributes = attributes
+
+    def __enter__(self):
+        self._token = _parent_span.set(self._name)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        duration = time.perf_counter() - self._start
+        _parent_span.reset(self._token)
+        if exc_type is not None:
+            self._attributes['error'] = exc_type.__name__
+        self._instrumentation.record_span(SpanRecord(
+            self._name, time.time() - duration, duration, _parent_span.get(), self._attributes
+        ))
+
+
+class RecordingInstrumentation(Instrumentation):
+    enabled = True
+
+    def __init__(self, *exporters: Exporter):
+        self.exporters: List[Exporter] = list(exporters)
+        self._lock = threading.Lock()
+
+    def span(self, name: str, **attributes):
+        return _Span(self, name, attributes)
+
+    def count(self, name: str, value: int = 1, **attributes):
+        with self._lock:
+            for exporter in self.exporters:
+                exporter.export_counter(name, value, attributes)
+
+    def record_span(self, record: SpanRecord):
+        with self._lock:
+            for exporter in self.exporters:
+                exporter.export_span(record)
+
+    def flush(self):
+        with self._lock:
+            for exporter in self.exporters:
+                exporter.flush()
+
+
+class InMemoryExporter(Exporter):
+
+    def __init__(self):
+        self.spans: List[SpanRecord] = []
+        self.counters: Dict[str, int] = defaultdict(int)
+
+    def export_span(self, record: SpanRecord):
+        self.spans.append(record)
+
+    def export_counter(self, name: str, value: int, attributes: Dict[str, object]):
+        self.counters[name] += value
+
+
+class JsonLinesExporter(Exporter):
+
+    def __init__(self, path: Union[str, Path]):
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def export_span(self, record: SpanRecord):
+        self._file.write(json.dumps({'type': 'span', **asdict(record)}, default=str) + '\n')
+
+    def export_counter(self, name: str, value: int, attributes: Dict[str, object]):
+        self._file.write(json.dumps(
+            {'type': 'counter', 'name': name, 'value': value, 'attributes': attributes}, default=str
+        ) + '\n')
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class PrometheusTextExporter(Exporter):
+    """Aggregates spans and counters and writes them in the Prometheus text format on every `flush`.
+
+    The file is replaced atomically, so it can be picked up by the node exporter's textfile collector.
+    """
+
+    def __init__(self, path: Union[str, Path], prefix: str = 'wikes'):
+        self._path = Path(path)
+        self._prefix = prefix
+        self._span_seconds: Dict[str, float] = defaultdict(float)
+        self._span_count: Dict[str, int] = defaultdict(int)
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], int] = defaultdict(int)
+
+    def export_span(self, record: SpanRecord):
+        self._span_seconds[record.name] += record.duration
+        self._span_count[record.name] += 1
+
+    def export_counter(self, name: str, value: int, attributes: Dict[str, object]):
+        labels = tuple(sorted((k, str(v)) for k, v in attributes.items()))
+        self._counters[(name, labels)] += value
+
+    @staticmethod
+    def _metric_name(name: str) -> str:
+        return ''.join(c if c.isalnum() else '_' for c in name)
+
+    @staticmethod
+    def _label_value(value: str) -> str:
+        return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+    def flush(self):
+        lines = []
+        if self._span_seconds:
+            lines.append(f"# TYPE {self._prefix}_span_seconds summary")
+        for name in sorted(self._span_seconds):
+            span = self._label_value(name)
+            lines.append(f'{self._prefix}_span_seconds_sum{{span="{span}"}} {self._span_seconds[name]}')
+            lines.append(f'{self._prefix}_span_seconds_count{{span="{span}"}} {self._span_count[name]}')
+        for metric in sorted({name for name, _ in self._counters}):
+            lines.append(f"# TYPE {self._prefix}_{self._metric_name(metric)}_total counter")
+            for (name, labels), value in sorted(self._counters.items()):
+                if name != metric:
+                    continue
+                label_text = ','.join(f'{self._metric_name(k)}="{self._label_value(v)}"' for k, v in labels)
+                label_text = f"{{{label_text}}}" if label_text else ''
+                lines.append(f"{self._prefix}_{self._metric_name(name)}_total{label_text} {value}")
+        temporary_path = self._path.with_suffix(self._path.suffix + '.tmp')
+        with open(temporary_path, 'w', encoding='utf-8') as f:
+            f.write(''.join(line + '\n' for line in lines))
+        os.replace(temporary_path, self._path)
+
+
+_instrumentation: Instrumentation = Instrumentation()
+
+
+def set_instrumentation(instrumentation: Optional[Instrumentation]) -> Instrumentation:
+    global _instrumentation
+    previous = _instrumentation
+    _instrumentation = instrumentation if instrumentation is not None else Instrumentation()
+    return previous
+
+
+def get_instrumentation() -> Instrumentation:
+    return _instrumentation
+
+
+def span(name: str, **attributes):
+    return _instrumentation.span(name, **attributes)
+
+
+def count(name: str, value: int = 1, **attributes):
+    _instrumentation.count(name, value, **attributes)
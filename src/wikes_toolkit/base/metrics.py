@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Sequence, Optional
+
+import numpy as np
+
+F1 = 'f1'
+MAP = 'map'
+MAP_DISTINCT = 'map_distinct'
+NDCG = 'ndcg'
+PRECISION = 'precision'
+RECALL = 'recall'
+MRR = 'mrr'
+DEFAULT_METRICS = (F1, MAP, NDCG, PRECISION, RECALL, MRR)
+
+
+@dataclass
+class HitMatrix:
+    """Relevance of ranked predictions, the input every metric reduces.
+
+    `hits[r, i]` tells whether the `i`-th prediction of root `r` is in the root's gold summary, counting every gold
+    item once. Ranks at or past `cutoffs[r]` are never hits. `lengths` counts the predictions within the cutoff and
+    `relevant` the gold items of every root. Roots with several gold summaries, e.g. one per ESBM annotator, have
+    `hits` of shape roots x annotators x ranks, `relevant` of shape roots x annotators and a `mask` of the
+    annotators every root has; their scores are averaged over these annotators. `cutoffs` and `lengths` broadcast
+    against `relevant`.
+
+    `matches` also marks the predictions repeating an earlier hit, e.g. two triples sharing subject and object with
+    `no_rel`, which `evaluate.map` counts again; it defaults to `hits`.
+    """
+    hits: np.ndarray
+    cutoffs: np.ndarray
+    lengths: np.ndarray
+    relevant: np.ndarray
+    mask: Optional[np.ndarray] = None
+    matches: Optional[np.ndarray] = None
+
+    @property
+    def correct(self) -> np.ndarray:
+        return self.hits.sum(axis=-1)
+
+    @property
+    def ranks(self) -> np.ndarray:
+        return np.arange(1, self.hits.shape[-1] + 1)
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    numerator, denominator = np.broadcast_arrays(np.asarray(numerator, dtype=np.float64), denominator)
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+
+
+def f1_scores(matrix: HitMatrix) -> np.ndarray:
+    precision = _ratio(matrix.correct, matrix.lengths)
+    recall = _ratio(matrix.correct, matrix.relevant)
+    return _ratio(2 * precision * recall, precision + recall)
+
+
+def _average_precision(hits: np.ndarray, matrix: HitMatrix) -> np.ndarray:
+    precisions = np.cumsum(hits, axis=-1) / matrix.ranks
+    return _ratio(np.where(hits, precisions, 0).sum(axis=-1), matrix.relevant)
+
+
+def map_scores(matrix: HitMatrix) -> np.ndarray:
+    """MAP as `evaluate.map` computes it, repeated hits included, so scores stay comparable to published ones."""
+    return _average_precision(matrix.hits if matrix.matches is None else matrix.matches, matrix)
+
+
+def map_distinct_scores(matrix: HitMatrix) -> np.ndarray:
+    """MAP counting every gold item at most once."""
+    return _average_precision(matrix.hits, matrix)
+
+
+def ndcg_scores(matrix: HitMatrix) -> np.ndarray:
+    discounts = 1 / np.log2(matrix.ranks + 1)
+    ideal = np.concatenate([[0], np.cumsum(discounts)])
+    return _ratio(np.where(matrix.hits, discounts, 0).sum(axis=-1),
+                  ideal[np.minimum(matrix.relevant, matrix.cutoffs)])
+
+
+def precision_scores(matrix: HitMatrix) -> np.ndarray:
+    return _ratio(matrix.correct, matrix.cutoffs)
+
+
+def recall_scores(matrix: HitMatrix) -> np.ndarray:
+    return _ratio(matrix.correct, matrix.relevant)
+
+
+def mrr_scores(matrix: HitMatrix) -> np.ndarray:
+    if matrix.hits.shape[-1] == 0:
+        return np.zeros(matrix.hits.shape[:-1])
+    return np.where(matrix.hits.any(axis=-1), 1 / (matrix.hits.argmax(axis=-1) + 1), 0.0)
+
+
+METRICS: Dict[str, Callable[[HitMatrix], np.ndarray]] = {
+    F1: f1_scores,
+    MAP: map_scores,
+    MAP_DISTINCT: map_distinct_scores,
+    NDCG: ndcg_scores,
+    PRECISION: precision_scores,
+    RECALL: recall_scores,
+    MRR: mrr_scores,
+}
+
+
+def register_metric(name: str, function: Callable[[HitMatrix], np.ndarray]):
+    """Adds a metric, a function reducing a `HitMatrix` to one score per row."""
+    METRICS[name] = function
+
+
+def pad_rows(rows: Sequence[np.ndarray], width: int) -> np.ndarray:
+    """Stacks integer code arrays into a rows x `width` matrix, cut at `width` and padded with -1."""
+    lengths = np.minimum(np.array([len(row) for row in rows], dtype=np.int64), width)
+    codes = np.concatenate([np.asarray(row[:length], dtype=np.int64) for row, length in zip(rows, lengths.tolist())]
+                           + [np.empty(0, dtype=np.int64)])
+    matrix = np.full((len(rows), width), -1, dtype=np.int64)
+    matrix[np.repeat(np.arange(len(rows)), lengths),
+           np.arange(codes.shape[0]) - np.repeat(np.cumsum(lengths) - lengths, lengths)] = codes
+    return matrix
+
+
+def first_occurrences(codes: np.ndarray) -> np.ndarray:
+    """Marks the codes of every row (along the last axis) that do not repeat an earlier code of the row."""
+    earlier = np.tril(np.ones((codes.shape[-1], codes.shape[-1]), dtype=bool), -1)
+    return ~((codes[..., :, np.newaxis] == codes[..., np.newaxis, :]) & earlier).any(axis=-1)
+
+
+def build_hit_matrix(gold: Sequence[np.ndarray], predictions: Sequence[np.ndarray],
+                     cutoffs: np.ndarray) -> HitMatrix:
+    """Builds the hit matrix from integer codes of gold and predicted items, one array per row.
+
+    Codes below 0 stand for items which are not part of the graph, they count as gold items but never match. A
+    prediction repeating an earlier one of its row is not a hit, but is one of the `matches`.
+    """
+    cutoffs = np.asarray(cutoffs, dtype=np.int64)
+    total_rows = len(predictions)
+    relevant = np.array([len(items) for items in gold], dtype=np.int64)
+    lengths = np.minimum(np.array([len(items) for items in predictions], dtype=np.int64), cutoffs)
+    width = int(cutoffs.max()) if total_rows else 0
+
+    prediction_codes = np.concatenate(
+        [np.asarray(items[:length], dtype=np.int64) for items, length in zip(predictions, lengths.tolist())] +
+        [np.empty(0, dtype=np.int64)]
+    )
+    prediction_rows = np.repeat(np.arange(total_rows), lengths)
+    positions = np.arange(prediction_codes.shape[0]) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    gold_codes = np.concatenate([np.asarray(items, dtype=np.int64) for items in gold] + [np.empty(0, dtype=np.int64)])
+    gold_rows = np.repeat(np.arange(total_rows), relevant)
+
+    vocabulary, dense = np.unique(np.concatenate([prediction_codes, gold_codes]), return_inverse=True)
+    size = np.int64(max(vocabulary.shape[0], 1))
+    prediction_keys = prediction_rows * size + dense[:prediction_codes.shape[0]]
+    gold_keys = (gold_rows * size + dense[prediction_codes.shape[0]:])[gold_codes >= 0]
+    first = np.zeros(prediction_keys.shape[0], dtype=bool)
+    first[np.unique(prediction_keys, return_index=True)[1]] = True
+    matched = (prediction_codes >= 0) & np.isin(prediction_keys, gold_keys)
+    found = first & matched
+
+    hits = np.zeros((total_rows, width), dtype=bool)
+    hits[prediction_rows[found], positions[found]] = True
+    matches = np.zeros((total_rows, width), dtype=bool)
+    matches[prediction_rows[matched], positions[matched]] = True
+    return HitMatrix(hits, cutoffs, lengths, relevant, matches=matches)
+
+
+def evaluate(matrix: HitMatrix, metrics: Sequence[str] = DEFAULT_METRICS) -> Dict[str, np.ndarray]:
+    """Scores of every root entity, averaged over its annotators if it has several gold summaries."""
+    unknown = [name for name in metrics if name not in METRICS]
+    if unknown:
+        raise ValueError(f"Unknown metrics: {unknown}, use one of {sorted(METRICS)}.")
+    results = {}
+    for name in metrics:
+        scores = METRICS[name](matrix)
+        if matrix.mask is not None:
+            scores = _ratio(np.where(matrix.mask, scores, 0).sum(axis=-1), matrix.mask.sum(axis=-1))
+        results[name] = scores
+    return results
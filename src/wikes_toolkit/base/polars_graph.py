@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from typing import Union, Dict, Tuple, List, Optional, Sequence
+
+import numpy as np
+import polars as pl
+
+from wikes_toolkit.base.graph_components import Entity, Predicate, Triple, RootEntity
+from wikes_toolkit.base.graph_index import GraphIndex
+
+Row = Dict[str, object]
+
+
+class PolarsGraphMixin:
+    """Lookups shared by the Polars backends.
+
+    Tables are kept as Polars data frames and every lookup runs as a lazy query, so filters are pushed down and
+    evaluated on all cores. Fetched entities, predicates and triples are returned as dict rows.
+    """
+    _entities: pl.DataFrame
+    _root_entities: pl.DataFrame
+    _predicates: pl.DataFrame
+    _triples: pl.DataFrame
+
+    def root_entities(self) -> pl.DataFrame:
+        return self._root_entities
+
+    def root_entity_ids(self) -> List[str]:
+        return self._root_entities['identifier'].to_list()
+
+    def entities(self) -> pl.DataFrame:
+        return self._entities
+
+    def triples(self) -> pl.DataFrame:
+        return self._triples
+
+    def predicates(self) -> pl.DataFrame:
+        return self._predicates
+
+    def total_entities(self) -> int:
+        return self._entities.height
+
+    def total_triples(self) -> int:
+        return self._triples.height
+
+    @staticmethod
+    def _iter_items(items: pl.DataFrame, batch_size: Optional[int]):
+        if batch_size is None:
+            return items.iter_rows(named=True)
+        return items.iter_slices(batch_size)
+
+    @staticmethod
+    def _entity_identifier(entity: Union[Entity, str, Row]) -> str:
+        if isinstance(entity, dict):
+            return entity['identifier']
+        if isinstance(entity, Entity):
+            return entity.identifier
+        return entity
+
+    @staticmethod
+    def _predicate_identifier(predicate: Union[Predicate, str, Row]) -> str:
+        if isinstance(predicate, dict):
+            return predicate['identifier']
+        if isinstance(predicate, Predicate):
+            return predicate.predicate_id
+        return predicate
+
+    def _triple_columns(self, triples) -> Tuple[Sequence[str], Sequence[str], Sequence[str]]:
+        if isinstance(triples, pl.DataFrame):
+            return triples['subject'].to_numpy(), triples['predicate'].to_numpy(), triples['object'].to_numpy()
+        return super()._triple_columns(triples)
+
+    @staticmethod
+    def _take_rows(table: pl.DataFrame, positions: np.ndarray, labels: Sequence) -> pl.DataFrame:
+        missing = positions < 0
+        rows = table[np.where(missing, 0, positions)] if table.height else table.clear(positions.shape[0])
+        if not missing.any():
+            return rows
+        return rows.with_columns(
+            pl.when(pl.lit(pl.Series(missing))).then(None).otherwise(pl.col(column)).alias(column)
+            for column in rows.columns
+        )
+
+    @staticmethod
+    def _fetch_row(table: pl.DataFrame, condition: pl.Expr, error: str) -> Row:
+        rows = table.lazy().filter(condition).head(1).collect()
+        if rows.is_empty():
+            raise ValueError(error)
+        return rows.row(0, named=True)
+
+    def fetch_entity(self, entity: Union[Entity, str, Row]) -> Row:
+        identifier = self._entity_identifier(entity)
+        return self._fetch_row(self._entities, pl.col('identifier') == identifier,
+                               f"Entity with identifier: '{identifier}' not found.")
+
+    def fetch_root_entity(self, entity: Union[RootEntity, str, Row]) -> Row:
+        identifier = self._entity_identifier(entity)
+        return self._fetch_row(self._root_entities, pl.col('identifier') == identifier,
+                               f"Entity with identifier: '{identifier}' not found in root entities.")
+
+    def fetch_root_entity_id(self, entity: Union[RootEntity, str, Row]) -> str:
+        return self.fetch_root_entity(entity)['identifier']
+
+    def fetch_predicate(self, predicate: Union[Predicate, str, Row]) -> Row:
+        predicate_id = self._predicate_identifier(predicate)
+        return self._fetch_row(self._predicates, pl.col('identifier') == predicate_id,
+                               f"Predicate with predicate_id: '{predicate_id}' not found")
+
+    def _triple_key(self, triple: Union[Triple, Tuple, Row]) -> Tuple[str, str, str]:
+        if isinstance(triple, dict):
+            return triple['subject'], triple['predicate'], triple['object']
+        return super()._triple_key(triple)
+
+    def fetch_triple(self, triple: Union[Triple, Tuple, Row]) -> Row:
+        subject, predicate, object_ = self._triple_key(triple)
+        return self._fetch_row(
+            self._triples,
+            (pl.col('subject') == subject) & (pl.col('predicate') == predicate) & (pl.col('object') == object_),
+            f"Triple {(subject, predicate, object_)} not found."
+        )
+
+    def fetch_triple_ids(self, triple: Union[Triple, Tuple, Row]) -> Tuple[str, str, str]:
+        return self._triple_key(self.fetch_triple(triple))
+
+    def neighbors(self, entity: Union[Entity, str, Row]) -> pl.DataFrame:
+        identifier = self.fetch_entity(entity)['identifier']
+        return self._triples.lazy().filter(
+            (pl.col('subject') == identifier) | (pl.col('object') == identifier)
+        ).collect()
+
+    def degree(self, entity: Union[Entity, str, Row]) -> int:
+        return self.neighbors(entity).height
+
+    def _build_graph_index(self) -> GraphIndex:
+        return GraphIndex(
+            self._entities['identifier'].to_numpy(),
+            self._predicates['identifier'].to_numpy(),
+            self._triples['subject'].to_numpy(),
+            self._triples['predicate'].to_numpy(),
+            self._triples['object'].to_numpy(),
+            self.root_entity_ids()
+        )
+
+    def mark_triple_as_summary(self, root_entity: Union[RootEntity, str, Row], triple: Union[Triple, Tuple, Row]):
+        identifier = self.fetch_root_entity_id(root_entity)
+        triple = self.fetch_triple_ids(triple)
+        if identifier != triple[0] and identifier != triple[2]:
+            raise ValueError(
+                f"Root entity: {identifier} should be either a subject or an object of the triple in a summary.")
+        self._add_predication_if_not_exists(identifier, triple)
+
+    def mark_triples_as_summaries(self, root_entity: Union[RootEntity, str, Row],
+                                  triples: Union[List[Union[Triple, Tuple, Row]], Row, pl.DataFrame]):
+        if isinstance(triples, dict):
+            return self.mark_triple_as_summary(root_entity, triples)
+        if isinstance(triples, pl.DataFrame):
+            triples = list(triples.select('subject', 'predicate', 'object').iter_rows())
+        return super().mark_triples_as_summaries(root_entity, triples)
@@ -0,0 +1,200 @@
+"""Streaming readers for predictions files.
+
+A predictions file has one row per predicted triple with the columns `root_entity`, `subject`, `predicate` and
+`object`, and optionally `rank` (ascending) or `score` (descending) to order the triples of a root entity; without
+them the file order is kept. Supported formats are JSON lines (one object per row), tab separated values with a
+header and Parquet, all of them optionally compressed when pandas can infer it from the file name.
+
+Files are read in chunks. Every chunk is resolved against the graph's integer index in bulk and only the resulting
+triple ids are kept, so the rows of the file never become Python tuples.
+"""
+from __future__ import annotations
+
+import csv
+import logging
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional, Union, Dict, TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from wikes_toolkit.base import instrumentation
+
+if TYPE_CHECKING:
+    from wikes_toolkit.base.graph_components import BaseESGraph
+
+logger = logging.getLogger(__name__)
+
+JSONL = 'jsonl'
+TSV = 'tsv'
+PARQUET = 'parquet'
+FORMATS = (JSONL, TSV, PARQUET)
+KEY_COLUMNS = ('root_entity', 'subject', 'predicate', 'object')
+DEFAULT_CHUNK_SIZE = 100_000
+
+_SUFFIXES = {'.jsonl': JSONL, '.ndjson': JSONL, '.tsv': TSV, '.txt': TSV, '.parquet': PARQUET, '.pq': PARQUET}
+_COMPRESSION_SUFFIXES = ('.gz', '.bz2', '.xz', '.zst', '.zip')
+
+
+@dataclass
+class PredictionsReport:
+    """Row counts of a loaded predictions file. Rows which were not loaded are only counted with `errors='skip'`."""
+    rows: int = 0
+    loaded: int = 0
+    root_entities: int = 0
+    unknown_root_entities: int = 0
+    unknown_triples: int = 0
+    not_incident: int = 0
+    outside_mask: int = 0
+
+
+def predictions_format(path: Union[str, Path]) -> str:
+    suffixes = [suffix.lower() for suffix in Path(path).suffixes]
+    if suffixes and suffixes[-1] in _COMPRESSION_SUFFIXES:
+        suffixes = suffixes[:-1]
+    if not suffixes or suffixes[-1] not in _SUFFIXES:
+        raise ValueError(f"Cannot infer the predictions format of {path}, pass one of {FORMATS}.")
+    return _SUFFIXES[suffixes[-1]]
+
+
+def _read_parquet(path: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet predictions need PyArrow, install it with `pip install wikes-toolkit[arrow]`.")
+
+    parquet_file = pq.ParquetFile(path)
+    columns = [name for name in parquet_file.schema_arrow.names if name in KEY_COLUMNS + ('rank', 'score')]
+    for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+        yield batch.to_pandas()
+
+
+def read_predictions(path: Union[str, Path], format: Optional[str] = None,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Yields the rows of a predictions file as data frames of at most `chunk_size` rows."""
+    path = Path(path)
+    format = format or predictions_format(path)
+    if format == JSONL:
+        chunks = pd.read_json(path, lines=True, chunksize=chunk_size, dtype=False, convert_dates=False)
+    elif format == TSV:
+        chunks = pd.read_csv(path, sep='\t', chunksize=chunk_size, dtype={column: str for column in KEY_COLUMNS},
+                             keep_default_na=False, quoting=csv.QUOTE_NONE)
+    elif format == PARQUET:
+        chunks = _read_parquet(path, chunk_size)
+    else:
+        raise ValueError(f"Unknown predictions format: {format}, use one of {FORMATS}.")
+
+    with closing(chunks):
+        for chunk in chunks:
+            missing = [column for column in KEY_COLUMNS if column not in chunk.columns]
+            if missing:
+                raise ValueError(f"Predictions file {path} lacks the columns {missing}.")
+            yield chunk
+
+
+def _first_invalid(chunk: pd.DataFrame, invalid: np.ndarray, start: int, reason: str) -> ValueError:
+    position = int(np.flatnonzero(invalid)[0])
+    row = chunk.iloc[position]
+    return ValueError(f"Predictions row {start + position + 1} ({row['root_entity']}: {row['subject']}, "
+                      f"{row['predicate']}, {row['object']}) {reason}.")
+
+
+def load_predictions(G: BaseESGraph, path: Union[str, Path], format: Optional[str] = None,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE, top_k: Optional[int] = None, errors: str = 'raise',
+                     replace: bool = True, root_mask: Optional[np.ndarray] = None) -> PredictionsReport:
+    """Streams a predictions file into the summaries of `G`.
+
+    Rows naming an unknown root entity or triple, or a triple the root entity is neither subject nor object of, raise
+    a `ValueError` with `errors='raise'` and are counted and dropped with `errors='skip'`; summaries only change once
+    the whole file is read. Repeated triples of a root entity are dropped and only its first `top_k` distinct triples
+    are kept. With `replace` the summaries of all root entities are cleared first, as
+    `WikESToolkit.apply_predictions` does; otherwise the triples of the file are appended to the summaries already
+    marked, skipping those already present, and the summaries of root entities missing from the file are kept.
+
+    `root_mask`, a boolean mask over `G.root_entity_ids()`, restricts loading to the root entities it selects: rows of
+    the other root entities are always dropped and counted as `outside_mask`, and `replace` only clears the summaries
+    of the selected root entities.
+    """
+    if errors not in ('raise', 'skip'):
+        raise ValueError(f"errors should be 'raise' or 'skip', got {errors}.")
+    format = format or predictions_format(path)
+    report = PredictionsReport()
+    candidate_index = G.candidate_index()
+    root_entity_ids = G.root_entity_ids()
+    rows, triple_ids, orders = [], [], []
+    order_column = None
+
+    with instrumentation.span('predictions.load', graph=type(G).__name__, format=format):
+        for chunk in read_predictions(path, format, chunk_size):
+            start = report.rows
+            report.rows += chunk.shape[0]
+            if order_column is None:
+                order_column = 'rank' if 'rank' in chunk.columns else 'score' if 'score' in chunk.columns else ''
+
+            root_rows = candidate_index.rows(chunk['root_entity'].to_numpy())
+            chunk_triple_ids = G._encode_triples(
+                chunk['subject'].to_numpy(), chunk['predicate'].to_numpy(), chunk['object'].to_numpy()
+            )
+            unknown_roots = root_rows < 0
+            if root_mask is None:
+                outside_mask = np.zeros(root_rows.shape[0], dtype=bool)
+            else:
+                outside_mask = ~unknown_roots & ~root_mask[np.maximum(root_rows, 0)]
+            skipped = unknown_roots | outside_mask
+            unknown_triples = ~skipped & (chunk_triple_ids < 0)
+            not_incident = ~skipped & ~unknown_triples & ~candidate_index.is_candidate(root_rows, chunk_triple_ids)
+            if errors == 'raise':
+                for invalid, reason in ((unknown_roots, "names an unknown root entity"),
+                                        (unknown_triples, "names a triple which is not part of the graph"),
+                                        (not_incident, "names a triple the root entity is neither subject nor "
+                                                       "object of")):
+                    if invalid.any():
+                        raise _first_invalid(chunk, invalid, start, reason)
+            report.unknown_root_entities += int(np.count_nonzero(unknown_roots))
+            report.unknown_triples += int(np.count_nonzero(unknown_triples))
+            report.not_incident += int(np.count_nonzero(not_incident))
+            report.outside_mask += int(np.count_nonzero(outside_mask))
+
+            valid = ~(skipped | unknown_triples | not_incident)
+            rows.append(root_rows[valid].astype(np.int64))
+            triple_ids.append(chunk_triple_ids[valid])
+            if order_column == 'rank':
+                orders.append(chunk['rank'].to_numpy(dtype=np.float64)[valid])
+            elif order_column == 'score':
+                orders.append(-chunk['score'].to_numpy(dtype=np.float64)[valid])
+            else:
+                orders.append(np.flatnonzero(valid).astype(np.float64) + start)
+            instrumentation.count('predictions.rows', chunk.shape[0])
+
+        rows = np.concatenate(rows + [np.empty(0, dtype=np.int64)])
+        triple_ids = np.concatenate(triple_ids + [np.empty(0, dtype=np.int64)])
+        orders = np.concatenate(orders + [np.empty(0, dtype=np.float64)])
+        sort = np.lexsort((orders, rows))
+        rows, triple_ids = rows[sort], triple_ids[sort]
+        del orders, sort
+        keys = rows * np.int64(max(G.graph_index().total_triples, 1)) + triple_ids
+        first = np.zeros(rows.shape[0], dtype=bool)
+        first[np.unique(keys, return_index=True)[1]] = True
+        rows, triple_ids = rows[first], triple_ids[first]
+        del keys, first
+
+        present, starts = np.unique(rows, return_index=True)
+        ends = np.append(starts[1:], rows.shape[0])
+        if top_k is not None:
+            ends = np.minimum(ends, starts + top_k)
+        predictions: Dict[str, np.ndarray] = {
+            root_entity_ids[row]: triple_ids[start:end]
+            for row, start, end in zip(present.tolist(), starts.tolist(), ends.tolist())
+        }
+        report.root_entities = len(predictions)
+        report.loaded = sum(ranking.shape[0] for ranking in predictions.values())
+        if replace and root_mask is None:
+            G.clear_summaries()
+        elif replace:
+            G.mark_all_triple_ids_as_summaries(
+                {root_entity_ids[row]: [] for row in np.flatnonzero(root_mask).tolist()}, replace=True
+            )
+        G.mark_all_triple_ids_as_summaries(predictions, replace=replace)
+    return report
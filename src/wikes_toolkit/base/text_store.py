@@ -0,0 +1,219 @@
+"""Compact, memory-mapped store for the text attributes of entities and predicates.
+
+Labels, descriptions and titles are rarely read while scoring, yet as Python strings they take most of a loaded
+graph's memory. A `TextStore` keeps every text column of a table as one contiguous UTF-8 buffer, int64 offsets
+(value `i` being `data[offsets[i]:offsets[i + 1]]`) and a boolean mask of the rows holding a value. Opened from a file
+the arrays are memory-mapped, so the operating system pages text in only when a value is read and can drop it again
+under memory pressure.
+
+The file starts with `MAGIC`, the little-endian uint64 length of a UTF-8 JSON header and the header itself, which
+lists for every table its row count and the byte range of each column array, and the size and modification time of
+the dataset file the text was read from. The arrays follow, 8 byte aligned.
+
+Objects read their text through `TextField` attributes from the `TextTable` their graph shares between all of them,
+which finds an object's row by its key.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+TEXT_STORE_FORMAT = 'wikes-text'
+TEXT_STORE_VERSION = 1
+TEXT_STORE_KIND = 'text'
+MAGIC = b'WIKESTXT'
+_ALIGNMENT = 8
+_ARRAYS = (('data', np.uint8), ('offsets', np.dtype('<i8')), ('valid', np.bool_))
+
+
+def source_stamp(path: Union[str, Path]) -> Dict[str, int]:
+    """Size and modification time of `path`, which tell a rewritten dataset file apart without reading it."""
+    stat = Path(path).stat()
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _padding(size: int) -> int:
+    return -size % _ALIGNMENT
+
+
+class TextColumn:
+    __slots__ = ('data', 'offsets', 'valid')
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray, valid: np.ndarray):
+        self.data = data
+        self.offsets = offsets
+        self.valid = valid
+
+    @classmethod
+    def from_values(cls, values: Sequence[Optional[str]]) -> TextColumn:
+        encoded = [b'' if value is None else value.encode('utf-8') for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        valid = np.array([value is not None for value in values], dtype=bool)
+        return cls(np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets, valid)
+
+    def __len__(self) -> int:
+        return self.valid.shape[0]
+
+    def get(self, row: int) -> Optional[str]:
+        if not self.valid[row]:
+            return None
+        return self.data[self.offsets[row]:self.offsets[row + 1]].tobytes().decode('utf-8')
+
+    def values(self) -> List[Optional[str]]:
+        buffer = self.data.tobytes()
+        bounds = self.offsets.tolist()
+        return [buffer[start:end].decode('utf-8') if valid else None
+                for start, end, valid in zip(bounds[:-1], bounds[1:], self.valid.tolist())]
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes + self.offsets.nbytes + self.valid.nbytes
+
+
+class TextTable:
+    """The columns of one `TextStore` table, shared by the objects of a graph. An object's row is the position of its
+    `key` attribute in `keys`."""
+    __slots__ = ('columns', 'keys', 'key')
+
+    def __init__(self, columns: Dict[str, TextColumn], keys: pd.Index, key: str):
+        self.columns = columns
+        self.keys = keys
+        self.key = key
+
+    def get(self, instance, column: str) -> Optional[str]:
+        return self.columns[column].get(self.keys.get_loc(getattr(instance, self.key)))
+
+
+class TextField:
+    """Dataclass field read from the instance's `text` table while no value has been assigned to it.
+
+    As the default of a dataclass field it defaults to `None`. Only values other than `None` are kept in the
+    instance's `__dict__`, so objects without text take no space for it, and objects built with explicit strings
+    behave as plain dataclasses.
+    """
+
+    def __init__(self, column: Optional[str] = None):
+        self.column = column
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+        self.column = self.column or name
+
+    def __get__(self, instance, owner=None) -> Optional[str]:
+        if instance is None:
+            return None
+        if self.name in instance.__dict__:
+            return instance.__dict__[self.name]
+        text: Optional[TextTable] = instance.text
+        return None if text is None else text.get(instance, self.column)
+
+    def __set__(self, instance, value: Optional[str]):
+        if value is None:
+            instance.__dict__.pop(self.name, None)
+        else:
+            instance.__dict__[self.name] = value
+
+
+class TextStore:
+
+    def __init__(self, tables: Dict[str, Dict[str, TextColumn]], path: Optional[Path] = None,
+                 source: Optional[Dict[str, int]] = None):
+        self.tables = tables
+        self.path = path
+        self.source = source
+
+    @classmethod
+    def from_values(cls, tables: Dict[str, Dict[str, Sequence[Optional[str]]]],
+                    source: Optional[Dict[str, int]] = None) -> TextStore:
+        """An in-memory store of `tables`, mapping table names to equally long text columns."""
+        encoded = {}
+        for table, columns in tables.items():
+            encoded[table] = {name: TextColumn.from_values(values) for name, values in columns.items()}
+            if len({len(column) for column in encoded[table].values()}) > 1:
+                raise ValueError(f"The text columns of table [{table}] differ in length.")
+        return cls(encoded, source=source)
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> TextStore:
+        path = Path(path)
+        buffer = np.memmap(path, dtype=np.uint8, mode='r')
+        if buffer.shape[0] < 16 or buffer[:8].tobytes() != MAGIC:
+            raise ValueError(f"{path} is not a {TEXT_STORE_FORMAT} file.")
+        header_size = int.from_bytes(buffer[8:16].tobytes(), 'little')
+        header = json.loads(buffer[16:16 + header_size].tobytes().decode('utf-8'))
+        if header.get('format') != TEXT_STORE_FORMAT:
+            raise ValueError(f"Unknown text store format: {header.get('format')}.")
+        if header.get('version') != TEXT_STORE_VERSION:
+            raise ValueError(f"Unsupported {TEXT_STORE_FORMAT} version: {header.get('version')}.")
+
+        base = 16 + header_size + _padding(16 + header_size)
+        tables = {}
+        for table, description in header['tables'].items():
+            tables[table] = {}
+            rows = description['rows']
+            for name, ranges in description['columns'].items():
+                if any(base + start + size > buffer.shape[0] for start, size in ranges.values()):
+                    raise ValueError(f"{path} is truncated.")
+                arrays = {key: buffer[base + ranges[key][0]:base + ranges[key][0] + ranges[key][1]].view(dtype)
+                          for key, dtype in _ARRAYS}
+                if arrays['valid'].shape[0] != rows or arrays['offsets'].shape[0] != rows + 1:
+                    raise ValueError(f"{path} has inconsistent text column [{table}.{name}].")
+                tables[table][name] = TextColumn(**arrays)
+        return cls(tables, path, header.get('source'))
+
+    def write(self, path: Union[str, Path]) -> Path:
+        path = Path(path)
+        header = {'format': TEXT_STORE_FORMAT, 'version': TEXT_STORE_VERSION, 'source': self.source,
+                  'tables': {}}
+        arrays, position = [], 0
+        for table, columns in self.tables.items():
+            header['tables'][table] = {'rows': self.rows(table), 'columns': {}}
+            for name, column in columns.items():
+                ranges = {}
+                for key, dtype in _ARRAYS:
+                    data = np.ascontiguousarray(getattr(column, key), dtype=dtype).tobytes()
+                    ranges[key] = [position, len(data)]
+                    arrays.append(data + b'\0' * _padding(len(data)))
+                    position += len(arrays[-1])
+                header['tables'][table]['columns'][name] = ranges
+        header_bytes = json.dumps(header).encode('utf-8')
+
+        with open(path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(len(header_bytes).to_bytes(8, 'little'))
+            f.write(header_bytes + b'\0' * _padding(16 + len(header_bytes)))
+            for data in arrays:
+                f.write(data)
+        return path
+
+    def table(self, table: str) -> Dict[str, TextColumn]:
+        if table not in self.tables:
+            raise ValueError(f"The text store has no table [{table}], found {sorted(self.tables)}.")
+        return self.tables[table]
+
+    def rows(self, table: str) -> int:
+        return max((len(column) for column in self.table(table).values()), default=0)
+
+    def shared_table(self, table: str, keys: Sequence[str], key: str) -> TextTable:
+        """`table` for objects whose `key` attribute is listed in `keys`, which must match its `identifier` column."""
+        columns = self.table(table)
+        keys = pd.Index(keys)
+        identifiers = columns['identifier'].values()
+        if len(identifiers) != len(keys) or not keys.equals(pd.Index(identifiers)):
+            raise ValueError(f"The text store table [{table}] does not match the graph, delete it to rebuild it.")
+        return TextTable(columns, keys, key)
+
+    def text(self, table: str, column: str, row: int) -> Optional[str]:
+        return self.table(table)[column].get(row)
+
+    def texts(self, table: str, column: str) -> List[Optional[str]]:
+        return self.table(table)[column].values()
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for columns in self.tables.values() for column in columns.values())
@@ -3,6 +3,7 @@ from __future__ import annotations
 from abc import abstractmethod
 from dataclasses import dataclass
 from enum import Enum
+from typing import Dict, Optional
 
 
 @dataclass
@@ -19,3 +20,20 @@ class DatasetName(Enum):
     @abstractmethod
     def get_version(self) -> str:
         pass
+
+
+SPLITS = ('train', 'val', 'test')
+_SPLIT_MEMBERS = {'train': 'TRAIN', 'val': 'VALIDATION', 'test': 'TEST'}
+
+
+def split_datasets(dataset: DatasetName, fold: Optional[int] = None) -> Dict[str, DatasetName]:
+    """The train, validation and test splits published for a full dataset, e.g. `WikiLitArt.SMALL_TRAIN` for
+    `WikiLitArt.SMALL` or `V1Dot2.DBPEDIA_TRAIN_0` for `V1Dot2.DBPEDIA_FULL` with `fold=0`."""
+    prefix = dataset.name[:-len('_FULL')] if dataset.name.endswith('_FULL') else dataset.name
+    suffix = '' if fold is None else f"_{fold}"
+    members = type(dataset).__members__
+    splits = {split: members.get(f"{prefix}_{member}{suffix}") for split, member in _SPLIT_MEMBERS.items()}
+    missing = [split for split, member in splits.items() if member is None]
+    if missing:
+        raise ValueError(f"Dataset [{dataset}] has no {missing} split" + (f" for fold {fold}." if suffix else "."))
+    return splits
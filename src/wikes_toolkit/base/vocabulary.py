@@ -0,0 +1,150 @@
+"""Interning pool shared by the graphs loaded in a process.
+
+WikES datasets overlap heavily in their Wikidata entities, predicates and labels, yet every loaded file brings its
+own copies of these strings. A `Vocabulary` keeps one canonical string per distinct value and numbers them in
+insertion order. `intern_graph` replaces the identifiers and string attributes of a networkx graph by the canonical
+strings before a backend copies them, so identical strings of different datasets are stored once, and `codes` maps
+strings to the vocabulary's integer ids, which are comparable across datasets.
+
+A vocabulary saved with `save` keeps its ids when it is opened again, so codes stored next to results stay valid.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union, TYPE_CHECKING
+
+import numpy as np
+
+from wikes_toolkit.base import instrumentation
+from wikes_toolkit.base.graph_format import encode_strings, decode_strings
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+VOCABULARY_FORMAT = 'wikes-vocabulary'
+VOCABULARY_VERSION = 1
+
+
+def _intern_keys(d: Dict, intern):
+    """Re-keys `d` in place with canonical strings, keeping its identity and order."""
+    items = list(d.items())
+    d.clear()
+    d.update((intern(key) if isinstance(key, str) else key, value) for key, value in items)
+
+
+def _intern_values(d: Dict, intern):
+    for key, value in d.items():
+        if isinstance(value, str):
+            d[key] = intern(value)
+
+
+class Vocabulary:
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        self.path = Path(path) if path is not None else None
+        self._strings: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._index = None
+        if self.path is not None and self.path.exists():
+            self._load(self.path)
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __contains__(self, value: str) -> bool:
+        return value in self._ids
+
+    def _add(self, value: str) -> str:
+        identifier = self._ids.get(value)
+        if identifier is None:
+            self._ids[value] = len(self._strings)
+            self._strings.append(value)
+            return value
+        return self._strings[identifier]
+
+    def intern(self, value: str) -> str:
+        """The canonical copy of `value`, adding it to the vocabulary when it is new."""
+        with self._lock:
+            return self._add(value)
+
+    def string(self, identifier: int) -> str:
+        return self._strings[identifier]
+
+    def strings(self, identifiers: Sequence[int]) -> np.ndarray:
+        return np.array(self._strings, dtype=object)[np.asarray(identifiers, dtype=np.int64)]
+
+    def codes(self, values: Sequence[str]) -> np.ndarray:
+        """Integer ids of `values`, -1 for values which are not part of the vocabulary."""
+        import pandas as pd
+
+        with self._lock:
+            if self._index is None or len(self._index) != len(self._strings):
+                self._index = pd.Index(self._strings, dtype=object)
+            index = self._index
+        return index.get_indexer(values).astype(np.int64)
+
+    def intern_graph(self, G: nx.MultiDiGraph) -> nx.MultiDiGraph:
+        """Replaces node identifiers and string node and edge attributes of `G` by their canonical copies, in place."""
+        with instrumentation.span('vocabulary.intern_graph', nodes=G.number_of_nodes()), self._lock:
+            before = len(self._strings)
+            intern = self._add
+            for data in G._node.values():
+                _intern_values(data, intern)
+            for neighbors in G._succ.values():
+                for keys in neighbors.values():
+                    for data in keys.values():
+                        _intern_values(data, intern)
+                _intern_keys(neighbors, intern)
+            for neighbors in G._pred.values():
+                _intern_keys(neighbors, intern)
+            for table in (G._node, G._succ, G._pred):
+                _intern_keys(table, intern)
+            instrumentation.count('vocabulary.new_strings', len(self._strings) - before)
+        return G
+
+    def save(self, path: Optional[Union[str, Path]] = None) -> Path:
+        """Writes the vocabulary to `path` or to the path it was opened with, replacing the file atomically."""
+        path = Path(path) if path is not None else self.path
+        if path is None:
+            raise ValueError("The vocabulary has no path, pass one to save it.")
+        with self._lock:
+            data, offsets = encode_strings(self._strings)
+        temporary_path = path.with_name(path.name + '.part')
+        with open(temporary_path, 'wb') as f:
+            np.savez(f, format=np.frombuffer(VOCABULARY_FORMAT.encode('utf-8'), dtype=np.uint8),
+                     version=np.array(VOCABULARY_VERSION), data=data, offsets=offsets)
+        os.replace(temporary_path, path)
+        return path
+
+    def _load(self, path: Path):
+        with np.load(path, allow_pickle=False) as archive:
+            if archive['format'].tobytes().decode('utf-8') != VOCABULARY_FORMAT:
+                raise ValueError(f"{path} is not a vocabulary file.")
+            if int(archive['version']) != VOCABULARY_VERSION:
+                raise ValueError(f"Unsupported {VOCABULARY_FORMAT} version: {int(archive['version'])}.")
+            strings = decode_strings(archive['data'], archive['offsets'])
+        with self._lock:
+            for value in strings:
+                self._add(value)
+
+
+_shared_vocabulary: Optional[Vocabulary] = None
+_shared_lock = threading.Lock()
+
+
+def shared_vocabulary() -> Vocabulary:
+    """The process wide vocabulary, created empty on first use."""
+    global _shared_vocabulary
+    with _shared_lock:
+        if _shared_vocabulary is None:
+            _shared_vocabulary = Vocabulary()
+        return _shared_vocabulary
+
+
+def set_shared_vocabulary(vocabulary: Optional[Vocabulary]):
+    """Replaces the process wide vocabulary, e.g. by one opened from disk."""
+    global _shared_vocabulary
+    _shared_vocabulary = vocabulary
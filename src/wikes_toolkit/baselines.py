@@ -0,0 +1,86 @@
+from typing import Dict, Optional
+
+import numpy as np
+
+from wikes_toolkit.base import instrumentation
+from wikes_toolkit.base.graph_components import BaseESGraph
+from wikes_toolkit.base.graph_index import GraphIndex
+
+DEGREE = 'degree'
+PREDICATE_FREQUENCY = 'predicate_frequency'
+PAGERANK = 'pagerank'
+
+
+def entity_degrees(index: GraphIndex) -> np.ndarray:
+    return index.degrees().astype(np.float64)
+
+
+def inverse_predicate_frequencies(index: GraphIndex) -> np.ndarray:
+    frequencies = np.bincount(index.predicates, minlength=index.total_predicates).astype(np.float64)
+    return np.log(max(index.total_triples, 1) / np.maximum(frequencies, 1))
+
+
+def pagerank(index: GraphIndex, damping: float = 0.85, tolerance: float = 1e-8,
+             max_iterations: int = 100) -> np.ndarray:
+    total_entities = index.total_entities
+    if total_entities == 0:
+        return np.empty(0, dtype=np.float64)
+    out_degrees = np.diff(index.out_offsets).astype(np.float64)
+    dangling = out_degrees == 0
+    inverse_out_degrees = np.divide(1.0, out_degrees, out=np.zeros_like(out_degrees), where=~dangling)
+    ranks = np.full(total_entities, 1.0 / total_entities)
+    for _ in range(max_iterations):
+        previous = ranks
+        ranks = np.bincount(index.objects, weights=(ranks * inverse_out_degrees)[index.subjects],
+                            minlength=total_entities)
+        ranks = damping * (ranks + previous[dangling].sum() / total_entities) + (1 - damping) / total_entities
+        if np.abs(ranks - previous).sum() < tolerance * total_entities:
+            break
+    return ranks
+
+
+def candidate_scores(G: BaseESGraph, method: str = DEGREE, **kwargs) -> np.ndarray:
+    """Scores every (root entity, candidate triple) pair of `G.candidate_index()`, aligned with its triple ids.
+
+    Entity based scores (degree and PageRank) are taken from the triple's endpoint that is not the root entity.
+    """
+    index = G.graph_index()
+    candidates = G.candidate_index()
+    triple_ids = candidates.triple_ids
+    if method == PREDICATE_FREQUENCY:
+        return inverse_predicate_frequencies(index)[index.predicates[triple_ids]]
+
+    if method == DEGREE:
+        entity_scores = entity_degrees(index)
+    elif method == PAGERANK:
+        entity_scores = pagerank(index, **kwargs)
+    else:
+        raise ValueError(f"Unknown baseline method: {method}")
+    roots = np.repeat(candidates.root_entities, candidates.counts())
+    subjects = index.subjects[triple_ids]
+    others = np.where(subjects == roots, index.objects[triple_ids], subjects)
+    return entity_scores[others]
+
+
+def rank_candidates(G: BaseESGraph, method: str = DEGREE, top_k: Optional[int] = None, write: bool = True,
+                    **kwargs) -> Dict[str, np.ndarray]:
+    """Ranks the candidate triples of every root entity at once, highest score first and ties by triple id.
+
+    With `write` the rankings replace the graph's predicted summaries, ready for `f1_score`/`map_score`.
+    """
+    with instrumentation.span('baselines.rank_candidates', method=method, top_k=top_k):
+        candidates = G.candidate_index()
+        scores = candidate_scores(G, method, **kwargs)
+        rows = np.repeat(np.arange(len(candidates)), candidates.counts())
+        order = np.lexsort((candidates.triple_ids, -scores, rows))
+        ranked = candidates.triple_ids[order]
+        starts = candidates.offsets[:-1]
+        ends = candidates.offsets[1:] if top_k is None else np.minimum(candidates.offsets[1:], starts + top_k)
+        rankings = {
+            root_entity_id: ranked[start:end]
+            for root_entity_id, start, end in zip(G.root_entity_ids(), starts.tolist(), ends.tolist())
+        }
+        if write:
+            G.clear_summaries()
+            G.mark_all_triple_ids_as_summaries(rankings, replace=True)
+        return rankings
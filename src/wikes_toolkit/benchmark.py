@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Type, Union
+
+from wikes_toolkit.base.graph_components import BaseESGraph
+from wikes_toolkit.base.versions import DatasetName
+from wikes_toolkit.esbm.esbm_graph import ESBMGraph
+from wikes_toolkit.esbm.esbm_graph_components import ESBMBaseGraph
+from wikes_toolkit.esbm.esbm_pandas_graph import PandasESBMGraph
+from wikes_toolkit.synthetic.synthetic_generator import generate_synthetic_dataset, WIKES_FAMILY, ESBM_FAMILY
+from wikes_toolkit.toolkit import WikESToolkit
+from wikes_toolkit.wikes.wikes_graph import WikESGraph
+from wikes_toolkit.wikes.wikes_pandas_graph import PandasWikESGraph
+from wikes_toolkit import baselines
+
+logger = logging.getLogger(__name__)
+
+HEAVY_MODULES = ('numpy', 'networkx', 'pandas', 'polars', 'requests', 'tqdm', 'rdflib')
+IMPORT_STATEMENTS = (
+    'import wikes_toolkit',
+    'import wikes_toolkit.cli',
+    'from wikes_toolkit import WikESToolkit',
+    'from wikes_toolkit import ESBMGraph',
+    'from wikes_toolkit import WikESGraph, PandasWikESGraph',
+)
+_IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed, [name for name in {heavy!r} if name in sys.modules]]))
+"""
+
+
+def available_backends(family: str = WIKES_FAMILY) -> List[Type[BaseESGraph]]:
+    """Graph classes of a dataset family, the Polars ones only when Polars is installed."""
+    backends = [WikESGraph, PandasWikESGraph] if family == WIKES_FAMILY else [ESBMGraph, PandasESBMGraph]
+    try:
+        if family == WIKES_FAMILY:
+            from wikes_toolkit.wikes.wikes_polars_graph import PolarsWikESGraph
+            backends.append(PolarsWikESGraph)
+        else:
+            from wikes_toolkit.esbm.esbm_polars_graph import PolarsESBMGraph
+            backends.append(PolarsESBMGraph)
+    except ImportError:
+        logger.debug("Polars is not installed, skipping the Polars backend.")
+    return backends
+
+
+def _timed(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def benchmark_backends(toolkit: WikESToolkit, dataset: DatasetName, backends: Sequence[Type[BaseESGraph]],
+                       lookups: int = 1000, seed: int = 0) -> List[Dict[str, Union[str, float]]]:
+    """Times loading, single item lookups, ground-truth access and scoring of `dataset` on every backend.
+
+    All backends look up the same randomly drawn entities and triples. Times are in seconds, lookups are totals
+    over `lookups` calls.
+    """
+    results = []
+    entity_sample, triple_sample = None, None
+    for backend in backends:
+        start = time.perf_counter()
+        G = toolkit.load_graph(backend, dataset)
+        result = {'backend': backend.__name__, 'load': time.perf_counter() - start}
+
+        if entity_sample is None:
+            rng = random.Random(seed)
+            index = G.graph_index()
+            entity_sample = [index.entity_ids[rng.randrange(index.total_entities)] for _ in range(lookups)]
+            triple_sample = G.triple_ids_to_keys([rng.randrange(index.total_triples) for _ in range(lookups)])
+
+        result['fetch_entity'] = _timed(lambda: [G.fetch_entity(entity) for entity in entity_sample])
+        result['fetch_triple'] = _timed(lambda: [G.fetch_triple(triple) for triple in triple_sample])
+        result['fetch_entities'] = _timed(G.fetch_entities, entity_sample)
+        result['fetch_triples'] = _timed(G.fetch_triples, triple_sample)
+        result['neighbors'] = _timed(lambda: [G.neighbors(entity) for entity in entity_sample])
+        if isinstance(G, ESBMBaseGraph):
+            result['ground_truths'] = _timed(G.all_gold_top_k, 5)
+        else:
+            result['ground_truths'] = _timed(G.all_ground_truth_triple_ids)
+        result['graph_index'] = _timed(G.graph_index)
+        baselines.rank_candidates(G, baselines.DEGREE, top_k=10)
+        result['f1_score'] = _timed(G.f1_score, 5 if isinstance(G, ESBMBaseGraph) else 10)
+        results.append(result)
+        del G
+    return results
+
+
+def benchmark_imports(statements: Sequence[str] = IMPORT_STATEMENTS,
+                      repeats: int = 5) -> List[Dict[str, Union[str, float, List[str]]]]:
+    """Cold import time of every statement, each run in a fresh interpreter.
+
+    Times are the median over `repeats` interpreters, in seconds; `loaded` lists the `HEAVY_MODULES` it imported.
+    """
+    results = []
+    for statement in statements:
+        times, loaded = [], []
+        for _ in range(repeats):
+            probe = _IMPORT_PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+            output = subprocess.run([sys.executable, '-c', probe], capture_output=True, text=True, check=True)
+            elapsed, loaded = json.loads(output.stdout.splitlines()[-1])
+            times.append(elapsed)
+        results.append({'statement': statement, 'import_time': sorted(times)[len(times) // 2], 'loaded': loaded})
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None, prog: Optional[str] = None):
+    parser = argparse.ArgumentParser(prog=prog, description="Compare the graph backends on a synthetic dataset.")
+    parser.add_argument('--family', choices=[WIKES_FAMILY, ESBM_FAMILY], default=WIKES_FAMILY)
+    parser.add_argument('--entities', type=int, default=50_000)
+    parser.add_argument('--triples', type=int, default=500_000)
+    parser.add_argument('--root-entities', type=int, default=500)
+    parser.add_argument('--lookups', type=int, default=1000)
+    parser.add_argument('--save-path', type=Path, default=None)
+    parser.add_argument('--imports', action='store_true', help="Time cold imports of the package instead.")
+    args = parser.parse_args(argv)
+
+    if args.imports:
+        for result in benchmark_imports():
+            print(json.dumps(result))
+        return
+
+    with tempfile.TemporaryDirectory() as temporary_path:
+        save_path = args.save_path or Path(temporary_path)
+        name = f"bench-{args.family}-{args.entities}-{args.triples}"
+        dataset = generate_synthetic_dataset(
+            save_path, name, args.family,
+            total_entities=args.entities, total_triples=args.triples, total_root_entities=args.root_entities
+        )
+        toolkit = WikESToolkit(save_path, logging.WARNING)
+        for result in benchmark_backends(toolkit, dataset, available_backends(args.family), args.lookups):
+            print(json.dumps(result))
+
+
+if __name__ == '__main__':
+    main()
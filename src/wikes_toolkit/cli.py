@@ -0,0 +1,276 @@
+"""The `wikes` command line interface.
+
+Heavy modules (networkx, pandas, the graph backends) are imported inside the subcommands that need them, so parsing
+arguments and metadata only commands such as `info` start quickly.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from wikes_toolkit.base.versions import DatasetName
+from wikes_toolkit.synthetic.synthetic_versions import SyntheticVersions, WIKES_FAMILY, ESBM_FAMILY
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ('dict', 'pandas', 'polars')
+
+
+def available_datasets() -> List[DatasetName]:
+    from wikes_toolkit.esbm.esbm_versions import ESBMVersions
+    from wikes_toolkit.wikes.wikes_versions import WikESVersions
+
+    datasets = []
+    for version_class in WikESVersions.available_versions() + ESBMVersions.available_versions():
+        datasets.extend(version_class)
+    return sorted(datasets, key=lambda dataset: (dataset.get_version(), dataset.value))
+
+
+def resolve_dataset(name: str) -> DatasetName:
+    """Dataset from `<name>` or `<version>/<name>`, e.g. `WikiLitArt-s` or `synthetic/tiny`."""
+    version, _, value = name.rpartition('/')
+    if version == SyntheticVersions.version:
+        return SyntheticVersions.register(value)
+    matches = [
+        dataset for dataset in available_datasets()
+        if dataset.value == value and version in ('', dataset.get_version())
+    ]
+    if not matches:
+        raise ValueError(f"Unknown dataset: {name}, run `wikes fetch --list` to see the available ones.")
+    if len(matches) > 1:
+        raise ValueError(f"Dataset {name} exists in several versions, use one of: "
+                         f"{[f'{dataset.get_version()}/{dataset.value}' for dataset in matches]}.")
+    return matches[0]
+
+
+def dataset_family(dataset: DatasetName, default: str = WIKES_FAMILY) -> str:
+    from wikes_toolkit.esbm.esbm_versions import ESBMVersions
+    from wikes_toolkit.wikes.wikes_versions import WikESVersions
+
+    if isinstance(dataset, WikESVersions.available_versions()):
+        return WIKES_FAMILY
+    if isinstance(dataset, ESBMVersions.available_versions()):
+        return ESBM_FAMILY
+    return default
+
+
+def graph_class(family: str, backend: str):
+    if family == ESBM_FAMILY:
+        if backend == 'dict':
+            from wikes_toolkit.esbm.esbm_graph import ESBMGraph
+            return ESBMGraph
+        if backend == 'pandas':
+            from wikes_toolkit.esbm.esbm_pandas_graph import PandasESBMGraph
+            return PandasESBMGraph
+        from wikes_toolkit.esbm.esbm_polars_graph import PolarsESBMGraph
+        return PolarsESBMGraph
+    if backend == 'dict':
+        from wikes_toolkit.wikes.wikes_graph import WikESGraph
+        return WikESGraph
+    if backend == 'pandas':
+        from wikes_toolkit.wikes.wikes_pandas_graph import PandasWikESGraph
+        return PandasWikESGraph
+    from wikes_toolkit.wikes.wikes_polars_graph import PolarsWikESGraph
+    return PolarsWikESGraph
+
+
+def _toolkit(args):
+    from wikes_toolkit.base.dataset_store import DatasetStore
+    from wikes_toolkit.toolkit import WikESToolkit
+
+    store = DatasetStore(args.store, read_only=args.read_only_store) if args.store else None
+    return WikESToolkit(args.save_path, args.log_level, store, allow_pickle=not args.no_pickle)
+
+
+def _print_json(data, output: Optional[Path] = None):
+    text = json.dumps(data, indent=2)
+    if output is None:
+        print(text)
+    else:
+        output.write_text(text + '\n', encoding='utf-8')
+
+
+def fetch(args) -> int:
+    if args.list:
+        for dataset in available_datasets():
+            print(f"{dataset.get_version()}/{dataset.value}")
+        return 0
+    if not args.datasets:
+        raise ValueError("Name at least one dataset to fetch, or use --list.")
+    datasets = [resolve_dataset(name) for name in args.datasets]
+
+    import asyncio
+    from wikes_toolkit.async_toolkit import AsyncWikESToolkit
+
+    async def prefetch():
+        async with AsyncWikESToolkit(
+                args.save_path, args.log_level, max_concurrent_downloads=args.concurrency,
+                store=_toolkit(args).store
+        ) as toolkit:
+            return await toolkit.prefetch(datasets)
+
+    for dataset, path in zip(datasets, asyncio.run(prefetch())):
+        print(f"{dataset.get_version()}/{dataset.value}\t{path}")
+    return 0
+
+
+def convert(args) -> int:
+    toolkit = _toolkit(args)
+    for name in args.datasets:
+        dataset = resolve_dataset(name)
+        print(f"{dataset.get_version()}/{dataset.value}\t{toolkit.convert(dataset, args.compress)}")
+    return 0
+
+
+def _column_counts(path: Path, table: str, columns: Dict[str, str]) -> Dict[str, int]:
+    """Rows holding a value in every attribute column, read from the small per column arrays only."""
+    import numpy as np
+
+    counts = {}
+    with np.load(path, allow_pickle=False) as archive:
+        for name, column_type in columns.items():
+            key = f"{table}__{name}"
+            if column_type == 'string':
+                counts[name] = int(np.count_nonzero(archive[f"{key}__codes"] >= 0))
+            else:
+                counts[name] = int(np.count_nonzero(archive[f"{key}__valid"]))
+            if column_type == 'bool':
+                counts[f"{name}=true"] = int(np.count_nonzero(archive[f"{key}__values"]))
+    return counts
+
+
+def info(args) -> int:
+    from wikes_toolkit.base import graph_format
+
+    toolkit = _toolkit(args)
+    results = []
+    for name in args.datasets:
+        dataset = resolve_dataset(name)
+        dataset_path = toolkit.locate(dataset)
+        converted_path = toolkit.locate_converted(dataset)
+        result = {
+            'dataset': dataset.value,
+            'version': dataset.get_version(),
+            'path': str(dataset_path) if dataset_path else None,
+            'size': dataset_path.stat().st_size if dataset_path else None,
+            'converted_path': str(converted_path) if converted_path else None,
+        }
+        if converted_path is not None:
+            metadata = graph_format.read_metadata(converted_path)
+            result['graph'] = metadata['graph']
+            for table in ('nodes', 'edges'):
+                result[table] = metadata[table]['count']
+                result[f"{table}_columns"] = _column_counts(converted_path, table, metadata[table]['columns'])
+        else:
+            logger.info(f"Dataset [{dataset}] has no converted copy, run `wikes convert` for its statistics.")
+        results.append(result)
+    _print_json(results if len(results) > 1 else results[0])
+    return 0
+
+
+def read_predictions(path: Path) -> Dict[str, List[Tuple[str, str, str]]]:
+    """Predictions as a JSON object mapping every root entity id to its ranked `[subject, predicate, object]` lists."""
+    with open(path, 'r', encoding='utf-8') as f:
+        predictions = json.load(f)
+    if not isinstance(predictions, dict):
+        raise ValueError(f"{path} should hold a JSON object of root entity ids and their predicted triples.")
+    return {root_entity: [tuple(triple) for triple in triples] for root_entity, triples in predictions.items()}
+
+
+def evaluate(args) -> int:
+    from wikes_toolkit.base import metrics
+    from wikes_toolkit.toolkit import WikESToolkit
+
+    names = args.metrics.split(',') if args.metrics else list(metrics.DEFAULT_METRICS)
+    dataset = resolve_dataset(args.dataset)
+    implementation_class = graph_class(dataset_family(dataset, args.family), args.backend)
+    G = _toolkit(args).load_graph(implementation_class, dataset, keep_networkx=False)
+    result = {
+        'dataset': dataset.value,
+        'version': dataset.get_version(),
+        'backend': implementation_class.__name__,
+        'top_k': args.k,
+        'no_rel': args.no_rel,
+        'root_entities': len(G.root_entity_ids()),
+    }
+    if args.format is None and args.predictions.suffix.lower() == '.json':
+        WikESToolkit.apply_predictions(G, read_predictions(args.predictions))
+    else:
+        report = G.load_predictions(args.predictions, args.format, errors='skip' if args.skip_invalid else 'raise')
+        result['predictions'] = asdict(report)
+    result['metrics'] = G.evaluate(names, args.k, args.no_rel)
+    _print_json(result, args.output)
+    return 0
+
+
+def bench(args, arguments: Sequence[str]) -> int:
+    from wikes_toolkit import benchmark
+
+    benchmark.main(arguments, prog='wikes bench')
+    return 0
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='wikes', description="Fetch, convert, inspect and score WikES datasets.")
+    parser.add_argument('--save-path', type=Path, default=None,
+                        help="Dataset directory, ~/.wikes_data by default.")
+    parser.add_argument('--store', type=Path, default=None, help="Root of a content-addressed dataset store.")
+    parser.add_argument('--read-only-store', action='store_true')
+    parser.add_argument('--no-pickle', action='store_true', help="Only load converted, pickle free datasets.")
+    parser.add_argument('-v', '--verbose', action='count', default=0)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    fetch_parser = commands.add_parser('fetch', help="Download datasets in parallel.")
+    fetch_parser.add_argument('datasets', nargs='*', help="<name> or <version>/<name>.")
+    fetch_parser.add_argument('--concurrency', type=int, default=4)
+    fetch_parser.add_argument('--list', action='store_true', help="List the published datasets.")
+
+    convert_parser = commands.add_parser('convert', help="Convert pickled datasets to the pickle free format.")
+    convert_parser.add_argument('datasets', nargs='+')
+    convert_parser.add_argument('--compress', action='store_true')
+
+    info_parser = commands.add_parser('info', help="Counts and statistics from the dataset metadata.")
+    info_parser.add_argument('datasets', nargs='+')
+
+    evaluate_parser = commands.add_parser('evaluate', help="Score a predictions file, printing metrics as JSON.")
+    evaluate_parser.add_argument('dataset')
+    evaluate_parser.add_argument('predictions', type=Path)
+    evaluate_parser.add_argument('--backend', choices=BACKENDS, default='pandas')
+    evaluate_parser.add_argument('--family', choices=[WIKES_FAMILY, ESBM_FAMILY], default=WIKES_FAMILY,
+                                 help="Family of synthetic datasets.")
+    evaluate_parser.add_argument('-k', type=int, default=None)
+    evaluate_parser.add_argument('--no-rel', action='store_true')
+    evaluate_parser.add_argument('--metrics', default=None, help="Comma separated, all built-in metrics by default.")
+    evaluate_parser.add_argument('--output', type=Path, default=None)
+    evaluate_parser.add_argument('--format', choices=['jsonl', 'tsv', 'parquet'], default=None,
+                                 help="Predictions file format, inferred from the file name by default.")
+    evaluate_parser.add_argument('--skip-invalid', action='store_true',
+                                 help="Count and drop invalid prediction rows instead of failing.")
+
+    commands.add_parser('bench', add_help=False, help="Compare the graph backends, see `wikes bench -h`.")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = _parser()
+    args, extra = parser.parse_known_args(argv)
+    if extra and args.command != 'bench':
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    args.log_level = max(logging.DEBUG, logging.WARNING - 10 * args.verbose)
+    logging.basicConfig(level=args.log_level)
+    try:
+        if args.command == 'bench':
+            return bench(args, extra)
+        return {'fetch': fetch, 'convert': convert, 'info': info, 'evaluate': evaluate}[args.command](args)
+    except (ValueError, OSError) as e:  # OSError includes requests.RequestException
+        print(f"wikes {args.command}: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,14 @@
 from typing import Dict, List, Tuple
+from wikes_toolkit.base import instrumentation
 from wikes_toolkit.base.evaluate import f1, map, f1_norel, map_norel
 
 
 class ESBMSummaryEvaluator:
+    """Reference ESBM evaluation built on `base.evaluate`, averaging every root entity over its annotators.
+
+    `ESBMBaseGraph.f1_score` and `map_score` compute the same scores from a `GoldTensor` and are tested against this
+    class.
+    """
     def __init__(self, root_entities: List[str], gold_summaries: Dict[str, List[List[Tuple[str, str, str]]]],
                  predictions: Dict[str, List[Tuple[str, str, str]]], top_k: int):
         self.gold_summaries = gold_summaries
@@ -21,55 +27,31 @@ class ESBMSummaryEvaluator:
         predictions = self.predictions.get(entity_id, [])
         return predictions[:self.top_k]
 
-    def evaluate_f1(self, no_rel: bool = False):
-        score_function = f1_norel if no_rel else f1
-
-        def calculate_average_prf(gold_summaries: List[List[Tuple[str, str, str]]],
-                                  algo_summary: List[Tuple[str, str, str]]):
-            f1_sum = 0
-            user_count = len(gold_summaries)
-
-            for gold_summary in gold_summaries:
-                f1_sum += score_function(gold_summary, algo_summary)
-
-            return f1_sum / user_count
-
-        entity_count = len(self.root_entities)
-        dataset_f1_sum = 0
-
+    def _entity_scores(self, score_function) -> List[float]:
+        """Scores of every root entity averaged over its annotators, 0 for roots without predictions."""
+        scores = []
         for entity_id in self.root_entities:
             gold_summaries = self.get_gold_summaries(entity_id)
             algo_summary = self.get_predications(entity_id)
-
             if algo_summary:
-                dataset_f1_sum += calculate_average_prf(gold_summaries, algo_summary)
-
-        return dataset_f1_sum / entity_count
-
-    def evaluate_map(self, no_rel: bool = False):
-        score_function = map_norel if no_rel else map
+                score_sum = 0
+                for gold_summary in gold_summaries:
+                    score_sum += score_function(gold_summary, algo_summary)
+                scores.append(score_sum / len(gold_summaries))
+            else:
+                scores.append(0)
+        return scores
 
-        def calculate_average_map(gold_summaries: List[List[Tuple[str, str, str]]],
-                                  algo_rank: List[Tuple[str, str, str]]):
-            map_sum = 0
-            user_count = len(gold_summaries)
+    def entity_f1_scores(self, no_rel: bool = False) -> List[float]:
+        return self._entity_scores(f1_norel if no_rel else f1)
 
-            for gold_summary in gold_summaries:
-                map_score = score_function(gold_summary, algo_rank)
-                map_sum += map_score
+    def entity_map_scores(self, no_rel: bool = False) -> List[float]:
+        return self._entity_scores(map_norel if no_rel else map)
 
-            return map_sum / user_count
-
-        entity_count = len(self.root_entities)
-        dataset_map_sum = 0
-
-        for entity_id in self.root_entities:
-            gold_summaries = self.get_gold_summaries(entity_id)
-            algo_summary = self.get_predications(entity_id)
-
-            if algo_summary:
-                dataset_map_sum += calculate_average_map(gold_summaries, algo_summary)
-
-        avg_map = dataset_map_sum / entity_count
+    def evaluate_f1(self, no_rel: bool = False):
+        with instrumentation.span('evaluate.f1', dataset='esbm', top_k=self.top_k, no_rel=no_rel):
+            return sum(self.entity_f1_scores(no_rel)) / len(self.root_entities)
 
-        return avg_map
+    def evaluate_map(self, no_rel: bool = False):
+        with instrumentation.span('evaluate.map', dataset='esbm', top_k=self.top_k, no_rel=no_rel):
+            return sum(self.entity_map_scores(no_rel)) / len(self.root_entities)
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+from wikes_toolkit.base.metrics import HitMatrix, pad_rows, first_occurrences
+
+
+@dataclass
+class GoldTensor:
+    """ESBM gold summaries as a roots x annotators x k tensor of integer codes, padded with -1.
+
+    Rows follow `root_entity_ids()`. `sizes` holds the size of every gold summary, including triples which are not
+    part of the graph and are therefore coded as -1, and `annotators` the number of gold summaries of every root.
+    """
+    codes: np.ndarray
+    sizes: np.ndarray
+    annotators: np.ndarray
+
+    @staticmethod
+    def build(summaries: Sequence[Sequence[np.ndarray]], k: int) -> GoldTensor:
+        """`summaries[r][a]` holds the codes of the summary of annotator `a` for root `r`."""
+        annotators = np.array([len(root_summaries) for root_summaries in summaries], dtype=np.int64)
+        width = int(annotators.max()) if annotators.shape[0] else 0
+        rows = [summary for root_summaries in summaries for summary in root_summaries]
+        mask = np.arange(width) < annotators[:, np.newaxis]
+        codes = np.full((annotators.shape[0], width, k), -1, dtype=np.int64)
+        codes[mask] = pad_rows(rows, k)
+        sizes = np.zeros((annotators.shape[0], width), dtype=np.int64)
+        sizes[mask] = np.minimum([len(row) for row in rows], k)
+        return GoldTensor(codes, sizes, annotators)
+
+    def take(self, positions: np.ndarray) -> GoldTensor:
+        return GoldTensor(self.codes[positions], self.sizes[positions], self.annotators[positions])
+
+    @property
+    def k(self) -> int:
+        return self.codes.shape[-1]
+
+    @property
+    def mask(self) -> np.ndarray:
+        return np.arange(self.codes.shape[1]) < self.annotators[:, np.newaxis]
+
+    def hit_matrix(self, predictions: np.ndarray) -> HitMatrix:
+        """Compares roots x k predicted codes, padded with -1, with every annotator's summary at once.
+
+        Repeated predictions are `matches` but not `hits`, see `HitMatrix`.
+        """
+        predictions = predictions[:, :self.k]
+        matches = (predictions[:, np.newaxis, :, np.newaxis] == self.codes[:, :, np.newaxis, :]).any(axis=-1)
+        matches &= (predictions >= 0)[:, np.newaxis, :]
+        hits = matches & first_occurrences(predictions)[:, np.newaxis, :]
+        lengths = (predictions >= 0).sum(axis=-1)[:, np.newaxis]
+        return HitMatrix(hits, np.full((predictions.shape[0], 1), self.k), lengths, self.sizes, self.mask, matches)
+
+    def overlaps(self) -> np.ndarray:
+        """Number of triples every pair of annotators of a root agree on, roots x annotators x annotators."""
+        valid = (self.codes >= 0) & first_occurrences(self.codes)
+        same = self.codes[:, :, np.newaxis, :, np.newaxis] == self.codes[:, np.newaxis, :, np.newaxis, :]
+        return (same.any(axis=-1) & valid[:, :, np.newaxis, :]).sum(axis=-1)
+
+    def pairwise_jaccard(self) -> np.ndarray:
+        """Mean Jaccard similarity over the pairs of distinct annotators of every root, 0 with fewer than two."""
+        overlaps = self.overlaps()
+        distinct = np.diagonal(overlaps, axis1=1, axis2=2)
+        unions = distinct[:, :, np.newaxis] + distinct[:, np.newaxis, :] - overlaps
+        pairs = self.mask[:, :, np.newaxis] & self.mask[:, np.newaxis, :] & ~np.eye(overlaps.shape[1], dtype=bool)
+        similarities = np.divide(overlaps, unions, out=np.zeros(overlaps.shape), where=pairs & (unions > 0))
+        counts = pairs.sum(axis=(1, 2))
+        return np.divide(similarities.sum(axis=(1, 2)), counts, out=np.zeros(counts.shape), where=counts > 0)
+
+    def fleiss_kappa(self, candidates: np.ndarray) -> np.ndarray:
+        """Fleiss' kappa of every root, each of its `candidates` triples being rated selected or not selected.
+
+        Roots with fewer than two annotators, no candidates or no variation in the ratings get NaN.
+        """
+        valid = (self.codes >= 0) & first_occurrences(self.codes)
+        same = (self.codes[:, :, :, np.newaxis, np.newaxis] == self.codes[:, np.newaxis, np.newaxis, :, :]) & \
+            valid[:, np.newaxis, np.newaxis, :, :]
+        raters = np.where(valid, same.sum(axis=(3, 4)), 0)
+        n = self.annotators.astype(np.float64)[:, np.newaxis, np.newaxis]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # A triple selected by c of n annotators appears in c slots, so its agreement is weighted by 1 / c.
+            agreement = np.where(valid, (raters * (raters - 1) + (n - raters) * (n - raters - 1))
+                                 / (n * (n - 1)) / np.maximum(raters, 1), 0).sum(axis=(1, 2))
+            selected = np.where(valid, 1 / np.maximum(raters, 1), 0).sum(axis=(1, 2))
+            candidates = np.asarray(candidates, dtype=np.float64)
+            observed = (agreement + (candidates - selected)) / candidates
+            p = valid.sum(axis=(1, 2)) / (candidates * self.annotators)
+            expected = p ** 2 + (1 - p) ** 2
+            return (observed - expected) / (1 - expected)
@@ -1,10 +1,11 @@
 import logging
 from collections import defaultdict
-from typing import Union, List, Optional, Dict, Tuple
+from typing import Union, List, Optional, Dict, Tuple, Iterator
 
 import networkx as nx
 
 from wikes_toolkit.base.graph_components import Entity, Triple, Predicate
+from wikes_toolkit.base import instrumentation
 from wikes_toolkit.base.versions import DatasetName
 from wikes_toolkit.esbm.esbm_graph_components import ESBMBaseGraph, ESBMEntity, ESBMTriple, ESBMPredicate, \
     ESBMRootEntity
@@ -39,21 +40,22 @@ class ESBMGraph(ESBMBaseGraph):
 
         logger.debug(f"Initializing ESBMGraph {self._dataset_name}...")
 
-        for node, data in self._G.nodes(data=True):
-            if data.get('is_root', False):
-                root_entity = ESBMRootEntity(
+        with instrumentation.span('initialize.entities', graph=type(self).__name__):
+            for node, data in self._G.nodes(data=True):
+                if data.get('is_root', False):
+                    root_entity = ESBMRootEntity(
+                        identifier=node,
+                        eid=data.get('eid'),
+                        category=data.get('category'),
+                        str_formatter=self._root_entity_formatter
+                    )
+                    self._root_entities[node] = root_entity
+
+                entity = ESBMEntity(
                     identifier=node,
-                    eid=data.get('eid'),
-                    category=data.get('category'),
-                    str_formatter=self._root_entity_formatter
+                    str_formatter=self._entity_formatter
                 )
-                self._root_entities[node] = root_entity
-
-            entity = ESBMEntity(
-                identifier=node,
-                str_formatter=self._entity_formatter
-            )
-            self._entities[node] = entity
+                self._entities[node] = entity
         logger.debug(f"Entities: {len(self._entities)} initialized.")
 
         # sort root entities based on eid
@@ -61,24 +63,25 @@ class ESBMGraph(ESBMBaseGraph):
         logger.debug(f"Root Entities: {len(self._root_entities)} initialized.")
 
         logger.debug("Initializing triples...")
-        for u, v, data in self._G.edges(data=True):
-            predicate_id = data['predicate']
-            if predicate_id not in self._predicates:
-                self._predicates[predicate_id] = ESBMPredicate(
-                    predicate_id=predicate_id,
-                    str_formatter=self._predicate_formatter
+        with instrumentation.span('initialize.triples', graph=type(self).__name__):
+            for u, v, data in self._G.edges(data=True):
+                predicate_id = data['predicate']
+                if predicate_id not in self._predicates:
+                    self._predicates[predicate_id] = ESBMPredicate(
+                        predicate_id=predicate_id,
+                        str_formatter=self._predicate_formatter
+                    )
+
+                triple = ESBMTriple(
+                    subject_entity=self._entities[u],
+                    predicate=self._predicates[predicate_id],
+                    object_entity=self._entities[v],
+                    str_formatter=self._triple_formatter
                 )
+                self._triples[(u, predicate_id, v)] = triple
 
-            triple = ESBMTriple(
-                subject_entity=self._entities[u],
-                predicate=self._predicates[predicate_id],
-                object_entity=self._entities[v],
-                str_formatter=self._triple_formatter
-            )
-            self._triples[(u, predicate_id, v)] = triple
-
-            if 'summary_for' in data:
-                self._extract_gold_summaries(data, triple)
+                if 'summary_for' in data:
+                    self._extract_gold_summaries(data, triple)
 
     def root_entities(self) -> List[ESBMRootEntity]:
         return super().root_entities()
@@ -111,15 +114,19 @@ class ESBMGraph(ESBMBaseGraph):
     def neighbors(self, entity: Union[Entity, str]) -> List[ESBMTriple]:
         return super().neighbors(entity)
 
-    def all_gold_top_k(self, k: int) -> Dict[str, List[List[Tuple[str, str, str]]]]:
+    def iter_gold_top_k(self, k: int) -> Iterator[Tuple[str, List[List[Tuple[str, str, str]]]]]:
         if k not in [5, 10]:
             raise ValueError("k should be 5 or 10")
         gold_top_k = self._gold_top_5 if k == 5 else self._gold_top_10
-        result = defaultdict(lambda: [list() for _ in range(6)])
         for root_entity_id, top_list in gold_top_k.items():
-            for i, items in enumerate(top_list):
-                result[root_entity_id][i] = [
-                    (t.subject_entity.identifier, t.predicate.predicate_id, t.object_entity.identifier) for t in items]
+            yield root_entity_id, [
+                [(t.subject_entity.identifier, t.predicate.predicate_id, t.object_entity.identifier) for t in items]
+                for items in top_list
+            ]
+
+    def all_gold_top_k(self, k: int) -> Dict[str, List[List[Tuple[str, str, str]]]]:
+        result = defaultdict(lambda: [list() for _ in range(6)])
+        result.update(self.iter_gold_top_k(k))
         return result
 
     def gold_top_5(self, root_entity: Union[ESBMRootEntity, str], annotator_index: int) -> List[ESBMTriple]:
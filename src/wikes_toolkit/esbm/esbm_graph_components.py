@@ -4,14 +4,16 @@ import logging
 import os
 from abc import abstractmethod
 from dataclasses import dataclass, field
-from typing import Optional, Union, Tuple, Callable, List, Dict
+from typing import Optional, Union, Tuple, Callable, List, Dict, Iterator
 
 import networkx as nx
+import numpy as np
 import pandas as pd
 
+from wikes_toolkit.base import instrumentation, metrics
 from wikes_toolkit.base.graph_components import Entity, Predicate, Triple, BaseESGraph, RootEntity
 from wikes_toolkit.base.versions import DatasetName
-from wikes_toolkit.esbm.esbm_eval import ESBMSummaryEvaluator
+from wikes_toolkit.esbm.esbm_gold import GoldTensor
 from wikes_toolkit.esbm.esbm_nt_file_reader import extract_triples, convert_line_to_triple
 
 logger = logging.getLogger(__name__)
@@ -102,6 +104,7 @@ class ESBMTriple(Triple):
 
 class ESBMBaseGraph(BaseESGraph):
     _dataset_name: DatasetName
+    _gold_tensors: Optional[Dict[Tuple[int, bool], GoldTensor]] = None
 
     def __init__(self, G: nx.MultiDiGraph, dataset: DatasetName,
                  root_entity_formatter: Optional[callable] = None,
@@ -118,6 +121,9 @@ class ESBMBaseGraph(BaseESGraph):
     def all_gold_top_k(self, k: int) -> Dict[str, List[List[Tuple[str, str, str]]]]:
         pass
 
+    def iter_gold_top_k(self, k: int) -> Iterator[Tuple[str, List[List[Tuple[str, str, str]]]]]:
+        yield from self.all_gold_top_k(k).items()
+
     @abstractmethod
     def gold_top_5(self, root_entity: Union[ESBMRootEntity, str, pd.Series], annotator_index: int) -> Union[
         List[ESBMTriple], pd.DataFrame
@@ -157,29 +163,113 @@ class ESBMBaseGraph(BaseESGraph):
                     return target.iloc[0]
         return super().fetch_root_entity(entity)
 
-    def f1_score(self, k: int = None, no_rel: bool = False):
-        if k is None:
-            raise ValueError("top_k should be provided for ESBM")
+    def _ground_truth_arrays(self) -> Dict[str, Dict[str, np.ndarray]]:
+        tables = {}
+        for k in (5, 10):
+            roots, annotators, ranks, triples = [], [], [], []
+            for root_entity, gold_summaries in self.iter_gold_top_k(k):
+                for annotator, gold_summary in enumerate(gold_summaries):
+                    roots.extend([root_entity] * len(gold_summary))
+                    annotators.extend([annotator] * len(gold_summary))
+                    ranks.extend(range(len(gold_summary)))
+                    triples.extend(gold_summary)
+            subjects, predicates, objects = zip(*triples) if triples else ((), (), ())
+            tables[f'gold_top_{k}'] = self._encode_ground_truth_table(
+                roots, subjects, predicates, objects, annotator=annotators, rank=ranks
+            )
+        return tables
+
+    def ground_truth_labels(self, k: int = 5) -> np.ndarray:
         if k not in [5, 10]:
             raise ValueError("k should be 5 or 10")
-        return ESBMSummaryEvaluator(
-            super().root_entity_ids(),
-            self.all_gold_top_k(k),
-            self._predicted_summaries,
-            k
-        ).evaluate_f1(no_rel)
+        return self._ground_truth_labels([
+            gold_summary for gold_summaries in self.all_gold_top_k(k).values() for gold_summary in gold_summaries
+        ])
 
-    def map_score(self, k: int = None, no_rel: bool = False):
+    @staticmethod
+    def _check_k(k: int = None):
         if k is None:
             raise ValueError("top_k should be provided for ESBM")
         if k not in [5, 10]:
             raise ValueError("k should be 5 or 10")
-        return ESBMSummaryEvaluator(
-            super().root_entity_ids(),
-            self.all_gold_top_k(k),
-            self._predicted_summaries,
-            k
-        ).evaluate_map(no_rel)
+
+    def gold_tensor(self, k: int = 5, no_rel: bool = False) -> GoldTensor:
+        """Top-k gold summaries of all root entities and annotators as one tensor of triple ids, or of subject and
+        object codes with `no_rel`. Built once per `k` and `no_rel`."""
+        self._check_k(k)
+        if self._gold_tensors is None:
+            self._gold_tensors = {}
+        if (k, no_rel) not in self._gold_tensors:
+            gold_top_k = self.all_gold_top_k(k)
+            root_entity_ids = self.root_entity_ids()
+            gold = [gold_top_k.get(root_entity, []) for root_entity in root_entity_ids]
+            codes = iter(self._summary_codes([summary for summaries in gold for summary in summaries], no_rel))
+            self._gold_tensors[(k, no_rel)] = GoldTensor.build(
+                [[next(codes) for _ in summaries] for summaries in gold], k
+            )
+        return self._gold_tensors[(k, no_rel)]
+
+    def _hit_matrix(self, k: int, no_rel: bool, positions: np.ndarray) -> metrics.HitMatrix:
+        """Roots x annotators x k hits, every metric is averaged over the annotators of a root."""
+        gold = self.gold_tensor(k, no_rel).take(positions)
+        predictions = self._summary_codes(
+            [self._predicted_summaries.get(root_entity, []) for root_entity in self._root_entity_index()[positions]],
+            no_rel
+        )
+        return gold.hit_matrix(metrics.pad_rows(predictions, k))
+
+    def f1_score(self, k: int = None, no_rel: bool = False):
+        with instrumentation.span('evaluate.f1', dataset='esbm', top_k=k, no_rel=no_rel):
+            return float(self.entity_scores(metrics.F1, k, no_rel).mean())
+
+    def map_score(self, k: int = None, no_rel: bool = False):
+        with instrumentation.span('evaluate.map', dataset='esbm', top_k=k, no_rel=no_rel):
+            return float(self.entity_scores(metrics.MAP, k, no_rel).mean())
+
+    def entity_scores(self, metric: str = 'f1', k: int = None, no_rel: bool = False) -> np.ndarray:
+        if metric not in (metrics.F1, metrics.MAP):
+            raise ValueError(f"Unknown metric: {metric}, use 'f1' or 'map'.")
+        return self.entity_metrics([metric], k, no_rel)[metric]
+
+    def annotator_agreement(self, k: int = 5) -> Dict[str, float]:
+        """Inter-annotator agreement of the top-k gold summaries, averaged over root entities.
+
+        `jaccard` is the mean pairwise Jaccard similarity of the annotators' summaries, `fleiss_kappa` treats every
+        candidate triple of a root as an item each annotator selects or not.
+        """
+        return self._annotator_agreement(self.gold_tensor(k), self.candidate_index().counts())
+
+    @staticmethod
+    def _annotator_agreement(gold: GoldTensor, candidates: np.ndarray) -> Dict[str, float]:
+        kappa = gold.fleiss_kappa(candidates)
+        return {
+            'jaccard': float(gold.pairwise_jaccard().mean()) if gold.annotators.shape[0] else 0.0,
+            'fleiss_kappa': float(np.nanmean(kappa)) if np.isfinite(kappa).any() else float('nan'),
+        }
+
+    def _rebuild_networkx(self) -> nx.MultiDiGraph:
+        """Rebuilds the graph in the released layout from the toolkit's own tables.
+
+        Node and edge attributes the toolkit does not load, such as the labels of root entities, are not restored.
+        """
+        G = nx.MultiDiGraph()
+        index = self.graph_index()
+        G.add_nodes_from(index.entity_ids.tolist())
+        for identifier, eid, category in self._table_rows(self._root_entities, ['eid', 'category'],
+                                                           ['eid', 'category']):
+            data = {'is_root': True, 'eid': None if eid is None else int(eid), 'category': category}
+            G.add_node(identifier, **{name: value for name, value in data.items() if value is not None})
+
+        gold = {}
+        for k in (5, 10):
+            for root_entity, gold_summaries in self.iter_gold_top_k(k):
+                for annotator, gold_summary in enumerate(gold_summaries):
+                    for order, triple in enumerate(gold_summary):
+                        data = gold.setdefault(tuple(triple), {'summary_for': root_entity})
+                        data[f"in_gold_top{k}_{annotator}"] = order
+        for subject, predicate, object_ in self.triple_ids_to_keys(np.arange(index.total_triples)):
+            G.add_edge(subject, object_, predicate=predicate, **gold.get((subject, predicate, object_), {}))
+        return G
 
     def mark_nt_file_as_summary(self, root_entity: Union[ESBMRootEntity, str, int], nt_file_path):
         if not os.path.exists(nt_file_path):
@@ -1,12 +1,12 @@
 from typing import List, Tuple
 import re
 
-from rdflib.term import URIRef, Literal, BNode
-
 nt_triple_pattern = re.compile(r'<?(.*?)>?\s+<?(.*?)>?\s+<?(.*?)>?\s+\.\s*')
 
 
 def _get_value(entity):
+    from rdflib.term import URIRef, Literal
+
     if isinstance(entity, URIRef):
         return str(entity)
     elif isinstance(entity, Literal):
@@ -21,6 +21,8 @@ def _get_value(entity):
 
 
 def _parse_nt_line(line):
+    from rdflib.term import URIRef, Literal, BNode
+
     match = nt_triple_pattern.match(line)
     if match:
         subject = match.group(1)
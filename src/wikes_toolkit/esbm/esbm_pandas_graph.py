@@ -5,6 +5,7 @@ from typing import Union, Tuple, Dict, List
 import networkx as nx
 import pandas as pd
 
+from wikes_toolkit.base import instrumentation
 from wikes_toolkit.base.versions import DatasetName
 from wikes_toolkit.esbm.esbm_graph_components import ESBMBaseGraph, ESBMRootEntity, ESBMTriple
 
@@ -38,70 +39,73 @@ class PandasESBMGraph(ESBMBaseGraph):
     def _initialize(self):
         logger.debug("Initializing PandasESBMGraph...")
 
-        nodes_data = [
-            {
-                'identifier': node,
-                'eid': data.get('eid'),
-                'label': data.get('label'),
-                'category': data.get('category')
-            }
-            for node, data in self._G.nodes(data=True) if data.get('is_root', False)
-        ]
-        self._root_entities = pd.DataFrame(nodes_data, columns=[
-            'identifier', 'eid', 'label', 'category'
-        ]).set_index('identifier')
-        del nodes_data
-        self._root_entities.sort_values('eid', inplace=True)
-        logger.debug(f"Root Entities: {self._root_entities.shape[0]} initialized.")
-
-        nodes_data = [
-            {
-                'identifier': node,
-            }
-            for node, data in self._G.nodes(data=True)
-        ]
-        self._entities = pd.DataFrame(nodes_data, columns=['identifier']).set_index('identifier')
-        logger.debug(f"Entities: {self._entities.shape[0]} initialized.")
-        del nodes_data
+        with instrumentation.span('initialize.entities', graph=type(self).__name__):
+            nodes_data = [
+                {
+                    'identifier': node,
+                    'eid': data.get('eid'),
+                    'label': data.get('label'),
+                    'category': data.get('category')
+                }
+                for node, data in self._G.nodes(data=True) if data.get('is_root', False)
+            ]
+            self._root_entities = pd.DataFrame(nodes_data, columns=[
+                'identifier', 'eid', 'label', 'category'
+            ]).set_index('identifier')
+            del nodes_data
+            self._root_entities.sort_values('eid', inplace=True)
+            logger.debug(f"Root Entities: {self._root_entities.shape[0]} initialized.")
+
+            nodes_data = [
+                {
+                    'identifier': node,
+                }
+                for node, data in self._G.nodes(data=True)
+            ]
+            self._entities = pd.DataFrame(nodes_data, columns=['identifier']).set_index('identifier')
+            logger.debug(f"Entities: {self._entities.shape[0]} initialized.")
+            del nodes_data
 
         logger.debug("Initializing triples...")
-        edges_data = []
-        predicates_data = set()
-
-        gold5_data: Dict[Tuple[str, int], List[Tuple[str, str, str, str]]] = defaultdict(list)
-        gold10_data: Dict[Tuple[str, int], List[Tuple[str, str, str, str]]] = defaultdict(list)
-
-        for u, v, data in self._G.edges(data=True):
-            predicate_id = data['predicate']
-            edges_data.append({'subject': u, 'predicate': predicate_id, 'object': v})
-
-            if predicate_id not in predicates_data:
-                predicates_data.add(predicate_id)
-
-            if 'summary_for' in data:
-                for i in range(6):
-                    if f"in_gold_top5_{i}" in data:
-                        order = data[f"in_gold_top5_{i}"]
-                        gold5_data[(data['summary_for'], i)].append((order, u, predicate_id, v))
-                    if f"in_gold_top10_{i}" in data:
-                        order = data[f"in_gold_top10_{i}"]
-                        gold10_data[(data['summary_for'], i)].append((order, u, predicate_id, v))
-
-        self._predicates = pd.DataFrame(
-            list(predicates_data),
-            columns=['identifier']
-        ).set_index('identifier')
-        del predicates_data
-
-        self._triples = pd.DataFrame(edges_data, columns=['subject', 'predicate', 'object'])
-        del edges_data
-        logger.debug(f"Triples: {self._triples.shape[0]} initialized.")
-
-        self._gold_top_5 = PandasESBMGraph._build_pandas_gold_top_k(gold5_data)
-        del gold5_data
-
-        self._gold_top_10 = PandasESBMGraph._build_pandas_gold_top_k(gold10_data)
-        del gold10_data
+        with instrumentation.span('initialize.triples', graph=type(self).__name__):
+            edges_data = []
+            predicates_data = set()
+
+            gold5_data: Dict[Tuple[str, int], List[Tuple[str, str, str, str]]] = defaultdict(list)
+            gold10_data: Dict[Tuple[str, int], List[Tuple[str, str, str, str]]] = defaultdict(list)
+
+            for u, v, data in self._G.edges(data=True):
+                predicate_id = data['predicate']
+                edges_data.append({'subject': u, 'predicate': predicate_id, 'object': v})
+
+                if predicate_id not in predicates_data:
+                    predicates_data.add(predicate_id)
+
+                if 'summary_for' in data:
+                    for i in range(6):
+                        if f"in_gold_top5_{i}" in data:
+                            order = data[f"in_gold_top5_{i}"]
+                            gold5_data[(data['summary_for'], i)].append((order, u, predicate_id, v))
+                        if f"in_gold_top10_{i}" in data:
+                            order = data[f"in_gold_top10_{i}"]
+                            gold10_data[(data['summary_for'], i)].append((order, u, predicate_id, v))
+
+            self._predicates = pd.DataFrame(
+                list(predicates_data),
+                columns=['identifier']
+            ).set_index('identifier')
+            del predicates_data
+
+            self._triples = pd.DataFrame(edges_data, columns=['subject', 'predicate', 'object'])
+            del edges_data
+            logger.debug(f"Triples: {self._triples.shape[0]} initialized.")
+
+            with instrumentation.span('initialize.ground_truths', graph=type(self).__name__):
+                self._gold_top_5 = PandasESBMGraph._build_pandas_gold_top_k(gold5_data)
+                del gold5_data
+
+                self._gold_top_10 = PandasESBMGraph._build_pandas_gold_top_k(gold10_data)
+                del gold10_data
 
     def root_entities(self) -> pd.DataFrame:
         return super().root_entities()
@@ -0,0 +1,125 @@
+import logging
+from typing import Union, Tuple, Dict, List
+
+import networkx as nx
+import polars as pl
+
+from wikes_toolkit.base import instrumentation
+from wikes_toolkit.base.polars_graph import PolarsGraphMixin, Row
+from wikes_toolkit.base.versions import DatasetName
+from wikes_toolkit.esbm.esbm_graph_components import ESBMBaseGraph, ESBMRootEntity
+from wikes_toolkit.esbm.esbm_nt_file_reader import convert_line_to_triple
+
+logger = logging.getLogger(__name__)
+
+GOLD_SCHEMA = {
+    'root_entity': pl.String, 'annotator_index': pl.Int32, 'order': pl.Int32,
+    'subject': pl.String, 'predicate': pl.String, 'object': pl.String
+}
+
+
+class PolarsESBMGraph(PolarsGraphMixin, ESBMBaseGraph):
+    def __init__(self, G: nx.MultiDiGraph, dataset: DatasetName):
+        super().__init__(G, dataset)
+
+    def _initialize(self):
+        logger.debug("Initializing PolarsESBMGraph...")
+
+        with instrumentation.span('initialize.entities', graph=type(self).__name__):
+            identifiers = []
+            root_entities = {'identifier': [], 'eid': [], 'label': [], 'category': []}
+            for node, data in self._G.nodes(data=True):
+                identifiers.append(node)
+                if data.get('is_root', False):
+                    root_entities['identifier'].append(node)
+                    root_entities['eid'].append(data.get('eid'))
+                    root_entities['label'].append(data.get('label'))
+                    root_entities['category'].append(data.get('category'))
+            self._root_entities = pl.DataFrame(root_entities, schema={
+                'identifier': pl.String, 'eid': pl.Int64, 'label': pl.String, 'category': pl.String
+            }).sort('eid')
+            logger.debug(f"Root Entities: {self._root_entities.height} initialized.")
+            self._entities = pl.DataFrame({'identifier': identifiers}, schema={'identifier': pl.String})
+            logger.debug(f"Entities: {self._entities.height} initialized.")
+            del identifiers, root_entities
+
+        logger.debug("Initializing triples...")
+        with instrumentation.span('initialize.triples', graph=type(self).__name__):
+            subjects, predicates, objects = [], [], []
+            predicates_data = dict()
+            gold5_data = {column: [] for column in GOLD_SCHEMA}
+            gold10_data = {column: [] for column in GOLD_SCHEMA}
+
+            for u, v, data in self._G.edges(data=True):
+                predicate_id = data['predicate']
+                subjects.append(u)
+                predicates.append(predicate_id)
+                objects.append(v)
+                predicates_data[predicate_id] = None
+
+                if 'summary_for' in data:
+                    for i in range(6):
+                        for gold_data, key in ((gold5_data, f"in_gold_top5_{i}"), (gold10_data, f"in_gold_top10_{i}")):
+                            if key in data:
+                                gold_data['root_entity'].append(data['summary_for'])
+                                gold_data['annotator_index'].append(i)
+                                gold_data['order'].append(data[key])
+                                gold_data['subject'].append(u)
+                                gold_data['predicate'].append(predicate_id)
+                                gold_data['object'].append(v)
+
+            self._predicates = pl.DataFrame({'identifier': list(predicates_data)}, schema={'identifier': pl.String})
+            del predicates_data
+
+            self._triples = pl.DataFrame(
+                {'subject': subjects, 'predicate': predicates, 'object': objects},
+                schema={'subject': pl.String, 'predicate': pl.String, 'object': pl.String}
+            )
+            del subjects, predicates, objects
+            logger.debug(f"Triples: {self._triples.height} initialized.")
+
+            with instrumentation.span('initialize.ground_truths', graph=type(self).__name__):
+                self._gold_top_5 = pl.DataFrame(gold5_data, schema=GOLD_SCHEMA).sort(
+                    'root_entity', 'annotator_index', 'order')
+                self._gold_top_10 = pl.DataFrame(gold10_data, schema=GOLD_SCHEMA).sort(
+                    'root_entity', 'annotator_index', 'order')
+                del gold5_data, gold10_data
+
+    def fetch_root_entity(self, entity: Union[ESBMRootEntity, str, int, Row]) -> Row:
+        if isinstance(entity, int):
+            return self._fetch_row(self._root_entities, pl.col('eid') == entity,
+                                   f"Entity with eid: {entity} not found in root entities.")
+        return super().fetch_root_entity(entity)
+
+    def fetch_triple(self, triple: Union[str, Tuple[str, str, str], Row]) -> Row:
+        if isinstance(triple, str):
+            triple = convert_line_to_triple(triple)
+        return super().fetch_triple(triple)
+
+    def all_gold_top_k(self, k: int) -> Dict[str, List[List[Tuple[str, str, str]]]]:
+        if k not in [5, 10]:
+            raise ValueError("k should be 5 or 10")
+        gold_top_k = self._gold_top_5 if k == 5 else self._gold_top_10
+        grouped = gold_top_k.lazy().group_by('root_entity', 'annotator_index').agg(
+            pl.col('subject', 'predicate', 'object')
+        ).collect()
+        result = {root_entity: [list() for _ in range(6)] for root_entity in self.root_entity_ids()}
+        for root_entity, annotator_index, subjects, predicates, objects in grouped.iter_rows():
+            if root_entity in result:
+                result[root_entity][annotator_index] = list(zip(subjects, predicates, objects))
+        return result
+
+    def _gold_top_k(self, gold_top_k: pl.DataFrame, root_entity: Union[ESBMRootEntity, str, int, Row],
+                    annotator_index: int) -> pl.DataFrame:
+        if annotator_index < 0 or annotator_index > 5:
+            raise ValueError("Annotator index should be between 0 and 5.")
+        root_entity = self.fetch_root_entity_id(root_entity)
+        return gold_top_k.lazy().filter(
+            (pl.col('root_entity') == root_entity) & (pl.col('annotator_index') == annotator_index)
+        ).drop('root_entity', 'annotator_index').collect()
+
+    def gold_top_5(self, root_entity: Union[ESBMRootEntity, str, int, Row], annotator_index: int) -> pl.DataFrame:
+        return self._gold_top_k(self._gold_top_5, root_entity, annotator_index)
+
+    def gold_top_10(self, root_entity: Union[ESBMRootEntity, str, int, Row], annotator_index: int) -> pl.DataFrame:
+        return self._gold_top_k(self._gold_top_10, root_entity, annotator_index)
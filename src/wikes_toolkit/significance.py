@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+from typing import Optional, Sequence, List, Tuple, Union
+
+import numpy as np
+
+from wikes_toolkit.base import instrumentation
+
+DEFAULT_RESAMPLES = 10_000
+BLOCK_SIZE = 500
+TIE_TOLERANCE = 1e-12
+
+
+@dataclass
+class ConfidenceInterval:
+    estimate: float
+    low: float
+    high: float
+    confidence: float
+    resamples: int
+
+
+@dataclass
+class Comparison:
+    """Paired comparison of system `a` against system `b` on the same root entities."""
+    difference: float
+    low: float
+    high: float
+    p_value: float
+    confidence: float
+    resamples: int
+
+
+def _blocks(resamples: int, seed: Union[int, np.random.SeedSequence, None]) -> List[Tuple[int, np.random.SeedSequence]]:
+    """Splits `resamples` into fixed size blocks, each with its own seed.
+
+    Blocks do not depend on the number of processes, so a seed gives the same result with or without a pool.
+    """
+    if resamples < 1:
+        raise ValueError(f"resamples should be a positive integer, got {resamples}.")
+    sizes = [BLOCK_SIZE] * (resamples // BLOCK_SIZE)
+    if resamples % BLOCK_SIZE:
+        sizes.append(resamples % BLOCK_SIZE)
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return list(zip(sizes, seed.spawn(len(sizes))))
+
+
+def _bootstrap_block(scores: np.ndarray, size: int, seed: np.random.SeedSequence) -> np.ndarray:
+    """Means of `size` bootstrap resamples of the columns of `scores`, one row per system."""
+    rng = np.random.default_rng(seed)
+    samples = rng.integers(0, scores.shape[1], size=(size, scores.shape[1]))
+    return scores[:, samples].mean(axis=2)
+
+
+def _randomization_block(differences: np.ndarray, size: int, seed: np.random.SeedSequence) -> np.ndarray:
+    """Mean differences of `size` random sign flips of the paired `differences`."""
+    rng = np.random.default_rng(seed)
+    signs = rng.integers(0, 2, size=(size, differences.shape[0]), dtype=np.int8) * 2 - 1
+    return (signs * differences).mean(axis=1)
+
+
+def _run_blocks(function, data: np.ndarray, resamples: int, seed: Union[int, np.random.SeedSequence, None],
+                processes: Optional[int]) -> np.ndarray:
+    sizes, seeds = zip(*_blocks(resamples, seed))
+    if processes is None or processes <= 1 or len(sizes) == 1:
+        results = list(map(function, repeat(data), sizes, seeds))
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = list(executor.map(function, repeat(data), sizes, seeds))
+    return np.concatenate(results, axis=-1)
+
+
+def _scores(scores: Sequence[float]) -> np.ndarray:
+    scores = np.asarray(scores, dtype=np.float64)
+    if scores.ndim != 1 or scores.shape[0] == 0:
+        raise ValueError("Scores should be a non-empty sequence with one score per root entity.")
+    return scores
+
+
+def _paired_scores(scores_a: Sequence[float], scores_b: Sequence[float]) -> np.ndarray:
+    scores_a, scores_b = _scores(scores_a), _scores(scores_b)
+    if scores_a.shape != scores_b.shape:
+        raise ValueError(f"Paired scores should cover the same root entities, got {scores_a.shape[0]} and "
+                         f"{scores_b.shape[0]} scores.")
+    return np.stack([scores_a, scores_b])
+
+
+def _interval(samples: np.ndarray, confidence: float) -> Tuple[float, float]:
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence should be between 0 and 1, got {confidence}.")
+    low, high = np.quantile(samples, [(1 - confidence) / 2, (1 + confidence) / 2])
+    return float(low), float(high)
+
+
+def bootstrap(scores: Sequence[float], resamples: int = DEFAULT_RESAMPLES, confidence: float = 0.95,
+              seed: Optional[int] = 0, processes: Optional[int] = None) -> ConfidenceInterval:
+    """Percentile bootstrap confidence interval of the mean of per root entity scores, e.g. `G.entity_scores()`."""
+    scores = _scores(scores)
+    with instrumentation.span('significance.bootstrap', resamples=resamples, processes=processes):
+        means = _run_blocks(_bootstrap_block, scores[np.newaxis], resamples, seed, processes)[0]
+    return ConfidenceInterval(float(scores.mean()), *_interval(means, confidence), confidence, resamples)
+
+
+def paired_bootstrap(scores_a: Sequence[float], scores_b: Sequence[float], resamples: int = DEFAULT_RESAMPLES,
+                     confidence: float = 0.95, seed: Optional[int] = 0,
+                     processes: Optional[int] = None) -> Comparison:
+    """Paired bootstrap test of the mean difference `a - b`.
+
+    Root entities are resampled jointly for both systems. The two-sided p-value is the share of resampled
+    differences, shifted to a zero mean, at least as far from zero as the observed one.
+    """
+    scores = _paired_scores(scores_a, scores_b)
+    with instrumentation.span('significance.paired_bootstrap', resamples=resamples, processes=processes):
+        means = _run_blocks(_bootstrap_block, scores, resamples, seed, processes)
+    differences = means[0] - means[1]
+    observed = float(scores[0].mean() - scores[1].mean())
+    extreme = np.count_nonzero(np.abs(differences - observed) >= abs(observed) - TIE_TOLERANCE)
+    return Comparison(observed, *_interval(differences, confidence), (extreme + 1) / (resamples + 1),
+                      confidence, resamples)
+
+
+def randomization_test(scores_a: Sequence[float], scores_b: Sequence[float],
+                       resamples: int = DEFAULT_RESAMPLES, confidence: float = 0.95, seed: Optional[int] = 0,
+                       processes: Optional[int] = None) -> Comparison:
+    """Approximate paired randomisation test of the mean difference `a - b`, swapping the systems' scores of every
+    root entity at random. The interval is the paired bootstrap one; the sign flips and the resamples are drawn from
+    two independent streams spawned from `seed`.
+    """
+    scores = _paired_scores(scores_a, scores_b)
+    differences = scores[0] - scores[1]
+    observed = float(differences.mean())
+    permutation_seed, bootstrap_seed = np.random.SeedSequence(seed).spawn(2)
+    with instrumentation.span('significance.randomization_test', resamples=resamples, processes=processes):
+        permuted = _run_blocks(_randomization_block, differences, resamples, permutation_seed, processes)
+        resampled = _run_blocks(_bootstrap_block, differences[np.newaxis], resamples, bootstrap_seed, processes)[0]
+    extreme = np.count_nonzero(np.abs(permuted) >= abs(observed) - TIE_TOLERANCE)
+    return Comparison(observed, *_interval(resampled, confidence), (extreme + 1) / (resamples + 1),
+                      confidence, resamples)
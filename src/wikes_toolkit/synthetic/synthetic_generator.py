@@ -0,0 +1,376 @@
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Union, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+from tqdm import tqdm
+
+from wikes_toolkit.synthetic.synthetic_pickle_writer import PickleStreamWriter
+from wikes_toolkit.synthetic.synthetic_versions import SyntheticVersions, SyntheticDatasetName, WIKES_FAMILY, \
+    ESBM_FAMILY
+
+logger = logging.getLogger(__name__)
+
+ESBM_ANNOTATORS = 6
+
+_CATEGORIES = ['actor', 'writer', 'painter', 'scientist', 'politician', 'athlete', 'musician', 'director']
+_STATE_KEYS = ('graph', '_node', '_adj', '_succ', '_pred', '__networkx_cache__')
+
+# Memo layout: 0 holds the shared `_adj`/`_succ` dict, the attribute names and predicate strings come next,
+# followed by one slot per entity identifier and one slot per (subject, object) key-dict of the MultiDiGraph.
+_ADJ_MEMO = 0
+_ATTRIBUTE_MEMO_BASE = 1
+_PREDICATE_MEMO_BASE = 1024
+
+
+class SyntheticGraphGenerator:
+    """Generates WikES or ESBM shaped `nx.MultiDiGraph` pickles without materializing the graph.
+
+    Out-degrees follow a multinomial over Pareto weights (root entities are boosted), objects and predicates are
+    drawn from Zipf-like distributions. Repeated draws of a triple are replaced by new draws until every subject has
+    its out-degree, so exactly `total_triples` distinct triples are written. Edges are produced in subject blocks and
+    written straight into the pickle stream; only per-entity arrays and one spill file of (object, subject) pairs are
+    kept, the latter on disk.
+    """
+
+    def __init__(self,
+                 family: str = WIKES_FAMILY,
+                 total_entities: int = 100_000,
+                 total_triples: int = 1_000_000,
+                 total_root_entities: int = 1_000,
+                 total_predicates: int = 500,
+                 summary_size: int = 10,
+                 min_root_degree: int = 20,
+                 degree_exponent: float = 1.2,
+                 seed: Optional[int] = None,
+                 block_size: int = 1 << 16):
+        if family not in (WIKES_FAMILY, ESBM_FAMILY):
+            raise ValueError(f"Family should be either '{WIKES_FAMILY}' or '{ESBM_FAMILY}'.")
+        if total_root_entities > total_entities:
+            raise ValueError("Number of root entities cannot exceed the number of entities.")
+        if total_entities < 2 or total_predicates < 1:
+            raise ValueError("Synthetic graphs need at least two entities and one predicate.")
+        if family == ESBM_FAMILY:
+            summary_size = 10
+        if total_triples < total_root_entities * min_root_degree:
+            raise ValueError("Number of triples is too small for the requested root entities degree.")
+        if total_triples > total_entities * (total_entities - 1) * total_predicates:
+            raise ValueError("Number of triples exceeds the distinct triples the entities and predicates allow.")
+        self.family = family
+        self.total_entities = total_entities
+        self.total_triples = total_triples
+        self.total_root_entities = total_root_entities
+        self.total_predicates = total_predicates
+        self.summary_size = summary_size
+        self.min_root_degree = max(min_root_degree, summary_size)
+        self.degree_exponent = degree_exponent
+        self.block_size = block_size
+        self._rng = np.random.default_rng(seed)
+        self._attribute_memo = {}
+        self._written_predicates = np.zeros((total_predicates, 3), dtype=bool)
+        self._node_memo_base = _PREDICATE_MEMO_BASE + 3 * total_predicates
+        self._pair_memo_base = self._node_memo_base + total_entities
+
+    def entity_id(self, index: int) -> str:
+        if self.family == WIKES_FAMILY:
+            return f"Q{index + 1}"
+        return f"http://example.org/resource/Entity_{index + 1}"
+
+    def predicate_id(self, index: int) -> str:
+        if self.family == WIKES_FAMILY:
+            return f"P{index + 1}"
+        return f"http://example.org/ontology/predicate_{index + 1}"
+
+    def _pareto_cdf(self, size: int) -> np.ndarray:
+        weights = self._rng.pareto(self.degree_exponent, size) + 1
+        cdf = np.cumsum(weights)
+        return cdf / cdf[-1]
+
+    def _out_degrees(self) -> np.ndarray:
+        weights = self._rng.pareto(self.degree_exponent, self.total_entities) + 1
+        weights[:self.total_root_entities] *= 10
+        spread = self.total_triples - self.total_root_entities * self.min_root_degree
+        degrees = self._rng.multinomial(spread, weights / weights.sum())
+        degrees[:self.total_root_entities] += self.min_root_degree
+        # A subject has at most one triple per other entity and predicate, spread what exceeds that over the others.
+        capacity = (self.total_entities - 1) * self.total_predicates
+        while excess := int(np.maximum(degrees - capacity, 0).sum()):
+            degrees = np.minimum(degrees, capacity)
+            room = capacity - degrees
+            degrees += self._rng.multinomial(excess, room / room.sum())
+        return degrees
+
+    def _attribute(self, writer: PickleStreamWriter, name: str):
+        if name in self._attribute_memo:
+            writer.get(self._attribute_memo[name])
+        else:
+            memo = _ATTRIBUTE_MEMO_BASE + len(self._attribute_memo)
+            self._attribute_memo[name] = memo
+            writer.value(name, memo)
+
+    def _node_attributes(self, index: int):
+        is_root = index < self.total_root_entities
+        if self.family == WIKES_FAMILY:
+            attributes = {
+                'wikidata_label': f"Entity {index + 1}",
+                'wikidata_desc': f"Synthetic entity number {index + 1}",
+            }
+            if is_root:
+                attributes.update({
+                    'is_root': True,
+                    'category': _CATEGORIES[index % len(_CATEGORIES)],
+                    'wikipedia_id': index + 1,
+                    'wikipedia_title': f"Entity_{index + 1}",
+                })
+            return attributes
+        if is_root:
+            return {
+                'is_root': True,
+                'eid': index + 1,
+                'label': f"Entity {index + 1}",
+                'category': _CATEGORIES[index % len(_CATEGORIES)],
+            }
+        return {}
+
+    def _write_nodes(self, writer: PickleStreamWriter):
+        writer.empty_dict()
+        writer.begin_items()
+        for index in range(self.total_entities):
+            writer.value(self.entity_id(index), self._node_memo_base + index)
+            writer.empty_dict()
+            attributes = self._node_attributes(index)
+            if attributes:
+                writer.begin_items()
+                for name, value in attributes.items():
+                    self._attribute(writer, name)
+                    writer.value(value)
+                    writer.item_done()
+                writer.end_items()
+            writer.item_done()
+        writer.end_items()
+
+    def _predicate(self, writer: PickleStreamWriter, predicate: int, field: int, value: str):
+        memo = _PREDICATE_MEMO_BASE + 3 * predicate + field
+        if self._written_predicates[predicate, field]:
+            writer.get(memo)
+        else:
+            self._written_predicates[predicate, field] = True
+            writer.value(value, memo)
+
+    def _draw_objects(self, subjects: np.ndarray, object_cdf: np.ndarray) -> np.ndarray:
+        objects = np.searchsorted(object_cdf, self._rng.random(subjects.shape[0])).astype(np.int64)
+        objects = np.minimum(objects, self.total_entities - 1)
+        loops = objects == subjects
+        objects[loops] = (objects[loops] + 1) % self.total_entities
+        return objects
+
+    def _draw_predicates(self, size: int, predicate_cdf: np.ndarray) -> np.ndarray:
+        predicates = np.searchsorted(predicate_cdf, self._rng.random(size)).astype(np.int64)
+        return np.minimum(predicates, self.total_predicates - 1)
+
+    def _generate_block(self, start: int, end: int, degrees: np.ndarray, object_cdf: np.ndarray,
+                        predicate_cdf: np.ndarray) -> Tuple[np.ndarray, ...]:
+        counts = degrees[start:end]
+        subjects = np.empty(0, dtype=np.int64)
+        objects, predicates = subjects, subjects
+        missing = counts
+        while missing.any():
+            drawn = np.repeat(np.arange(start, end, dtype=np.int64), missing)
+            subjects = np.concatenate([subjects, drawn])
+            objects = np.concatenate([objects, self._draw_objects(drawn, object_cdf)])
+            predicates = np.concatenate([predicates, self._draw_predicates(drawn.shape[0], predicate_cdf)])
+
+            order = np.lexsort((predicates, objects, subjects))
+            subjects, objects, predicates = subjects[order], objects[order], predicates[order]
+            unique = np.ones(subjects.shape[0], dtype=bool)
+            unique[1:] = (subjects[1:] != subjects[:-1]) | (objects[1:] != objects[:-1]) | (
+                    predicates[1:] != predicates[:-1])
+            subjects, objects, predicates = subjects[unique], objects[unique], predicates[unique]
+            missing = counts - np.bincount(subjects - start, minlength=end - start)
+
+        new_pair = np.ones(subjects.shape[0], dtype=bool)
+        new_pair[1:] = (subjects[1:] != subjects[:-1]) | (objects[1:] != objects[:-1])
+        pair_starts = np.flatnonzero(new_pair)
+        keys = np.arange(subjects.shape[0]) - np.repeat(pair_starts, np.diff(np.append(pair_starts, len(subjects))))
+
+        gold_ranks = []
+        annotators = ESBM_ANNOTATORS if self.family == ESBM_FAMILY else 1
+        for _ in range(annotators):
+            priority = self._rng.random(subjects.shape[0])
+            ranked = np.lexsort((priority, subjects))
+            subject_starts = np.searchsorted(subjects[ranked], subjects[ranked], side='left')
+            ranks = np.empty(subjects.shape[0], dtype=np.int64)
+            ranks[ranked] = np.arange(subjects.shape[0]) - subject_starts
+            ranks[subjects >= self.total_root_entities] = self.summary_size
+            gold_ranks.append(ranks)
+        return subjects, objects, predicates, keys, new_pair, np.stack(gold_ranks)
+
+    def _write_edge_data(self, writer: PickleStreamWriter, subject: int, predicate: int, ranks: np.ndarray):
+        writer.empty_dict()
+        writer.begin_items()
+        self._attribute(writer, 'predicate')
+        self._predicate(writer, predicate, 0, self.predicate_id(predicate))
+        writer.item_done()
+        if self.family == WIKES_FAMILY:
+            self._attribute(writer, 'predicate_label')
+            self._predicate(writer, predicate, 1, f"predicate {predicate + 1}")
+            writer.item_done()
+            self._attribute(writer, 'predicate_desc')
+            self._predicate(writer, predicate, 2, f"Synthetic predicate number {predicate + 1}")
+            writer.item_done()
+        if (ranks < self.summary_size).any():
+            self._attribute(writer, 'summary_for')
+            writer.get(self._node_memo_base + subject)
+            writer.item_done()
+            if self.family == ESBM_FAMILY:
+                for annotator, rank in enumerate(ranks.tolist()):
+                    if rank < 5:
+                        self._attribute(writer, f"in_gold_top5_{annotator}")
+                        writer.value(rank)
+                        writer.item_done()
+                    if rank < 10:
+                        self._attribute(writer, f"in_gold_top10_{annotator}")
+                        writer.value(rank)
+                        writer.item_done()
+        writer.end_items()
+
+    def _write_successors(self, writer: PickleStreamWriter, spill, degrees: np.ndarray) -> Tuple[np.ndarray, int]:
+        object_cdf = self._pareto_cdf(self.total_entities)
+        predicate_cdf = self._pareto_cdf(self.total_predicates)
+        in_degrees = np.zeros(self.total_entities, dtype=np.int64)
+        total_pairs = 0
+        total_triples = 0
+
+        writer.empty_dict(_ADJ_MEMO)
+        writer.begin_items()
+        for start in tqdm(range(0, self.total_entities, self.block_size), desc="Writing synthetic triples"):
+            end = min(start + self.block_size, self.total_entities)
+            subjects, objects, predicates, keys, new_pair, ranks = self._generate_block(
+                start, end, degrees, object_cdf, predicate_cdf
+            )
+            pair_ids = total_pairs + np.cumsum(new_pair) - 1
+            spill.write(np.stack([objects[new_pair], subjects[new_pair], pair_ids[new_pair]], axis=1).tobytes())
+            in_degrees += np.bincount(objects[new_pair], minlength=self.total_entities)
+            total_pairs += int(new_pair.sum())
+            total_triples += subjects.shape[0]
+
+            bounds = np.searchsorted(subjects, np.arange(start, end + 1))
+            for subject in range(start, end):
+                writer.get(self._node_memo_base + subject)
+                writer.empty_dict()
+                first, last = bounds[subject - start], bounds[subject - start + 1]
+                if first != last:
+                    writer.begin_items()
+                    for i in range(first, last):
+                        if new_pair[i]:
+                            if i != first:
+                                writer.end_items()
+                                writer.item_done()
+                            writer.get(self._node_memo_base + int(objects[i]))
+                            writer.empty_dict(self._pair_memo_base + int(pair_ids[i]))
+                            writer.begin_items()
+                        writer.value(int(keys[i]))
+                        self._write_edge_data(writer, subject, int(predicates[i]), ranks[:, i])
+                        writer.item_done()
+                    writer.end_items()
+                    writer.item_done()
+                    writer.end_items()
+                writer.item_done()
+        writer.end_items()
+        logger.debug(f"Synthetic triples: {total_triples} written.")
+        return in_degrees, total_pairs
+
+    def _sort_pairs_by_object(self, spill_path: Path, in_degrees: np.ndarray, total_pairs: int,
+                              work_dir: str) -> Tuple[np.ndarray, np.ndarray]:
+        spilled = np.memmap(spill_path, dtype=np.int64, mode='r', shape=(total_pairs, 3))
+        offsets = np.zeros(self.total_entities + 1, dtype=np.int64)
+        np.cumsum(in_degrees, out=offsets[1:])
+        sorted_path = os.path.join(work_dir, 'pairs_by_object.bin')
+        by_object = np.memmap(sorted_path, dtype=np.int64, mode='w+', shape=(max(total_pairs, 1), 2))
+        cursor = offsets[:-1].copy()
+        for start in range(0, total_pairs, self.block_size * 16):
+            block = np.asarray(spilled[start:start + self.block_size * 16])
+            order = np.argsort(block[:, 0], kind='stable')
+            block = block[order]
+            group_starts = np.searchsorted(block[:, 0], block[:, 0], side='left')
+            positions = cursor[block[:, 0]] + np.arange(block.shape[0]) - group_starts
+            by_object[positions] = block[:, 1:]
+            cursor += np.bincount(block[:, 0], minlength=self.total_entities)
+        del spilled
+        return offsets, by_object
+
+    def _write_predecessors(self, writer: PickleStreamWriter, offsets: np.ndarray, by_object: np.ndarray):
+        writer.empty_dict()
+        writer.begin_items()
+        for start in range(0, self.total_entities, self.block_size):
+            end = min(start + self.block_size, self.total_entities)
+            block = np.asarray(by_object[offsets[start]:offsets[end]])
+            block_offset = offsets[start]
+            for node in range(start, end):
+                writer.get(self._node_memo_base + node)
+                writer.empty_dict()
+                first, last = offsets[node] - block_offset, offsets[node + 1] - block_offset
+                if first != last:
+                    writer.begin_items()
+                    for subject, pair_id in block[first:last].tolist():
+                        writer.get(self._node_memo_base + subject)
+                        writer.get(self._pair_memo_base + pair_id)
+                        writer.item_done()
+                    writer.end_items()
+                writer.item_done()
+        writer.end_items()
+
+    def write(self, output_path: Union[str, Path]) -> Path:
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        state_keys = tuple(nx.MultiDiGraph().__dict__.keys())
+        if set(state_keys) - set(_STATE_KEYS):
+            raise RuntimeError(f"Unsupported networkx MultiDiGraph layout: {state_keys}")
+
+        self._attribute_memo = {}
+        self._written_predicates = np.zeros((self.total_predicates, 3), dtype=bool)
+        degrees = self._out_degrees()
+        temporary_path = output_path.with_suffix(output_path.suffix + '.tmp')
+        logger.debug(f"Generating synthetic {self.family} graph into {output_path}...")
+        with tempfile.TemporaryDirectory(dir=output_path.parent) as work_dir, open(temporary_path, 'wb') as file:
+            writer = PickleStreamWriter(file)
+            writer.start()
+            writer.new_object(nx.MultiDiGraph.__module__, nx.MultiDiGraph.__name__)
+            writer.empty_dict()
+            writer.begin_items()
+            by_object = None
+            for key in state_keys:
+                self._attribute(writer, key)
+                if key == '_node':
+                    self._write_nodes(writer)
+                elif key in ('_adj', '_succ') and by_object is not None:
+                    writer.get(_ADJ_MEMO)
+                elif key in ('_adj', '_succ'):
+                    spill_path = Path(work_dir) / 'pairs.bin'
+                    with open(spill_path, 'wb') as spill:
+                        in_degrees, total_pairs = self._write_successors(writer, spill, degrees)
+                    offsets, by_object = self._sort_pairs_by_object(spill_path, in_degrees, total_pairs, work_dir)
+                elif key == '_pred':
+                    if by_object is None:
+                        raise RuntimeError("Successors should be written before predecessors.")
+                    self._write_predecessors(writer, offsets, by_object)
+                else:
+                    writer.empty_dict()
+                writer.item_done()
+            writer.end_items()
+            writer.build()
+            writer.stop()
+            del by_object
+        os.replace(temporary_path, output_path)
+        logger.debug(f"Synthetic graph [{output_path}] generated successfully.")
+        return output_path
+
+
+def generate_synthetic_dataset(save_path: Union[str, Path], name: str, family: str = WIKES_FAMILY,
+                               **generator_kwargs) -> SyntheticDatasetName:
+    dataset = SyntheticVersions.register(name)
+    SyntheticGraphGenerator(family, **generator_kwargs).write(SyntheticVersions.dataset_path(save_path, name))
+    return dataset
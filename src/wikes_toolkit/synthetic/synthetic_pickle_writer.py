@@ -0,0 +1,115 @@
+import struct
+from typing import BinaryIO, Optional
+
+# Protocol 4 opcodes, see `pickletools` for their semantics.
+_PROTO = b'\x80\x04'
+_STOP = b'.'
+_MARK = b'('
+_EMPTY_DICT = b'}'
+_EMPTY_TUPLE = b')'
+_SETITEMS = b'u'
+_STACK_GLOBAL = b'\x93'
+_NEWOBJ = b'\x81'
+_BUILD = b'b'
+_NONE = b'N'
+_NEWTRUE = b'\x88'
+_NEWFALSE = b'\x89'
+_LONG_BINPUT = b'r'
+_LONG_BINGET = b'j'
+_BININT = b'J'
+_SHORT_BINUNICODE = b'\x8c'
+_BINUNICODE = b'X'
+
+_BATCH_SIZE = 1000
+
+
+class PickleStreamWriter:
+    """Writes pickle opcodes directly to a file.
+
+    Unlike `pickle.Pickler`, memo slots are chosen by the caller and nothing written is kept alive, so
+    arbitrarily large containers can be streamed as long as shared objects are addressed by their memo index.
+    """
+
+    def __init__(self, file: BinaryIO, buffer_size: int = 1 << 20):
+        self._file = file
+        self._buffer = bytearray()
+        self._buffer_size = buffer_size
+        self._item_counts = []
+
+    def _write(self, data: bytes):
+        self._buffer += data
+        if len(self._buffer) >= self._buffer_size:
+            self.flush()
+
+    def flush(self):
+        self._file.write(self._buffer)
+        self._buffer.clear()
+
+    def start(self):
+        self._write(_PROTO)
+
+    def stop(self):
+        self._write(_STOP)
+        self.flush()
+
+    def mark(self):
+        self._write(_MARK)
+
+    def set_items(self):
+        self._write(_SETITEMS)
+
+    def empty_dict(self, memo: Optional[int] = None):
+        self._write(_EMPTY_DICT)
+        if memo is not None:
+            self.put(memo)
+
+    def new_object(self, module: str, name: str):
+        self.value(module)
+        self.value(name)
+        self._write(_STACK_GLOBAL + _EMPTY_TUPLE + _NEWOBJ)
+
+    def build(self):
+        self._write(_BUILD)
+
+    def put(self, memo: int):
+        self._write(_LONG_BINPUT + struct.pack('<I', memo))
+
+    def get(self, memo: int):
+        self._write(_LONG_BINGET + struct.pack('<I', memo))
+
+    def value(self, value, memo: Optional[int] = None):
+        if value is None:
+            self._write(_NONE)
+        elif value is True:
+            self._write(_NEWTRUE)
+        elif value is False:
+            self._write(_NEWFALSE)
+        elif isinstance(value, int):
+            if not -(1 << 31) <= value < (1 << 31):
+                raise ValueError(f"Integer {value} does not fit the synthetic pickle format.")
+            self._write(_BININT + struct.pack('<i', value))
+        elif isinstance(value, str):
+            encoded = value.encode('utf-8', 'surrogatepass')
+            if len(encoded) < 256:
+                self._write(_SHORT_BINUNICODE + struct.pack('<B', len(encoded)) + encoded)
+            else:
+                self._write(_BINUNICODE + struct.pack('<I', len(encoded)) + encoded)
+        else:
+            raise ValueError(f"Unsupported value type: {type(value)}")
+        if memo is not None:
+            self.put(memo)
+
+    def begin_items(self):
+        self._item_counts.append(0)
+        self.mark()
+
+    def item_done(self):
+        self._item_counts[-1] += 1
+        if self._item_counts[-1] == _BATCH_SIZE:
+            self.set_items()
+            self.mark()
+            self._item_counts[-1] = 0
+
+    def end_items(self):
+        self._item_counts.pop()
+        self.set_items()
@@ -0,0 +1,30 @@
+from pathlib import Path
+from typing import Union
+
+from wikes_toolkit.base.versions import DatasetName, DatasetVersion
+
+WIKES_FAMILY = 'wikes'
+ESBM_FAMILY = 'esbm'
+
+
+class SyntheticDatasetName(DatasetName):
+
+    def get_dataset_url(self) -> str:
+        raise ValueError(f"Synthetic dataset [{self.value}] is local only, generate it before loading it.")
+
+    def get_version(self) -> str:
+        return SyntheticVersions.version
+
+
+class SyntheticVersions(DatasetVersion):
+    version = 'synthetic'
+    base_url = None
+
+    @staticmethod
+    def register(name: str) -> SyntheticDatasetName:
+        enum_name = name.upper().replace('-', '_').replace('.', '_')
+        return SyntheticDatasetName(f"Synthetic_{enum_name}", {enum_name: name})[enum_name]
+
+    @staticmethod
+    def dataset_path(save_path: Union[str, Path], name: str) -> Path:
+        return Path(save_path) / SyntheticVersions.version / f"{name}.pkl"
@@ -1,41 +1,42 @@
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
 import pickle
 import inspect
 import types
 from pathlib import Path
-from typing import Type, Union, Dict, Tuple, Optional, TypeVar, Callable, List
+from typing import Type, Union, Dict, Tuple, Optional, TypeVar, Callable, List, TYPE_CHECKING
 
-import networkx as nx
-import requests
-from tqdm import tqdm
-
-from wikes_toolkit.esbm.esbm_eval import ESBMSummaryEvaluator
-from wikes_toolkit.esbm.esbm_graph_components import ESBMBaseGraph
-from wikes_toolkit.esbm.esbm_pandas_graph import PandasESBMGraph
-from wikes_toolkit.wikes.wikes_eval import WikESSummaryEvaluator
 from wikes_toolkit.wikes.wikes_versions import WikESVersions
 from wikes_toolkit.esbm.esbm_versions import ESBMVersions
 
-from wikes_toolkit.base.graph_components import BaseESGraph, RootEntity, Triple
+from wikes_toolkit.base import instrumentation, graph_format, text_store
+from wikes_toolkit.base.dataset_store import DatasetStore
+from wikes_toolkit.base.versions import DatasetName, DatasetVersion, split_datasets
+
+if TYPE_CHECKING:
+    import networkx as nx
 
-from wikes_toolkit.esbm.esbm_graph import ESBMGraph
-from wikes_toolkit.wikes.wikes_graph import WikESGraph
-from wikes_toolkit.wikes.wikes_pandas_graph import PandasWikESGraph
-from wikes_toolkit.base.versions import DatasetName, DatasetVersion
-from wikes_toolkit.wikes.wikies_graph_components import WikESBaseGraph
+    from wikes_toolkit.base.graph_components import BaseESGraph, RootEntity, Triple
+    from wikes_toolkit.base.graph_split import GraphSplit
+    from wikes_toolkit.base.vocabulary import Vocabulary
 
 logger = logging.getLogger(__name__)
 
 
 class WikESToolkit:
-    T = TypeVar('T', bound=BaseESGraph)
+    T = TypeVar('T', bound='BaseESGraph')
     WikES_datasets = WikESVersions.available_versions()
     ESBM_datasets = ESBMVersions.available_versions()
 
-    def __init__(self, save_path: Union[str, Path] = None, log_level: int = logging.DEBUG):
+    def __init__(self, save_path: Union[str, Path] = None, log_level: int = logging.DEBUG,
+                 store: Optional[DatasetStore] = None, allow_pickle: bool = True,
+                 vocabulary: Optional[Vocabulary] = None):
+        self.store = store
+        self.allow_pickle = allow_pickle
+        self.vocabulary = vocabulary
         if save_path is None:
             save_path = Path.home() / '.wikes_data'
         self.save_path = Path(save_path)
@@ -44,28 +45,131 @@ class WikESToolkit:
             raise Exception("WikES could not initialize the save path...")
         logging.basicConfig(level=log_level)
 
-    def __download_graph(self, dataset: DatasetName) -> None:
-        url = dataset.get_dataset_url()
-        response = requests.get(url, stream=True)
-        if response.status_code != 200:
-            raise Exception(
-                f"Failed to download dataset [{dataset}] from {url}. HTTP Status Code: {response.status_code}")
-
-        total_size = int(response.headers.get('content-length', 0))
-        dataset_path = self.save_path / dataset.get_version() / f"{dataset.value}.pkl"
+    def dataset_path(self, dataset: DatasetName) -> Path:
+        return self.save_path / dataset.get_version() / f"{dataset.value}.pkl"
+
+    def locate(self, dataset: DatasetName) -> Optional[Path]:
+        """Local file of `dataset`, or `None` if it is missing. The dataset store is looked in first when one is
+        configured, then the plain layout under `save_path`."""
+        if self.store is not None:
+            dataset_path = self.store.path(dataset)
+            if dataset_path is not None:
+                return dataset_path
+        dataset_path = self.dataset_path(dataset)
+        return dataset_path if dataset_path.exists() else None
+
+    def _fetch(self, dataset: DatasetName) -> Path:
+        dataset_path = self.locate(dataset)
+        if dataset_path is None:
+            self.__download_graph(dataset)
+            dataset_path = self.locate(dataset)
+        if dataset_path is None:
+            raise FileNotFoundError(f"Dataset [{dataset}] could not be downloaded.")
+        return dataset_path
+
+    def converted_path(self, dataset: DatasetName) -> Path:
+        return self.dataset_path(dataset).with_suffix('.npz')
+
+    def locate_converted(self, dataset: DatasetName) -> Optional[Path]:
+        """Local pickle free copy of `dataset` in the current `graph_format` version, or `None` if there is none. The
+        plain layout under `save_path` is only looked in when the dataset store lacks `dataset`."""
+        if self.store is not None and self.store.path(dataset) is not None:
+            return self.store.derived_path(dataset, graph_format.GRAPH_FORMAT_KIND, graph_format.FORMAT_VERSION)
+        converted_path = self.converted_path(dataset)
+        if not converted_path.exists():
+            return None
+        try:
+            graph_format.read_metadata(converted_path)
+        except ValueError as e:
+            logger.warning(f"Ignoring {converted_path}: {e}")
+            return None
+        return converted_path
+
+    def convert(self, dataset: DatasetName, compress: bool = False) -> Path:
+        """Converts the `.pkl` release of `dataset` to the pickle free `graph_format` layout.
+
+        This unpickles the release, so run it once on a trusted host and share the result, e.g. through a read-only
+        dataset store, with hosts using `allow_pickle=False`.
+        """
+        dataset_path = self._fetch(dataset)
+        with instrumentation.span('toolkit.convert', dataset=dataset.value):
+            if self.store is not None:
+                temporary_path = self.store.temporary_path()
+            else:
+                temporary_path = self.converted_path(dataset).with_suffix('.npz.part')
+            try:
+                graph_format.convert_pickle(dataset_path, temporary_path, compress)
+            except BaseException:
+                temporary_path.unlink(missing_ok=True)
+                raise
+            if self.store is not None:
+                return self.store.commit_derived(
+                    dataset, graph_format.GRAPH_FORMAT_KIND, graph_format.FORMAT_VERSION, temporary_path
+                )
+            os.replace(temporary_path, self.converted_path(dataset))
+            return self.converted_path(dataset)
+
+    def _read_graph(self, dataset: DatasetName) -> nx.MultiDiGraph:
+        converted_path = self.locate_converted(dataset)
+        if converted_path is not None:
+            with instrumentation.span('toolkit.read_graph', dataset=dataset.value):
+                return graph_format.read_graph(converted_path)
+        if not self.allow_pickle:
+            raise ValueError(f"Dataset [{dataset}] has no converted copy and unpickling is disabled, "
+                             f"convert it on a trusted host with `WikESToolkit.convert`.")
+
+        dataset_path = self._fetch(dataset)
+        with instrumentation.span('toolkit.unpickle', dataset=dataset.value), open(dataset_path, 'rb') as f:
+            return pickle.load(f)
+
+    def download_target(self, dataset: DatasetName) -> Path:
+        """Temporary file to download `dataset` to before handing it to `complete_download`."""
+        if self.store is not None:
+            return self.store.temporary_path()
+        dataset_path = self.dataset_path(dataset)
         dataset_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(dataset_path, 'wb') as file, tqdm(
-                desc=str(dataset_path),
-                total=total_size,
-                unit='iB',
-                unit_scale=True,
-                unit_divisor=1024,
-        ) as bar:
-            for data in response.iter_content(1024):
-                file.write(data)
-                bar.update(len(data))
-
-    def __apply_predictions(
+        return dataset_path.with_suffix(dataset_path.suffix + '.part')
+
+    def complete_download(self, dataset: DatasetName, temporary_path: Path, sha256: str) -> Path:
+        """Moves a finished download of `dataset` with the given SHA-256 digest into place and returns its path."""
+        if self.store is not None:
+            return self.store.commit(dataset, temporary_path, dataset.get_dataset_url(), sha256)
+        dataset_path = self.dataset_path(dataset)
+        os.replace(temporary_path, dataset_path)
+        return dataset_path
+
+    def __download_graph(self, dataset: DatasetName) -> None:
+        import requests
+        from tqdm import tqdm
+
+        with instrumentation.span('toolkit.download', dataset=dataset.value):
+            url = dataset.get_dataset_url()
+            response = requests.get(url, stream=True)
+            response.raise_for_status()
+
+            total_size = int(response.headers.get('content-length', 0))
+            temporary_path = self.download_target(dataset)
+            digest = hashlib.sha256()
+            try:
+                with open(temporary_path, 'wb') as file, tqdm(
+                        desc=str(dataset),
+                        total=total_size,
+                        unit='iB',
+                        unit_scale=True,
+                        unit_divisor=1024,
+                ) as bar:
+                    for data in response.iter_content(1 << 16):
+                        file.write(data)
+                        digest.update(data)
+                        bar.update(len(data))
+            except BaseException:
+                temporary_path.unlink(missing_ok=True)
+                raise
+            self.complete_download(dataset, temporary_path, digest.hexdigest())
+            instrumentation.count('toolkit.downloaded_bytes', bar.n, dataset=dataset.value)
+
+    @staticmethod
+    def apply_predictions(
             G: BaseESGraph,
             predictions: Dict[
                 Union[RootEntity, str],
@@ -81,6 +185,57 @@ class WikESToolkit:
         else:
             raise ValueError("Predictions should be a dictionary of root entities and their predicted triples.")
 
+    def text_store_path(self, dataset: DatasetName) -> Path:
+        return self.dataset_path(dataset).with_suffix('.text')
+
+    def _text_store(self, dataset: DatasetName, G: nx.MultiDiGraph) -> text_store.TextStore:
+        """Memory-mapped text of `dataset`, written next to the dataset, or into the store, on first use.
+
+        The store keys its copy to the dataset's SHA-256; a copy next to the dataset records the size and modification
+        time of the file it was built from and is rebuilt once either changes, so loads never re-read the dataset.
+        """
+        from wikes_toolkit.wikes.wikes_graph import WikESGraph
+
+        source = None
+        if self.store is not None:
+            path = self.store.derived_path(dataset, text_store.TEXT_STORE_KIND, text_store.TEXT_STORE_VERSION)
+        else:
+            path = self.text_store_path(dataset)
+            source_path = self.locate(dataset) or self.locate_converted(dataset)
+            source = text_store.source_stamp(source_path) if source_path is not None else None
+        if path is not None and path.exists():
+            try:
+                texts = text_store.TextStore.open(path)
+                if self.store is not None or texts.source == source:
+                    return texts
+                logger.info(f"Rebuilding {path}, it was built from another copy of [{dataset}].")
+                del texts
+            except ValueError as e:
+                logger.warning(f"Ignoring {path}: {e}")
+
+        with instrumentation.span('toolkit.build_text_store', dataset=dataset.value):
+            texts = text_store.TextStore.from_values(WikESGraph.text_tables(G), source)
+            if self.store is not None and (self.store.read_only or dataset not in self.store):
+                logger.info(f"Keeping the text of [{dataset}] in memory, the dataset store cannot cache it.")
+                return texts
+            if self.store is not None:
+                temporary_path = self.store.temporary_path()
+            else:
+                temporary_path = self.text_store_path(dataset).with_suffix('.text.part')
+            try:
+                texts.write(temporary_path)
+            except BaseException:
+                temporary_path.unlink(missing_ok=True)
+                raise
+            del texts
+            if self.store is not None:
+                path = self.store.commit_derived(
+                    dataset, text_store.TEXT_STORE_KIND, text_store.TEXT_STORE_VERSION, temporary_path
+                )
+            else:
+                os.replace(temporary_path, path)
+        return text_store.TextStore.open(path)
+
     def load_graph(
             self,
             implementation_class: Type[T],
@@ -88,7 +243,24 @@ class WikESToolkit:
             root_entity_formatter: Optional[callable] = None,
             entity_formatter: Optional[Callable] = None,
             predicate_formatter: Optional[Callable] = None,
-            triple_formatter: Optional[Callable] = None) -> T:
+            triple_formatter: Optional[Callable] = None,
+            keep_networkx: bool = True,
+            offload_text: bool = False) -> T:
+        """Loads `dataset` into `implementation_class`.
+
+        With `keep_networkx=False` the networkx graph is released once the backend is initialised, see
+        `BaseESGraph.release_networkx`. With `offload_text=True` the labels, descriptions and titles of a `WikESGraph`
+        are read on access from a memory-mapped `TextStore` instead of being held as Python strings, see
+        `text_store_path`; combine it with `keep_networkx=False`, the networkx graph holds its own copies.
+        """
+        from wikes_toolkit.base.graph_components import BaseESGraph
+        from wikes_toolkit.esbm.esbm_graph import ESBMGraph
+        from wikes_toolkit.esbm.esbm_graph_components import ESBMBaseGraph
+        from wikes_toolkit.esbm.esbm_pandas_graph import PandasESBMGraph
+        from wikes_toolkit.wikes.wikes_graph import WikESGraph
+        from wikes_toolkit.wikes.wikes_pandas_graph import PandasWikESGraph
+        from wikes_toolkit.wikes.wikies_graph_components import WikESBaseGraph
+
         if not issubclass(implementation_class, BaseESGraph):
             raise ValueError("Please use a valid WikESGraph class.")
 
@@ -111,34 +283,81 @@ class WikESToolkit:
         elif issubclass(implementation_class, PandasWikESGraph) and (
                 entity_formatter or predicate_formatter or triple_formatter):
             logger.warning("PandasWikESGraph does not support custom formatters. Ignoring formater functions.")
+        if offload_text and not issubclass(implementation_class, WikESGraph):
+            raise ValueError(f"offload_text is only supported by WikESGraph, not {implementation_class.__name__}.")
 
-        dataset_path = self.save_path / dataset.get_version() / f"{dataset.value}.pkl"
-        if not dataset_path.exists():
-            self.__download_graph(dataset)
-        if not dataset_path.exists():
-            raise FileNotFoundError(f"Dataset [{dataset}] could not be downloaded.")
-
-        with open(dataset_path, 'rb') as f:
-            G: nx.MultiDiGraph = pickle.load(f)
+        G = self._read_graph(dataset)
         if not G:
             raise ValueError("Could not load the graph from the dataset file.")
         else:
             logger.debug(f"Graph [{dataset}] file loaded successfully.")
+        if self.vocabulary is not None:
+            self.vocabulary.intern_graph(G)
 
-        if issubclass(implementation_class, WikESGraph):
-            return WikESGraph(
-                G,
-                dataset,
-                root_entity_formatter, entity_formatter, predicate_formatter, triple_formatter
-            )
-        elif issubclass(implementation_class, PandasWikESGraph):
-            return PandasWikESGraph(G, dataset)
-        elif issubclass(implementation_class, ESBMGraph):
-            return ESBMGraph(G, dataset, root_entity_formatter, entity_formatter, predicate_formatter, triple_formatter)
-        elif issubclass(implementation_class, PandasESBMGraph):
-            return PandasESBMGraph(G, dataset)
-        else:
-            raise ValueError("Please provide a valid Graph class.")
+        with instrumentation.span('toolkit.initialize', dataset=dataset.value,
+                                  implementation=implementation_class.__name__):
+            if issubclass(implementation_class, WikESGraph):
+                graph = WikESGraph(
+                    G,
+                    dataset,
+                    root_entity_formatter, entity_formatter, predicate_formatter, triple_formatter,
+                    self._text_store(dataset, G) if offload_text else None
+                )
+            elif issubclass(implementation_class, PandasWikESGraph):
+                graph = PandasWikESGraph(G, dataset)
+            elif issubclass(implementation_class, ESBMGraph):
+                graph = ESBMGraph(G, dataset, root_entity_formatter, entity_formatter, predicate_formatter,
+                                  triple_formatter)
+            elif issubclass(implementation_class, PandasESBMGraph):
+                graph = PandasESBMGraph(G, dataset)
+            elif not inspect.isabstract(implementation_class):
+                if root_entity_formatter or entity_formatter or predicate_formatter or triple_formatter:
+                    logger.warning(f"{implementation_class.__name__} does not support custom formatters. "
+                                   f"Ignoring formater functions.")
+                graph = implementation_class(G, dataset)
+            else:
+                raise ValueError("Please provide a valid Graph class.")
+        del G
+        if not keep_networkx:
+            with instrumentation.span('toolkit.release_networkx', dataset=dataset.value):
+                graph.release_networkx()
+        return graph
+
+    def split_root_entity_ids(self, dataset: DatasetName) -> List[str]:
+        """Root entities of `dataset`, read from the metadata of a converted copy when there is one. Otherwise the
+        split is loaded and dropped again."""
+        converted_path = self.locate_converted(dataset)
+        if converted_path is not None:
+            return graph_format.read_root_entity_ids(converted_path)
+        G = self._read_graph(dataset)
+        root_entity_ids = [node for node, is_root in G.nodes(data='is_root') if is_root]
+        del G
+        return root_entity_ids
+
+    def load_splits(
+            self,
+            implementation_class: Type[T],
+            dataset: DatasetName,
+            fold: Optional[int] = None,
+            root_entity_formatter: Optional[callable] = None,
+            entity_formatter: Optional[Callable] = None,
+            predicate_formatter: Optional[Callable] = None,
+            triple_formatter: Optional[Callable] = None,
+            keep_networkx: bool = True,
+            offload_text: bool = False) -> Dict[str, GraphSplit]:
+        """Loads the full `dataset` once and returns its train, validation and test splits as views of it.
+
+        Only the root entities of the splits are read from their files, see `split_root_entity_ids`. Converting the
+        split files first avoids loading them at all.
+        """
+        from wikes_toolkit.base.graph_split import GraphSplit
+
+        splits = split_datasets(dataset, fold)
+        graph = self.load_graph(implementation_class, dataset, root_entity_formatter, entity_formatter,
+                                predicate_formatter, triple_formatter, keep_networkx, offload_text)
+        with instrumentation.span('toolkit.load_splits', dataset=dataset.value):
+            return {split: GraphSplit(graph, split_dataset, self.split_root_entity_ids(split_dataset))
+                    for split, split_dataset in splits.items()}
 
     def load_all_graphs(self,
                         implementation_class: Type[T],
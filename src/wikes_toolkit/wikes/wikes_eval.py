@@ -1,8 +1,14 @@
 from typing import Dict, List, Tuple
+from wikes_toolkit.base import instrumentation
 from wikes_toolkit.base.evaluate import f1, map, f1_norel, map_norel
 
 
 class WikESSummaryEvaluator:
+    """Reference WikES evaluation built on `base.evaluate`, one root entity at a time.
+
+    `WikESBaseGraph.f1_score` and `map_score` compute the same scores with the metric engine and are tested against
+    this class.
+    """
     def __init__(self, root_entities: List[str], ground_truth: Dict[str, List[Tuple[str, str, str]]],
                  predictions: Dict[str, List[Tuple[str, str, str]]]):
         self.root_entities = root_entities
@@ -21,32 +27,25 @@ class WikESSummaryEvaluator:
             predictions = predictions[:len(ground_truth)]
         return predictions
 
-    def evaluate_f1(self, top_k: int = None, no_rel: bool = False):
-        score_function = f1_norel if no_rel else f1
-        entity_count = len(self.root_entities)
-        dataset_f1_sum = 0
-
+    def _entity_scores(self, score_function, top_k: int = None) -> List[float]:
+        scores = []
         for entity_id in self.root_entities:
             gold_summaries = self.get_summaries(entity_id)
             algo_summary = self.get_predications(entity_id, top_k)
+            scores.append(score_function(gold_summaries, algo_summary) if algo_summary else 0)
+        return scores
 
-            if algo_summary:
-                dataset_f1_sum += score_function(gold_summaries, algo_summary)
-
-        return dataset_f1_sum / entity_count
-
-    def evaluate_map(self, top_k: int = None, no_rel: bool = False):
-        score_function = map_norel if no_rel else map
-        entity_count = len(self.root_entities)
-        dataset_map_sum = 0
-
-        for entity_id in self.root_entities:
-            gold_summaries = self.get_summaries(entity_id)
-            algo_summary = self.get_predications(entity_id, top_k)
+    def entity_f1_scores(self, top_k: int = None, no_rel: bool = False) -> List[float]:
+        """F1 of every root entity, in the order of `root_entities`, 0 for roots without predictions."""
+        return self._entity_scores(f1_norel if no_rel else f1, top_k)
 
-            if algo_summary:
-                dataset_map_sum += score_function(gold_summaries, algo_summary)
+    def entity_map_scores(self, top_k: int = None, no_rel: bool = False) -> List[float]:
+        return self._entity_scores(map_norel if no_rel else map, top_k)
 
-        avg_map = dataset_map_sum / entity_count
+    def evaluate_f1(self, top_k: int = None, no_rel: bool = False):
+        with instrumentation.span('evaluate.f1', dataset='wikes', top_k=top_k, no_rel=no_rel):
+            return sum(self.entity_f1_scores(top_k, no_rel)) / len(self.root_entities)
 
-        return avg_map
+    def evaluate_map(self, top_k: int = None, no_rel: bool = False):
+        with instrumentation.span('evaluate.map', dataset='wikes', top_k=top_k, no_rel=no_rel):
+            return sum(self.entity_map_scores(top_k, no_rel)) / len(self.root_entities)
@@ -1,16 +1,22 @@
 import logging
 from collections import defaultdict
-from typing import Union, Tuple, List, Optional, Dict
+from itertools import chain
+from typing import Union, Tuple, List, Optional, Dict, Sequence
 
 import networkx as nx
 
 from wikes_toolkit.base.graph_components import Entity, RootEntity, Triple, Predicate
+from wikes_toolkit.base import instrumentation
+from wikes_toolkit.base.text_store import TextStore, TextTable
 from wikes_toolkit.base.versions import DatasetName
 from wikes_toolkit.wikes.wikies_graph_components import WikESBaseGraph, WikiEntity, WikiRootEntity, WikiPredicate, \
     WikiTriple
 
 logger = logging.getLogger(__name__)
 
+ENTITY_TEXT = 'entities'
+PREDICATE_TEXT = 'predicates'
+
 
 class WikESGraph(WikESBaseGraph):
 
@@ -20,10 +26,42 @@ class WikESGraph(WikESBaseGraph):
                  root_entity_formatter: Optional[callable] = None,
                  entity_formatter: Optional[callable] = None,
                  predicate_formatter: Optional[callable] = None,
-                 triple_formatter: Optional[callable] = None
+                 triple_formatter: Optional[callable] = None,
+                 text_store: Optional[TextStore] = None
                  ):
+        self._text_store = text_store
         super().__init__(G, dataset, root_entity_formatter, entity_formatter, predicate_formatter, triple_formatter)
 
+    @staticmethod
+    def text_tables(G: nx.MultiDiGraph) -> Dict[str, Dict[str, Sequence[Optional[str]]]]:
+        """Entity and predicate text of `G` in the row order `_initialize` reads it in, for a `TextStore`."""
+        entities = {'identifier': [], 'wikidata_label': [], 'wikidata_description': [], 'wikipedia_title': []}
+        for node, data in G.nodes(data=True):
+            entities['identifier'].append(node)
+            entities['wikidata_label'].append(data.get('wikidata_label'))
+            entities['wikidata_description'].append(data.get('wikidata_desc'))
+            entities['wikipedia_title'].append(data.get('wikipedia_title'))
+        predicates = {}
+        for _, _, data in G.edges(data=True):
+            if data['predicate'] not in predicates:
+                predicates[data['predicate']] = (data.get('predicate_label'), data.get('predicate_desc'))
+        return {
+            ENTITY_TEXT: entities,
+            PREDICATE_TEXT: {
+                'identifier': list(predicates),
+                'label': [label for label, _ in predicates.values()],
+                'description': [description for _, description in predicates.values()],
+            },
+        }
+
+    def _shared_text(self, table: str, keys: List[str], key: str) -> TextTable:
+        """Table of the text store shared by all objects of a kind, checked against the graph since the store is a
+        separate file."""
+        try:
+            return self._text_store.shared_table(table, keys, key)
+        except ValueError as e:
+            raise ValueError(f"The text store of [{self._dataset_name}] is stale: {e}")
+
     def _initialize(self):
         self._entities: Dict[str, WikiEntity] = {}
         self._root_entities: Dict[str, WikiRootEntity] = {}
@@ -31,56 +69,72 @@ class WikESGraph(WikESBaseGraph):
         self._triples: Dict[Tuple[str, str, str], WikiTriple] = {}
         self._ground_truths: Dict[str, List[Tuple[str, str, str]]] = defaultdict(list)
         logger.debug("Initializing WikESGraph...")
-        for node, data in self._G.nodes(data=True):
-            if data.get('is_root', False):
-                root_entity = WikiRootEntity(
+        with instrumentation.span('initialize.entities', graph=type(self).__name__,
+                                  text_store=self._text_store is not None):
+            for node, data in self._G.nodes(data=True):
+                if self._text_store is None:
+                    attributes = {
+                        'wikidata_label': data.get('wikidata_label'),
+                        'wikidata_description': data.get('wikidata_desc'),
+                        'wikipedia_title': data.get('wikipedia_title'),
+                    }
+                else:
+                    attributes = {}
+                if data.get('is_root', False):
+                    root_entity = WikiRootEntity(
+                        identifier=node,
+                        wikipedia_id=data.get('wikipedia_id'),
+                        category=data.get('category'),
+                        str_formatter=self._root_entity_formatter,
+                        **attributes
+                    )
+                    self._root_entities[node] = root_entity
+
+                entity = WikiEntity(
                     identifier=node,
-                    wikidata_label=data.get('wikidata_label'),
-                    wikidata_description=data.get('wikidata_desc'),
                     wikipedia_id=data.get('wikipedia_id'),
-                    wikipedia_title=data.get('wikipedia_title'),
-                    category=data.get('category'),
-                    str_formatter=self._root_entity_formatter
+                    str_formatter=self._entity_formatter,
+                    **attributes
                 )
-                self._root_entities[node] = root_entity
-
-            entity = WikiEntity(
-                identifier=node,
-                wikidata_label=data.get('wikidata_label'),
-                wikidata_description=data.get('wikidata_desc'),
-                wikipedia_id=data.get('wikipedia_id'),
-                wikipedia_title=data.get('wikipedia_title'),
-                str_formatter=self._entity_formatter
-            )
-            self._entities[node] = entity
+                self._entities[node] = entity
+            if self._text_store is not None:
+                text = self._shared_text(ENTITY_TEXT, list(self._entities), 'identifier')
+                for entity in chain(self._entities.values(), self._root_entities.values()):
+                    entity.text = text
         logger.debug(f"Entities: {len(self._entities)} initialized.")
 
         logger.debug("Initializing triples...")
-        for u, v, data in self._G.edges(data=True):
-            predicate_id = data['predicate']
-            if predicate_id not in self._predicates:
-                self._predicates[predicate_id] = WikiPredicate(
-                    predicate_id=predicate_id,
-                    label=data.get('predicate_label'),
-                    description=data.get('predicate_desc'),
-                    str_formatter=self._predicate_formatter
-                )
-
-            triple = WikiTriple(
-                subject_entity=self._entities[u],
-                predicate=self._predicates[predicate_id],
-                object_entity=self._entities[v],
-                str_formatter=self._triple_formatter
-            )
-            self._triples[(u, predicate_id, v)] = triple
-            if 'summary_for' in data:
-                self._ground_truths[data['summary_for']].append(
-                    (
-                        triple.subject_entity.identifier,
-                        triple.predicate.predicate_id,
-                        triple.object_entity.identifier
+        with instrumentation.span('initialize.triples', graph=type(self).__name__):
+            for u, v, data in self._G.edges(data=True):
+                predicate_id = data['predicate']
+                if predicate_id not in self._predicates:
+                    offload = self._text_store is not None
+                    self._predicates[predicate_id] = WikiPredicate(
+                        predicate_id=predicate_id,
+                        label=None if offload else data.get('predicate_label'),
+                        description=None if offload else data.get('predicate_desc'),
+                        str_formatter=self._predicate_formatter
                     )
+
+                triple = WikiTriple(
+                    subject_entity=self._entities[u],
+                    predicate=self._predicates[predicate_id],
+                    object_entity=self._entities[v],
+                    str_formatter=self._triple_formatter
                 )
+                self._triples[(u, predicate_id, v)] = triple
+                if 'summary_for' in data:
+                    self._ground_truths[data['summary_for']].append(
+                        (
+                            triple.subject_entity.identifier,
+                            triple.predicate.predicate_id,
+                            triple.object_entity.identifier
+                        )
+                    )
+            if self._text_store is not None:
+                text = self._shared_text(PREDICATE_TEXT, list(self._predicates), 'predicate_id')
+                for predicate in self._predicates.values():
+                    predicate.text = text
         logger.debug(f"Triples: {len(self._triples)} initialized.")
 
     def root_entities(self) -> List[WikiRootEntity]:
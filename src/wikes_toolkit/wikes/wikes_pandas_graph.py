@@ -4,6 +4,7 @@ from typing import Union, Tuple
 import networkx as nx
 import pandas as pd
 
+from wikes_toolkit.base import instrumentation
 from wikes_toolkit.base.versions import DatasetName
 from wikes_toolkit.wikes import wikes_exporter
 from wikes_toolkit.wikes.wikies_graph_components import WikESBaseGraph
@@ -19,82 +20,86 @@ class PandasWikESGraph(WikESBaseGraph):
     def _initialize(self):
         logger.debug("Initializing PandasWikESGraph...")
 
-        nodes_data = [
-            {
-                'identifier': node,
-                'wikidata_label': data.get('wikidata_label'),
-                'wikidata_description': data.get('wikidata_desc'),
-                'wikipedia_id': int(data.get('wikipedia_id')) if data.get('wikipedia_id') else None,
-                'wikipedia_title': data.get('wikipedia_title'),
-                'category': data.get('category', None)
-            }
-            for node, data in self._G.nodes(data=True) if data.get('is_root', False)
-        ]
-        self._root_entities = pd.DataFrame(nodes_data, columns=[
-            'identifier', 'wikidata_label', 'wikidata_description', 'wikipedia_id', 'wikipedia_title', 'category'
-        ]).set_index('identifier')
-        logger.debug(f"Root entities: {self._root_entities.shape[0]} initialized.")
-        del nodes_data
-
-        nodes_data = [
-            {
-                'identifier': node,
-                'wikidata_label': data.get('wikidata_label'),
-                'wikidata_description': data.get('wikidata_desc'),
-                'wikipedia_id': int(data.get('wikipedia_id')) if data.get('wikipedia_id') else None,
-                'wikipedia_title': data.get('wikipedia_title')
-            }
-            for node, data in self._G.nodes(data=True)
-        ]
-        self._entities = pd.DataFrame(nodes_data, columns=[
-            'identifier', 'wikidata_label', 'wikidata_description', 'wikipedia_id', 'wikipedia_title'
-        ]).set_index('identifier')
-        logger.debug(f"Entities: {self._entities.shape[0]} initialized.")
-
-        del nodes_data
+        with instrumentation.span('initialize.entities', graph=type(self).__name__):
+            nodes_data = [
+                {
+                    'identifier': node,
+                    'wikidata_label': data.get('wikidata_label'),
+                    'wikidata_description': data.get('wikidata_desc'),
+                    'wikipedia_id': int(data.get('wikipedia_id')) if data.get('wikipedia_id') else None,
+                    'wikipedia_title': data.get('wikipedia_title'),
+                    'category': data.get('category', None)
+                }
+                for node, data in self._G.nodes(data=True) if data.get('is_root', False)
+            ]
+            self._root_entities = pd.DataFrame(nodes_data, columns=[
+                'identifier', 'wikidata_label', 'wikidata_description', 'wikipedia_id', 'wikipedia_title', 'category'
+            ]).set_index('identifier')
+            logger.debug(f"Root entities: {self._root_entities.shape[0]} initialized.")
+            del nodes_data
+
+            nodes_data = [
+                {
+                    'identifier': node,
+                    'wikidata_label': data.get('wikidata_label'),
+                    'wikidata_description': data.get('wikidata_desc'),
+                    'wikipedia_id': int(data.get('wikipedia_id')) if data.get('wikipedia_id') else None,
+                    'wikipedia_title': data.get('wikipedia_title')
+                }
+                for node, data in self._G.nodes(data=True)
+            ]
+            self._entities = pd.DataFrame(nodes_data, columns=[
+                'identifier', 'wikidata_label', 'wikidata_description', 'wikipedia_id', 'wikipedia_title'
+            ]).set_index('identifier')
+            logger.debug(f"Entities: {self._entities.shape[0]} initialized.")
+
+            del nodes_data
 
         logger.debug("Initializing triples...")
-        edges_data = []
-        ground_truths_data = []
-        predicates_data = dict()
-
-        for u, v, data in self._G.edges(data=True):
-            predicate_id = data['predicate']
-            edges_data.append({'subject': u, 'predicate': predicate_id, 'object': v})
-
-            if predicate_id not in predicates_data:
-                predicates_data[predicate_id] = (data.get('predicate_label'), data.get('predicate_desc'))
-
-            if 'summary_for' in data:
-                ground_truths_data.append({
-                    'identifier': data['summary_for'],
-                    'subject': u,
-                    'predicate': predicate_id,
-                    'object': v
-                })
-        predicate_flat = [
-            {
-                'identifier': k,
-                'predicate_label': v[0],
-                'predicate_desc': v[1]
-            } for k, v in predicates_data.items()
-        ]
-        self._predicates = pd.DataFrame(
-            predicate_flat,
-            columns=['identifier', 'predicate_label', 'predicate_desc']
-        ).set_index('identifier')
-        del predicate_flat, predicates_data
-
-        self._triples = pd.DataFrame(edges_data, columns=['subject', 'predicate', 'object'])
-        del edges_data
-
-        self._ground_truths = pd.DataFrame(
-            ground_truths_data,
-            columns=['identifier', 'subject', 'predicate', 'object']
-        ).set_index('identifier')
-        del ground_truths_data
-
-        logger.debug(f"Triples: {self._triples.shape[0]} initialized.")
+        with instrumentation.span('initialize.triples', graph=type(self).__name__):
+            edges_data = []
+            ground_truths_data = []
+            predicates_data = dict()
+
+            for u, v, data in self._G.edges(data=True):
+                predicate_id = data['predicate']
+                edges_data.append({'subject': u, 'predicate': predicate_id, 'object': v})
+
+                if predicate_id not in predicates_data:
+                    predicates_data[predicate_id] = (data.get('predicate_label'), data.get('predicate_desc'))
+
+                if 'summary_for' in data:
+                    ground_truths_data.append({
+                        'identifier': data['summary_for'],
+                        'subject': u,
+                        'predicate': predicate_id,
+                        'object': v
+                    })
+            predicate_flat = [
+                {
+                    'identifier': k,
+                    'predicate_label': v[0],
+                    'predicate_desc': v[1]
+                } for k, v in predicates_data.items()
+            ]
+            self._predicates = pd.DataFrame(
+                predicate_flat,
+                columns=['identifier', 'predicate_label', 'predicate_desc']
+            ).set_index('identifier')
+            del predicate_flat, predicates_data
+
+            self._triples = pd.DataFrame(edges_data, columns=['subject', 'predicate', 'object'])
+            del edges_data
+
+            with instrumentation.span('initialize.ground_truths', graph=type(self).__name__):
+                self._ground_truths = pd.DataFrame(
+                    ground_truths_data,
+                    columns=['identifier', 'subject', 'predicate', 'object']
+                ).set_index('identifier')
+                del ground_truths_data
+                self._group_ground_truths()
+
+            logger.debug(f"Triples: {self._triples.shape[0]} initialized.")
 
     def root_entities(self) -> pd.DataFrame:
         return super().root_entities()
@@ -127,7 +132,7 @@ class PandasWikESGraph(WikESBaseGraph):
         return wikes_exporter.export(
             path,
             license_path,
-            self._G,
+            self.networkx_graph(),
             self._dataset_name,
             self._entities,
             self._root_entities,
@@ -0,0 +1,117 @@
+import logging
+from typing import Union, Tuple, Dict, List, Iterator
+
+import networkx as nx
+import numpy as np
+import polars as pl
+
+from wikes_toolkit.base import instrumentation
+from wikes_toolkit.base.polars_graph import PolarsGraphMixin, Row
+from wikes_toolkit.base.versions import DatasetName
+from wikes_toolkit.wikes.wikies_graph_components import WikESBaseGraph, WikiRootEntity
+
+logger = logging.getLogger(__name__)
+
+
+class PolarsWikESGraph(PolarsGraphMixin, WikESBaseGraph):
+
+    def __init__(self, G: nx.MultiDiGraph, dataset_name: DatasetName):
+        super().__init__(G, dataset_name)
+
+    def _initialize(self):
+        logger.debug("Initializing PolarsWikESGraph...")
+
+        with instrumentation.span('initialize.entities', graph=type(self).__name__):
+            columns = {
+                'identifier': [], 'wikidata_label': [], 'wikidata_description': [], 'wikipedia_id': [],
+                'wikipedia_title': [], 'category': []
+            }
+            is_root = []
+            for node, data in self._G.nodes(data=True):
+                columns['identifier'].append(node)
+                columns['wikidata_label'].append(data.get('wikidata_label'))
+                columns['wikidata_description'].append(data.get('wikidata_desc'))
+                columns['wikipedia_id'].append(int(data.get('wikipedia_id')) if data.get('wikipedia_id') else None)
+                columns['wikipedia_title'].append(data.get('wikipedia_title'))
+                columns['category'].append(data.get('category', None))
+                is_root.append(data.get('is_root', False))
+            entities = pl.DataFrame(columns, schema={
+                'identifier': pl.String, 'wikidata_label': pl.String, 'wikidata_description': pl.String,
+                'wikipedia_id': pl.Int64, 'wikipedia_title': pl.String, 'category': pl.String
+            })
+            del columns
+            self._root_entities = entities.filter(pl.Series(is_root, dtype=pl.Boolean))
+            self._entities = entities.drop('category')
+            del entities, is_root
+            logger.debug(f"Root entities: {self._root_entities.height} initialized.")
+            logger.debug(f"Entities: {self._entities.height} initialized.")
+
+        logger.debug("Initializing triples...")
+        with instrumentation.span('initialize.triples', graph=type(self).__name__):
+            subjects, predicates, objects = [], [], []
+            ground_truths = {'root_entity': [], 'subject': [], 'predicate': [], 'object': []}
+            predicates_data = dict()
+
+            for u, v, data in self._G.edges(data=True):
+                predicate_id = data['predicate']
+                subjects.append(u)
+                predicates.append(predicate_id)
+                objects.append(v)
+
+                if predicate_id not in predicates_data:
+                    predicates_data[predicate_id] = (data.get('predicate_label'), data.get('predicate_desc'))
+
+                if 'summary_for' in data:
+                    ground_truths['root_entity'].append(data['summary_for'])
+                    ground_truths['subject'].append(u)
+                    ground_truths['predicate'].append(predicate_id)
+                    ground_truths['object'].append(v)
+
+            self._predicates = pl.DataFrame({
+                'identifier': list(predicates_data.keys()),
+                'predicate_label': [label for label, _ in predicates_data.values()],
+                'predicate_desc': [description for _, description in predicates_data.values()],
+            }, schema={'identifier': pl.String, 'predicate_label': pl.String, 'predicate_desc': pl.String})
+            del predicates_data
+
+            self._triples = pl.DataFrame(
+                {'subject': subjects, 'predicate': predicates, 'object': objects},
+                schema={'subject': pl.String, 'predicate': pl.String, 'object': pl.String}
+            )
+            del subjects, predicates, objects
+
+            self._ground_truths = pl.DataFrame(ground_truths, schema={
+                'root_entity': pl.String, 'subject': pl.String, 'predicate': pl.String, 'object': pl.String
+            })
+            del ground_truths
+
+            logger.debug(f"Triples: {self._triples.height} initialized.")
+
+    def ground_truths(self, root_entity: Union[WikiRootEntity, str, Row]) -> pl.DataFrame:
+        identifier = self.fetch_root_entity_id(root_entity)
+        return self._ground_truths.lazy().filter(pl.col('root_entity') == identifier).collect()
+
+    def ground_truth_triple_ids(self, root_entity: Union[WikiRootEntity, str, Row]) -> List[Tuple[str, str, str]]:
+        return self.ground_truths(root_entity).select('subject', 'predicate', 'object').rows()
+
+    def iter_ground_truths(self, k: int = None) -> Iterator[Tuple[str, List[Tuple[str, str, str]]]]:
+        columns = pl.col('subject', 'predicate', 'object')
+        grouped = self._ground_truths.lazy().group_by('root_entity', maintain_order=True).agg(
+            columns if k is None else columns.head(k)
+        ).collect()
+        ground_truths = {
+            root_entity: list(zip(subjects, predicates, objects))
+            for root_entity, subjects, predicates, objects in grouped.iter_rows()
+        }
+        for root_entity in self.root_entity_ids():
+            yield root_entity, ground_truths.get(root_entity, [])
+
+    def _ground_truth_arrays(self) -> Dict[str, Dict[str, np.ndarray]]:
+        ranks = self._ground_truths.select(pl.int_range(pl.len()).over('root_entity'))
+        return {'ground_truths': self._encode_ground_truth_table(
+            self._ground_truths['root_entity'].to_numpy(),
+            self._ground_truths['subject'].to_numpy(),
+            self._ground_truths['predicate'].to_numpy(),
+            self._ground_truths['object'].to_numpy(),
+            rank=ranks.to_series().to_numpy()
+        )}
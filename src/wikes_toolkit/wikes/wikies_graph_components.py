@@ -3,26 +3,30 @@ from __future__ import annotations
 import logging
 from abc import abstractmethod
 from dataclasses import dataclass, field
-from typing import Optional, Union, Tuple, Callable, List, Dict
+from typing import Optional, Union, Tuple, Callable, List, Dict, Iterator
 
 import networkx as nx
+import numpy as np
 import pandas as pd
 
+from wikes_toolkit.base import instrumentation, metrics
 from wikes_toolkit.base.graph_components import Entity, Predicate, Triple, BaseESGraph
+from wikes_toolkit.base.text_store import TextField
 from wikes_toolkit.base.versions import DatasetName
-from wikes_toolkit.wikes.wikes_eval import WikESSummaryEvaluator
 
 logger = logging.getLogger(__name__)
 
 
 @dataclass
 class WikiEntity(Entity):
+    """Text attributes left unset are read from `text`, the graph's shared `TextTable`, when they are accessed."""
     identifier: str
-    wikidata_label: Optional[str] = None
-    wikidata_description: Optional[str] = None
+    wikidata_label: Optional[str] = TextField()
+    wikidata_description: Optional[str] = TextField()
     wikipedia_id: Optional[int] = None
-    wikipedia_title: Optional[str] = None
+    wikipedia_title: Optional[str] = TextField()
     str_formatter: Optional[Callable[[WikiEntity], str]] = field(default=None, repr=False)
+    text = None
 
     def __str__(self):
         if self.str_formatter:
@@ -58,9 +62,10 @@ class WikiRootEntity(WikiEntity):
 @dataclass
 class WikiPredicate(Predicate):
     predicate_id: str
-    label: Optional[str] = None
-    description: Optional[str] = None
+    label: Optional[str] = TextField()
+    description: Optional[str] = TextField()
     str_formatter: Optional[Callable[[WikiPredicate], str]] = field(default=None, repr=False)
+    text = None
 
     def __str__(self):
         if self.str_formatter:
@@ -104,6 +109,8 @@ class WikiTriple(Triple):
 
 
 class WikESBaseGraph(BaseESGraph):
+    _ground_truth_code_cache: Optional[Dict[bool, List[np.ndarray]]] = None
+
     def __init__(self, G: nx.MultiDiGraph,
                  dataset: DatasetName,
                  root_entity_formatter: Optional[callable] = None,
@@ -120,13 +127,26 @@ class WikESBaseGraph(BaseESGraph):
     def _initialize(self):
         pass
 
+    def _group_ground_truths(self):
+        """Sorts the ground-truth table by root entity, keeping each root's order, and records where roots start."""
+        self._ground_truths = self._ground_truths.sort_index(kind='stable')
+        roots, starts = np.unique(self._ground_truths.index.to_numpy(), return_index=True)
+        self._ground_truth_roots = pd.Index(roots)
+        self._ground_truth_offsets = np.append(starts, self._ground_truths.shape[0])
+
+    def _ground_truth_rows(self, root_entity_id: str) -> slice:
+        row = self._ground_truth_roots.get_indexer([root_entity_id])[0]
+        if row < 0:
+            return slice(0, 0)
+        return slice(self._ground_truth_offsets[row], self._ground_truth_offsets[row + 1])
+
     def ground_truths(self, root_entity: Union[WikiRootEntity, str, pd.Series]) -> Union[
         List[Tuple[str, str, str]],
         pd.Series
     ]:
         if isinstance(self._ground_truths, pd.DataFrame):
             root_entity = self.fetch_root_entity(root_entity)
-            return self._ground_truths[self._ground_truths.index == root_entity.name]
+            return self._ground_truths.iloc[self._ground_truth_rows(root_entity.name)]
         else:
             root_entity_id = self.fetch_root_entity(root_entity).identifier
             if root_entity_id not in self._ground_truths:
@@ -135,31 +155,120 @@ class WikESBaseGraph(BaseESGraph):
 
     def ground_truth_triple_ids(self, root_entity: Union[WikiRootEntity, str, pd.Series]) -> List[Tuple[str, str, str]]:
         if isinstance(self._ground_truths, pd.DataFrame):
-            return list(self.ground_truths(root_entity)[['subject', 'predicate', 'object']].apply(tuple, axis=1))
+            ground_truths = self.ground_truths(root_entity)
+            return list(zip(ground_truths['subject'].tolist(), ground_truths['predicate'].tolist(),
+                            ground_truths['object'].tolist()))
         else:
             return [(s, p, o) for s, p, o in self.ground_truths(root_entity)]
 
-    def all_ground_truth_triple_ids(self, k: int = None) -> Dict[str, List[Tuple[str, str, str]]]:
-        if k is not None:
-            result = {}
+    def iter_ground_truths(self, k: int = None) -> Iterator[Tuple[str, List[Tuple[str, str, str]]]]:
+        if isinstance(self._ground_truths, pd.DataFrame):
+            triples = list(zip(self._ground_truths['subject'].tolist(), self._ground_truths['predicate'].tolist(),
+                               self._ground_truths['object'].tolist()))
             for root_entity in self.root_entity_ids():
-                ground_truth_triples = self.ground_truth_triple_ids(root_entity)
-                if len(ground_truth_triples) < k:
-                    result[root_entity] = ground_truth_triples
-                else:
-                    result[root_entity] = self.ground_truth_triple_ids(root_entity)[:k]
-        return {root_entity: self.ground_truth_triple_ids(root_entity) for root_entity in self.root_entity_ids()}
+                rows = self._ground_truth_rows(root_entity)
+                yield root_entity, triples[rows][:k]
+        else:
+            for root_entity in self.root_entity_ids():
+                if root_entity not in self._ground_truths:
+                    raise ValueError(f"No ground truth summaries found for root_entity: {root_entity}.")
+                yield root_entity, self._ground_truths[root_entity][:k]
+
+    def all_ground_truth_triple_ids(self, k: int = None) -> Dict[str, List[Tuple[str, str, str]]]:
+        return dict(self.iter_ground_truths(k))
+
+    def _ground_truth_arrays(self) -> Dict[str, Dict[str, np.ndarray]]:
+        if isinstance(self._ground_truths, pd.DataFrame):
+            return {'ground_truths': self._encode_ground_truth_table(
+                self._ground_truths.index,
+                self._ground_truths['subject'].to_numpy(),
+                self._ground_truths['predicate'].to_numpy(),
+                self._ground_truths['object'].to_numpy(),
+                rank=np.arange(self._ground_truths.shape[0]) - np.repeat(
+                    self._ground_truth_offsets[:-1], np.diff(self._ground_truth_offsets)
+                )
+            )}
+        roots, ranks, triples = [], [], []
+        for root_entity, ground_truth in self._ground_truths.items():
+            roots.extend([root_entity] * len(ground_truth))
+            ranks.extend(range(len(ground_truth)))
+            triples.extend(ground_truth)
+        subjects, predicates, objects = zip(*triples) if triples else ((), (), ())
+        return {'ground_truths': self._encode_ground_truth_table(roots, subjects, predicates, objects, rank=ranks)}
+
+    def ground_truth_labels(self, k: int = None) -> np.ndarray:
+        return self._ground_truth_labels(list(self.all_ground_truth_triple_ids(k).values()))
+
+    def _ground_truth_summaries(self) -> Dict[str, List[Tuple[str, str, str]]]:
+        if isinstance(self._ground_truths, dict):
+            return self._ground_truths
+        return self.all_ground_truth_triple_ids()
 
     def f1_score(self, k: int = None, no_rel: bool = False):
-        return WikESSummaryEvaluator(
-            super().root_entities(),
-            self._ground_truths,
-            self._predicted_summaries
-        ).evaluate_f1(k, no_rel)
+        with instrumentation.span('evaluate.f1', dataset='wikes', top_k=k, no_rel=no_rel):
+            return float(self.entity_scores(metrics.F1, k, no_rel).mean())
 
     def map_score(self, k: int = None, no_rel: bool = False):
-        return WikESSummaryEvaluator(
-            super().root_entities(),
-            self._ground_truths,
-            self._predicted_summaries
-        ).evaluate_map(k, no_rel)
+        with instrumentation.span('evaluate.map', dataset='wikes', top_k=k, no_rel=no_rel):
+            return float(self.entity_scores(metrics.MAP, k, no_rel).mean())
+
+    def entity_scores(self, metric: str = 'f1', k: int = None, no_rel: bool = False) -> np.ndarray:
+        """Per root entity `f1` or `map`, aligned with `root_entity_ids()`; their mean is `f1_score`/`map_score`."""
+        if metric not in (metrics.F1, metrics.MAP):
+            raise ValueError(f"Unknown metric: {metric}, use 'f1' or 'map'.")
+        return self.entity_metrics([metric], k, no_rel)[metric]
+
+    def _ground_truth_codes(self, no_rel: bool) -> List[np.ndarray]:
+        if self._ground_truth_code_cache is None:
+            self._ground_truth_code_cache = {}
+        if no_rel not in self._ground_truth_code_cache:
+            ground_truths = self._ground_truth_summaries()
+            self._ground_truth_code_cache[no_rel] = self._summary_codes(
+                [ground_truths.get(root_entity, []) for root_entity in self.root_entity_ids()], no_rel
+            )
+        return self._ground_truth_code_cache[no_rel]
+
+    def _hit_matrix(self, k: int, no_rel: bool, positions: np.ndarray) -> metrics.HitMatrix:
+        """Ranks are cut at `k` or at the size of the root's ground truth, whichever is smaller."""
+        ground_truth_codes = self._ground_truth_codes(no_rel)
+        gold = [ground_truth_codes[position] for position in positions.tolist()]
+        predictions = [self._predicted_summaries.get(root_entity, [])
+                       for root_entity in self._root_entity_index()[positions]]
+        cutoffs = np.array([len(ground_truth) for ground_truth in gold], dtype=np.int64)
+        if k:
+            cutoffs = np.minimum(cutoffs, k)
+        return metrics.build_hit_matrix(gold, self._summary_codes(predictions, no_rel), cutoffs)
+
+    def _rebuild_networkx(self) -> nx.MultiDiGraph:
+        """Rebuilds the graph in the released layout from the toolkit's own tables.
+
+        Node and edge attributes the toolkit does not load are not restored.
+        """
+        G = nx.MultiDiGraph()
+        categories = dict(self._table_rows(self._root_entities, ['category'], ['category']))
+        entity_columns = ['wikidata_label', 'wikidata_description', 'wikipedia_id', 'wikipedia_title']
+        for identifier, label, description, wikipedia_id, title in self._table_rows(
+                self._entities, entity_columns, entity_columns):
+            data = {'wikidata_label': label, 'wikidata_desc': description,
+                    'wikipedia_id': None if wikipedia_id is None else int(wikipedia_id), 'wikipedia_title': title}
+            if identifier in categories:
+                data.update(is_root=True, category=categories[identifier])
+            G.add_node(identifier, **{name: value for name, value in data.items() if value is not None})
+
+        predicates = {
+            identifier: {name: value for name, value in (('predicate_label', label), ('predicate_desc', description))
+                         if value is not None}
+            for identifier, label, description in self._table_rows(
+                self._predicates, ['predicate_label', 'predicate_desc'], ['label', 'description'])
+        }
+        summary_for = {
+            triple: root_entity
+            for root_entity, ground_truth in self._ground_truth_summaries().items() for triple in ground_truth
+        }
+        index = self.graph_index()
+        for subject, predicate, object_ in self.triple_ids_to_keys(np.arange(index.total_triples)):
+            data = {'predicate': predicate, **predicates[predicate]}
+            if (subject, predicate, object_) in summary_for:
+                data['summary_for'] = summary_for[(subject, predicate, object_)]
+            G.add_edge(subject, object_, **data)
+        return G
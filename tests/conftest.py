@@ -0,0 +1,63 @@
+import logging
+
+import pytest
+
+from wikes_toolkit.esbm.esbm_graph import ESBMGraph
+from wikes_toolkit.esbm.esbm_pandas_graph import PandasESBMGraph
+from wikes_toolkit.synthetic.synthetic_generator import generate_synthetic_dataset
+from wikes_toolkit.synthetic.synthetic_versions import WIKES_FAMILY, ESBM_FAMILY
+from wikes_toolkit.toolkit import WikESToolkit
+from wikes_toolkit.wikes.wikes_graph import WikESGraph
+from wikes_toolkit.wikes.wikes_pandas_graph import PandasWikESGraph
+
+WIKES_BACKENDS = [
+    WikESGraph,
+    PandasWikESGraph,
+    pytest.param('wikes_toolkit.wikes.wikes_polars_graph.PolarsWikESGraph', id='PolarsWikESGraph'),
+]
+ESBM_BACKENDS = [
+    ESBMGraph,
+    PandasESBMGraph,
+    pytest.param('wikes_toolkit.esbm.esbm_polars_graph.PolarsESBMGraph', id='PolarsESBMGraph'),
+]
+
+
+def _graph_class(backend):
+    """The backend class, polars ones given by name so they are skipped when polars is missing."""
+    if isinstance(backend, str):
+        pytest.importorskip('polars')
+        module, name = backend.rsplit('.', 1)
+        return getattr(__import__(module, fromlist=[name]), name)
+    return backend
+
+
+@pytest.fixture(scope='session')
+def save_path(tmp_path_factory):
+    return tmp_path_factory.mktemp('wikes_data')
+
+
+@pytest.fixture(scope='session')
+def toolkit(save_path):
+    return WikESToolkit(save_path, logging.WARNING)
+
+
+@pytest.fixture(scope='session')
+def wikes_dataset(save_path):
+    return generate_synthetic_dataset(save_path, 'parity-wikes', WIKES_FAMILY, total_entities=3_000,
+                                      total_triples=15_000, total_root_entities=60, total_predicates=40, seed=7)
+
+
+@pytest.fixture(scope='session')
+def esbm_dataset(save_path):
+    return generate_synthetic_dataset(save_path, 'parity-esbm', ESBM_FAMILY, total_entities=2_000,
+                                      total_triples=10_000, total_root_entities=40, total_predicates=30, seed=11)
+
+
+@pytest.fixture(scope='session', params=WIKES_BACKENDS)
+def wikes_backend(request):
+    return _graph_class(request.param)
+
+
+@pytest.fixture(scope='session', params=ESBM_BACKENDS)
+def esbm_backend(request):
+    return _graph_class(request.param)
@@ -0,0 +1,135 @@
+from collections import Counter, defaultdict
+
+import numpy as np
+import pytest
+
+from wikes_toolkit.base.graph_arrays import ENTITY_COLUMNS, PREDICATE_COLUMNS, TRIPLE_COLUMNS, GraphArrays
+from wikes_toolkit.esbm.esbm_graph import ESBMGraph
+from wikes_toolkit.wikes.wikes_graph import WikESGraph
+
+
+@pytest.fixture(scope='module')
+def wikes_graph(toolkit, wikes_dataset, wikes_backend):
+    return toolkit.load_graph(wikes_backend, wikes_dataset)
+
+
+@pytest.fixture(scope='module')
+def esbm_graph(toolkit, esbm_dataset, esbm_backend):
+    return toolkit.load_graph(esbm_backend, esbm_dataset)
+
+
+def _triples(G):
+    return Counter(G.triple_ids_to_keys(np.arange(G.graph_index().total_triples)))
+
+
+def _decoded_triples(arrays: GraphArrays) -> Counter:
+    triples = arrays['triples']
+    return Counter(zip(arrays.decode_entities(triples['subject']), arrays.decode_predicates(triples['predicate']),
+                       arrays.decode_entities(triples['object'])))
+
+
+def _decode(arrays: GraphArrays, column: str, values: np.ndarray) -> list:
+    if column in ENTITY_COLUMNS:
+        decoded = arrays.decode_entities(np.maximum(values, 0))
+    elif column in PREDICATE_COLUMNS:
+        decoded = arrays.decode_predicates(np.maximum(values, 0))
+    else:
+        decoded = values
+    return [None if column in ENTITY_COLUMNS + PREDICATE_COLUMNS + TRIPLE_COLUMNS and code < 0 else value
+            for code, value in zip(values.tolist(), decoded.tolist())]
+
+
+def _check_arrow(arrays: GraphArrays):
+    pytest.importorskip('pyarrow')
+    tables = arrays.to_arrow()
+    assert set(tables) == set(arrays.tables)
+    for name, columns in arrays.tables.items():
+        assert tables[name].column_names == list(columns)
+        for column, values in columns.items():
+            assert tables[name][column].to_pylist() == _decode(arrays, column, values), (name, column)
+
+
+def _ground_truth_rows(G, arrays: GraphArrays, table: str, *group_by: str):
+    """Triples of a ground-truth table, grouped by root entity (and `group_by`) in rank order."""
+    columns = arrays[table]
+    keys = G.triple_ids_to_keys(columns['triple'])
+    rows = defaultdict(list)
+    order = np.lexsort([columns['rank']] + [columns[name] for name in reversed(group_by)] + [columns['root_entity']])
+    roots = arrays.decode_entities(columns['root_entity'])
+    for row in order.tolist():
+        rows[(roots[row],) + tuple(int(columns[name][row]) for name in group_by)].append(keys[row])
+    return rows
+
+
+def test_wikes_arrays_round_trip(toolkit, wikes_dataset, wikes_graph):
+    arrays = wikes_graph.as_arrays()
+    assert _decoded_triples(arrays) == _triples(toolkit.load_graph(WikESGraph, wikes_dataset))
+    assert arrays.decode_entities(arrays['root_entities']['entity']).tolist() == wikes_graph.root_entity_ids()
+
+    rows = _ground_truth_rows(wikes_graph, arrays, 'ground_truths')
+    assert {root: rows[(root,)] for root, _ in wikes_graph.iter_ground_truths()} == \
+           dict(wikes_graph.iter_ground_truths())
+    _check_arrow(arrays)
+
+
+def test_esbm_arrays_round_trip(toolkit, esbm_dataset, esbm_graph):
+    arrays = esbm_graph.as_arrays()
+    assert _decoded_triples(arrays) == _triples(toolkit.load_graph(ESBMGraph, esbm_dataset))
+    for k in (5, 10):
+        rows = _ground_truth_rows(esbm_graph, arrays, f'gold_top_{k}', 'annotator')
+        for root, summaries in esbm_graph.iter_gold_top_k(k):
+            assert [rows[(root, annotator)] for annotator in range(len(summaries))] == \
+                   [list(summary) for summary in summaries]
+    _check_arrow(arrays)
+
+
+def test_arrow_maps_missing_codes_to_nulls():
+    pa = pytest.importorskip('pyarrow')
+    arrays = GraphArrays(np.array(['Q1', 'Q2'], dtype=object), np.array(['P1'], dtype=object), {
+        'ground_truths': {
+            'root_entity': np.array([0, -1, 1], dtype=np.int32),
+            'rank': np.array([0, 1, 2], dtype=np.int32),
+            'triple': np.array([3, -1, 0], dtype=np.int32),
+        },
+        'triples': {'subject': np.array([0]), 'predicate': np.array([-1]), 'object': np.array([1])},
+    })
+    tables = arrays.to_arrow()
+    ground_truths = tables['ground_truths']
+    assert ground_truths['root_entity'].to_pylist() == ['Q1', None, 'Q2']
+    assert ground_truths['triple'].to_pylist() == [3, None, 0]
+    assert ground_truths['rank'].null_count == 0
+    assert tables['triples']['predicate'].to_pylist() == [None]
+    assert pa.types.is_dictionary(ground_truths['root_entity'].type)
+    for table in tables.values():
+        table.validate(full=True)
+
+
+@pytest.mark.parametrize('kind', ['adjacency', 'incidence', 'per_predicate'])
+def test_sparse_round_trip(wikes_graph, kind):
+    pytest.importorskip('scipy')
+    index = wikes_graph.graph_index()
+    entity_ids = index.entity_ids.to_numpy()
+    pairs = Counter((s, o) for s, _, o in _triples(wikes_graph).elements())
+    matrix = wikes_graph.to_sparse(kind)
+
+    if kind == 'adjacency':
+        assert matrix.shape == (index.total_entities, index.total_entities)
+        coo = matrix.tocoo()
+        assert dict(zip(zip(entity_ids[coo.row], entity_ids[coo.col]), coo.data.astype(int).tolist())) == pairs
+    elif kind == 'incidence':
+        assert matrix.shape == (index.total_entities, index.total_triples)
+        coo = matrix.tocoo()
+        endpoints = defaultdict(set)
+        for row, column in zip(coo.row.tolist(), coo.col.tolist()):
+            endpoints[column].add(entity_ids[row])
+        keys = wikes_graph.triple_ids_to_keys(np.arange(index.total_triples))
+        assert all(endpoints[triple_id] == {s, o} for triple_id, (s, _, o) in enumerate(keys))
+        assert np.array_equal(np.asarray(matrix.sum(axis=0)).ravel(), np.full(index.total_triples, 2))
+    else:
+        assert len(matrix) == index.total_predicates
+        for predicate, predicate_matrix in zip(index.predicate_ids, matrix):
+            coo = predicate_matrix.tocoo()
+            expected = Counter((s, o) for s, p, o in _triples(wikes_graph).elements() if p == predicate)
+            assert dict(zip(zip(entity_ids[coo.row], entity_ids[coo.col]), coo.data.astype(int).tolist())) == \
+                   expected
+        assert (sum(matrix) != wikes_graph.to_sparse('adjacency')).nnz == 0
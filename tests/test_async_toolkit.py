@@ -0,0 +1,196 @@
+import asyncio
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from wikes_toolkit.async_toolkit import AsyncWikESToolkit
+from wikes_toolkit.wikes.wikes_versions import WikESVersions
+
+SMALL = WikESVersions.V1.WikiLitArt.SMALL
+MEDIUM = WikESVersions.V1.WikiLitArt.MEDIUM
+CHUNK_SIZE = 16
+
+
+class GatedBody(io.BytesIO):
+    """Response body that stalls after its first chunk until `gate` is set."""
+
+    def __init__(self, body: bytes, gate: threading.Event):
+        super().__init__(body)
+        self.gate = gate
+        self.started = threading.Event()
+
+    def read(self, size=-1):
+        if self.tell() > 0:
+            self.started.set()
+            self.gate.wait(10)
+        return super().read(size)
+
+
+class GatedWrites(ThreadPoolExecutor):
+    """Executor whose file writes wait for `gate`, standing in for a slow disk."""
+
+    def __init__(self, gate: threading.Event, max_workers: int):
+        super().__init__(max_workers=max_workers)
+        self.gate = gate
+
+    def submit(self, fn, /, *args, **kwargs):
+        if getattr(fn, '__name__', None) == 'write':
+            write = fn
+
+            def fn(*args, **kwargs):
+                self.gate.wait(10)
+                return write(*args, **kwargs)
+
+        return super().submit(fn, *args, **kwargs)
+
+
+def _body(dataset):
+    return dataset.value.encode() * 64
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Serves `_body(dataset)` for every dataset url, or the bodies and status codes set on it."""
+    calls = []
+    bodies = {}
+    status_codes = {}
+
+    def get(url, stream=False):
+        calls.append(url)
+        response = requests.Response()
+        response.url = url
+        response.status_code = status_codes.get(url, 200)
+        response.reason = 'Not Found' if response.status_code == 404 else 'OK'
+        response.raw = bodies.get(url) or io.BytesIO(
+            next(_body(dataset) for dataset in (SMALL, MEDIUM) if dataset.get_dataset_url() == url)
+        )
+        return response
+
+    monkeypatch.setattr(requests, 'get', get)
+    get.calls = calls
+    get.bodies = bodies
+    get.status_codes = status_codes
+    return get
+
+
+def _toolkit(tmp_path, **kwargs):
+    return AsyncWikESToolkit(tmp_path, logging.WARNING, chunk_size=CHUNK_SIZE, **kwargs)
+
+
+def test_prefetch_downloads_each_dataset_once(tmp_path, server):
+    async def prefetch():
+        async with _toolkit(tmp_path) as toolkit:
+            return await toolkit.prefetch(SMALL, [SMALL, MEDIUM], MEDIUM)
+
+    paths = asyncio.run(prefetch())
+    assert sorted(server.calls) == sorted([SMALL.get_dataset_url(), MEDIUM.get_dataset_url()])
+    assert paths[0] == paths[1] and paths[2] == paths[3]
+    assert paths[0].read_bytes() == _body(SMALL)
+    assert paths[2].read_bytes() == _body(MEDIUM)
+
+    assert asyncio.run(prefetch()) == paths
+    assert len(server.calls) == 2
+
+
+def test_cancelling_one_waiter_keeps_shared_download(tmp_path, server):
+    gate = threading.Event()
+    body = server.bodies[SMALL.get_dataset_url()] = GatedBody(_body(SMALL), gate)
+
+    async def download():
+        async with _toolkit(tmp_path) as toolkit:
+            first = asyncio.ensure_future(toolkit.download(SMALL))
+            second = asyncio.ensure_future(toolkit.download(SMALL))
+            await asyncio.get_running_loop().run_in_executor(None, body.started.wait, 10)
+            first.cancel()
+            await asyncio.sleep(0)
+            gate.set()
+            with pytest.raises(asyncio.CancelledError):
+                await first
+            return await second
+
+    assert asyncio.run(download()).read_bytes() == _body(SMALL)
+    assert len(server.calls) == 1
+
+
+def test_cancelling_every_waiter_stops_download(tmp_path, server):
+    gate = threading.Event()
+    body = server.bodies[SMALL.get_dataset_url()] = GatedBody(_body(SMALL), gate)
+
+    async def download():
+        async with _toolkit(tmp_path) as toolkit:
+            waiters = [asyncio.ensure_future(toolkit.download(SMALL)) for _ in range(2)]
+            await asyncio.get_running_loop().run_in_executor(None, body.started.wait, 10)
+            for waiter in waiters:
+                waiter.cancel()
+            for waiter in waiters:
+                with pytest.raises(asyncio.CancelledError):
+                    await waiter
+            await asyncio.sleep(0.05)
+            assert not toolkit._downloads
+            gate.set()
+            return toolkit._toolkit
+
+    toolkit = asyncio.run(download())
+    assert toolkit.locate(SMALL) is None
+    assert not toolkit.download_target(SMALL).exists()
+
+
+def test_slow_disk_bounds_pending_chunks(tmp_path, server):
+    produced = []
+    gate = threading.Event()
+
+    class CountingBody(io.BytesIO):
+        def read(self, size=-1):
+            produced.append(size)
+            return super().read(size)
+
+    server.bodies[SMALL.get_dataset_url()] = CountingBody(_body(SMALL))
+
+    async def download():
+        async with _toolkit(tmp_path, max_concurrent_downloads=1, max_pending_chunks=2) as toolkit:
+            toolkit._io_executor = GatedWrites(gate, max_workers=2)
+            task = asyncio.ensure_future(toolkit.download(SMALL))
+            await asyncio.sleep(0.2)
+            pending = len(produced)
+            gate.set()
+            return pending, await task
+
+    pending, path = asyncio.run(download())
+    assert len(_body(SMALL)) // CHUNK_SIZE > 10
+    assert pending <= 2 + 3
+    assert path.read_bytes() == _body(SMALL)
+
+
+def test_http_error_is_raised_and_leaves_no_partial_file(tmp_path, server):
+    server.status_codes[SMALL.get_dataset_url()] = 404
+
+    async def download():
+        async with _toolkit(tmp_path) as toolkit:
+            try:
+                await toolkit.download(SMALL)
+            finally:
+                assert not toolkit._toolkit.download_target(SMALL).exists()
+
+    with pytest.raises(requests.HTTPError, match='404'):
+        asyncio.run(download())
+
+
+def test_close_keeps_caller_executor(tmp_path):
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    async def run():
+        async with _toolkit(tmp_path, executor=executor) as toolkit:
+            return await toolkit._run(sum, [1, 2])
+
+    assert asyncio.run(run()) == 3
+    assert executor.submit(sum, [3, 4]).result() == 7
+    executor.shutdown()
+
+    toolkit = _toolkit(tmp_path)
+    toolkit.close()
+    with pytest.raises(RuntimeError):
+        toolkit._executor.submit(sum, [])
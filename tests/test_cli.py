@@ -0,0 +1,34 @@
+import io
+
+import pytest
+import requests
+
+from wikes_toolkit import cli
+
+
+@pytest.mark.parametrize('error', [requests.ConnectionError('connection refused'), OSError('disk full')])
+def test_main_reports_download_and_io_errors(monkeypatch, capsys, error):
+    def fetch(args):
+        raise error
+
+    monkeypatch.setattr(cli, 'fetch', fetch)
+    assert cli.main(['fetch', 'anything']) == 1
+    assert capsys.readouterr().err.strip().endswith(str(error))
+
+
+@pytest.mark.parametrize('command', ['fetch', 'convert'])
+def test_main_reports_http_errors(monkeypatch, capsys, tmp_path, command):
+    def get(url, stream=False):
+        response = requests.Response()
+        response.url = url
+        response.status_code = 404
+        response.reason = 'Not Found'
+        response.raw = io.BytesIO(b'')
+        return response
+
+    monkeypatch.setattr(requests, 'get', get)
+    assert cli.main(['--save-path', str(tmp_path), command, 'WikiLitArt-s']) == 1
+    error = capsys.readouterr().err
+    assert error.startswith(f"wikes {command}: 404 Client Error: Not Found")
+    assert 'Traceback' not in error
+    assert not any(tmp_path.rglob('*.pkl*'))
@@ -0,0 +1,94 @@
+"""`fetch_entities`, `fetch_predicates` and `fetch_triples` agree on every backend, missing items included."""
+import dataclasses
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from wikes_toolkit.esbm.esbm_graph import ESBMGraph
+from wikes_toolkit.wikes.wikes_graph import WikESGraph
+
+MISSING_ENTITY = 'Q-missing'
+
+
+def _rows(rows, missing: np.ndarray) -> list:
+    """Rows of any backend as tuples of their values, identifier first, and `None` for the missing ones."""
+    if isinstance(rows, list):
+        assert [row is None for row in rows] == missing.tolist()
+        return [None if row is None else tuple(getattr(row, field.name) for field in dataclasses.fields(row)
+                                               if field.name != 'str_formatter') for row in rows]
+    if isinstance(rows, pd.DataFrame):
+        values = [(label, *row) for label, row in zip(rows.index, rows.to_numpy().tolist())]
+    else:
+        values = rows.rows()
+    values = [tuple(None if pd.isna(value) else value for value in row) for row in values]
+    for row, is_missing in zip(values, missing.tolist()):
+        assert all(value is None for value in row[1:]) if is_missing else row[0] is not None
+    return [None if is_missing else row for row, is_missing in zip(values, missing.tolist())]
+
+
+def _triple_keys(rows, missing: np.ndarray) -> list:
+    if isinstance(rows, list):
+        return [None if row is None else row.key() for row in rows]
+    if isinstance(rows, pd.DataFrame):
+        assert ((rows.index.to_numpy() < 0) == missing).all()
+    keys = list(zip(*(rows[column].to_list() for column in ('subject', 'predicate', 'object'))))
+    return [None if is_missing else key for key, is_missing in zip(keys, missing.tolist())]
+
+
+def _queries(reference):
+    entity_ids = reference.graph_index().entity_ids.tolist()
+    predicate_ids = reference.graph_index().predicate_ids.tolist()
+    triples = reference.triple_ids_to_keys(np.arange(0, reference.graph_index().total_triples, 997))
+    entities = [entity_ids[5], MISSING_ENTITY, entity_ids[0], entity_ids[5], entity_ids[-1]]
+    predicates = [predicate_ids[-1], 'P-missing', predicate_ids[0]]
+    subject, predicate, object_ = triples[0]
+    triples = triples + [(subject, predicate, subject), (MISSING_ENTITY, predicate, object_), triples[1]]
+    return entities, predicates, triples
+
+
+def _fetch(G, entities, predicates, triples) -> dict:
+    fetched = {}
+    for name, rows, missing in [
+        ('entities', *G.fetch_entities(entities)),
+        ('predicates', *G.fetch_predicates(predicates)),
+    ]:
+        fetched[name] = (_rows(rows, missing), missing.tolist())
+    fetched['triples'] = (_triple_keys(*G.fetch_triples(triples)), G.fetch_triples(triples)[1].tolist())
+    frame = pd.DataFrame(triples, columns=['subject', 'predicate', 'object'])
+    fetched['triple_frame'] = (_triple_keys(*G.fetch_triples(frame)), G.fetch_triples(frame)[1].tolist())
+    return fetched
+
+
+def _check_parity(toolkit, dataset, reference_class, backend):
+    reference = toolkit.load_graph(reference_class, dataset)
+    entities, predicates, triples = _queries(reference)
+    expected = _fetch(reference, entities, predicates, triples)
+    assert expected['entities'][1] == [False, True, False, False, False]
+    assert expected['predicates'][1] == [False, True, False]
+    assert expected['triples'][1] == [False] * (len(triples) - 3) + [True, True, False]
+    assert [row[0] for row in expected['entities'][0] if row] == [entities[0]] + entities[2:]
+    assert expected['triples'][0][:-3] == triples[:-3]
+    assert expected['triple_frame'] == expected['triples']
+
+    G = toolkit.load_graph(backend, dataset)
+    assert _fetch(G, entities, predicates, triples) == expected
+    for fetch in (G.fetch_entities, G.fetch_predicates, G.fetch_triples):
+        rows, missing = fetch([])
+        assert len(rows) == 0 and missing.shape == (0,)
+
+
+def test_wikes_fetch_parity(toolkit, wikes_dataset, wikes_backend):
+    _check_parity(toolkit, wikes_dataset, WikESGraph, wikes_backend)
+
+
+def test_esbm_fetch_parity(toolkit, esbm_dataset, esbm_backend):
+    _check_parity(toolkit, esbm_dataset, ESBMGraph, esbm_backend)
+
+
+def test_fetch_accepts_backend_rows(toolkit, wikes_dataset, wikes_backend):
+    G = toolkit.load_graph(wikes_backend, wikes_dataset)
+    root_entity_ids = G.root_entity_ids()[:3]
+    rows, missing = G.fetch_entities([G.fetch_entity(identifier) for identifier in root_entity_ids])
+    assert not missing.any()
+    assert [row[0] for row in _rows(rows, missing)] == root_entity_ids
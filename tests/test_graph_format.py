@@ -0,0 +1,18 @@
+import networkx as nx
+
+from wikes_toolkit.base import graph_format
+
+
+def test_mixed_bool_and_number_columns(tmp_path):
+    G = nx.MultiDiGraph()
+    G.add_node('a', flag=True, weight=1.5)
+    G.add_node('b', flag=2, weight=False)
+    G.add_node('c', label='c')
+    G.add_edge('a', 'b', predicate='p', order=True)
+    G.add_edge('b', 'c', predicate='p', order=3)
+
+    path = graph_format.write_graph(G, tmp_path / 'mixed.npz')
+    H = graph_format.read_graph(path)
+    assert dict(H.nodes(data=True)) == {'a': {'flag': 1, 'weight': 1.5}, 'b': {'flag': 2, 'weight': 0.0},
+                                        'c': {'label': 'c'}}
+    assert [data['order'] for _, _, data in H.edges(data=True)] == [1, 3]
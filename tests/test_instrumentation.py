@@ -0,0 +1,122 @@
+import json
+import threading
+import time
+
+import pytest
+
+from wikes_toolkit.base import instrumentation
+from wikes_toolkit.base.instrumentation import (
+    Instrumentation, InMemoryExporter, JsonLinesExporter, PrometheusTextExporter, RecordingInstrumentation
+)
+from wikes_toolkit.wikes.wikes_graph import WikESGraph
+
+
+@pytest.fixture
+def recorded():
+    exporter = InMemoryExporter()
+    previous = instrumentation.set_instrumentation(RecordingInstrumentation(exporter))
+    yield exporter
+    instrumentation.set_instrumentation(previous)
+
+
+def test_no_op_by_default():
+    assert isinstance(instrumentation.get_instrumentation(), Instrumentation)
+    assert not instrumentation.get_instrumentation().enabled
+    with instrumentation.span('anything', size=1) as span:
+        assert span is None
+    instrumentation.count('anything')
+
+
+def test_spans_nest_and_time(recorded):
+    before = time.time()
+    with instrumentation.span('outer', dataset='tiny'):
+        with instrumentation.span('inner'):
+            time.sleep(0.01)
+        with instrumentation.span('sibling'):
+            pass
+    after = time.time()
+
+    inner, sibling, outer = recorded.spans
+    assert [span.name for span in recorded.spans] == ['inner', 'sibling', 'outer']
+    assert (inner.parent, sibling.parent, outer.parent) == ('outer', 'outer', None)
+    assert outer.attributes == {'dataset': 'tiny'}
+    assert inner.duration >= 0.01
+    assert outer.duration >= inner.duration + sibling.duration
+    assert before - 1e-3 <= outer.start <= inner.start + 1e-3
+    assert inner.start + inner.duration <= after + 1e-3
+
+
+def test_span_records_errors_and_parents_per_thread(recorded):
+    with pytest.raises(KeyError):
+        with instrumentation.span('failing'):
+            raise KeyError('missing')
+    assert recorded.spans[-1].attributes == {'error': 'KeyError'}
+
+    def worker():
+        with instrumentation.span('worker'):
+            pass
+
+    with instrumentation.span('main'):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+    assert next(span for span in recorded.spans if span.name == 'worker').parent is None
+
+
+def test_counters_add_up(recorded):
+    instrumentation.count('rows')
+    instrumentation.count('rows', 4, table='edges')
+    instrumentation.count('bytes', 10)
+    assert recorded.counters == {'rows': 5, 'bytes': 10}
+
+
+def test_toolkit_spans(recorded, toolkit, wikes_dataset):
+    toolkit.load_graph(WikESGraph, wikes_dataset)
+    names = {span.name: span for span in recorded.spans}
+    assert {'toolkit.unpickle', 'toolkit.initialize'} <= set(names)
+    assert names['toolkit.unpickle'].attributes['dataset'] == wikes_dataset.value
+
+
+def test_json_lines_exporter(tmp_path):
+    path = tmp_path / 'events.jsonl'
+    exporter = JsonLinesExporter(path)
+    recording = RecordingInstrumentation(exporter)
+    with recording.span('load', path=tmp_path):
+        recording.count('rows', 3, table='nodes')
+    recording.flush()
+    exporter.close()
+
+    counter, span = [json.loads(line) for line in path.read_text().splitlines()]
+    assert counter == {'type': 'counter', 'name': 'rows', 'value': 3, 'attributes': {'table': 'nodes'}}
+    assert span['type'] == 'span' and span['name'] == 'load' and span['parent'] is None
+    assert span['attributes'] == {'path': str(tmp_path)}
+    assert span['duration'] >= 0
+
+
+def test_prometheus_exporter(tmp_path):
+    path = tmp_path / 'wikes.prom'
+    exporter = PrometheusTextExporter(path)
+    recording = RecordingInstrumentation(exporter)
+    recording.flush()
+    assert path.read_text() == ''
+
+    recording.count('toolkit.downloaded_bytes', 10, dataset='a')
+    recording.count('toolkit.downloaded_bytes', 5, dataset='a')
+    recording.count('toolkit.downloaded_bytes', 1, dataset='say "b"\n')
+    recording.flush()
+    assert '# TYPE wikes_span_seconds' not in path.read_text()
+
+    for _ in range(2):
+        with recording.span('graph.load'):
+            pass
+    recording.flush()
+    lines = path.read_text().splitlines()
+    assert all(line.split()[-1] in ('summary', 'counter') for line in lines if line.startswith('# TYPE'))
+    assert lines[0] == '# TYPE wikes_span_seconds summary'
+    assert lines[2] == 'wikes_span_seconds_count{span="graph.load"} 2'
+    assert lines[3:] == [
+        '# TYPE wikes_toolkit_downloaded_bytes_total counter',
+        'wikes_toolkit_downloaded_bytes_total{dataset="a"} 15',
+        'wikes_toolkit_downloaded_bytes_total{dataset="say \\"b\\"\\n"} 1',
+    ]
+    assert not path.with_suffix('.prom.tmp').exists()
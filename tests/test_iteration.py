@@ -0,0 +1,35 @@
+import pytest
+
+from wikes_toolkit.wikes.wikes_graph import WikESGraph
+from wikes_toolkit.wikes.wikes_pandas_graph import PandasWikESGraph
+
+
+def _backends():
+    yield WikESGraph
+    yield PandasWikESGraph
+    yield pytest.param('polars', id='PolarsWikESGraph')
+
+
+@pytest.fixture(params=list(_backends()))
+def graph(request, toolkit, wikes_dataset):
+    graph_class = request.param
+    if graph_class == 'polars':
+        pytest.importorskip('polars')
+        from wikes_toolkit.wikes.wikes_polars_graph import PolarsWikESGraph as graph_class
+    return toolkit.load_graph(graph_class, wikes_dataset)
+
+
+def test_iter_items_without_batch_size(graph):
+    triples = list(graph.iter_triples())
+    assert len(triples) == graph.total_triples()
+    assert type(triples[0]) is type(graph.fetch_triple(triples[0]))
+    root_entity = next(iter(graph.iter_root_entities()))
+    assert type(root_entity) is type(graph.fetch_root_entity(graph.root_entity_ids()[0]))
+    assert sum(len(batch) for batch in graph.iter_triples(batch_size=1_000)) == graph.total_triples()
+
+
+def test_iter_ground_truths_unknown_root(toolkit, wikes_dataset):
+    G = toolkit.load_graph(WikESGraph, wikes_dataset)
+    del G._ground_truths[G.root_entity_ids()[0]]
+    with pytest.raises(ValueError):
+        list(G.iter_ground_truths())
@@ -0,0 +1,99 @@
+"""Parity of the metric engine with the reference evaluators built on `wikes_toolkit.base.evaluate`."""
+import numpy as np
+import pytest
+
+from wikes_toolkit import baselines
+from wikes_toolkit.base import metrics
+from wikes_toolkit.esbm.esbm_eval import ESBMSummaryEvaluator
+from wikes_toolkit.wikes.wikes_eval import WikESSummaryEvaluator
+from wikes_toolkit.wikes.wikes_graph import WikESGraph
+
+
+def _repeated_pairs(predictions) -> bool:
+    return any(len({(s, o) for s, _, o in triples}) < len(triples) for triples in predictions.values())
+
+
+@pytest.fixture(scope='module')
+def wikes_graph(toolkit, wikes_dataset, wikes_backend):
+    G = toolkit.load_graph(wikes_backend, wikes_dataset)
+    baselines.rank_candidates(G, baselines.DEGREE, top_k=30)
+    return G
+
+
+@pytest.fixture(scope='module')
+def esbm_graph(toolkit, esbm_dataset, esbm_backend):
+    G = toolkit.load_graph(esbm_backend, esbm_dataset)
+    baselines.rank_candidates(G, baselines.DEGREE, top_k=10)
+    return G
+
+
+def _wikes_evaluator(G) -> WikESSummaryEvaluator:
+    return WikESSummaryEvaluator(G.root_entity_ids(), G.all_ground_truth_triple_ids(), G.predications())
+
+
+def _esbm_evaluator(G, k: int) -> ESBMSummaryEvaluator:
+    return ESBMSummaryEvaluator(G.root_entity_ids(), G.all_gold_top_k(k), G.predications(), k)
+
+
+def test_predictions_repeat_subject_object_pairs(wikes_graph, esbm_graph):
+    """The parity tests below only cover repeated no_rel hits if the rankings contain them."""
+    assert _repeated_pairs(wikes_graph.predications())
+    assert _repeated_pairs(esbm_graph.predications())
+
+
+@pytest.mark.parametrize('k', [None, 5, 10])
+@pytest.mark.parametrize('no_rel', [False, True])
+def test_wikes_scores_match_reference(wikes_graph, k, no_rel):
+    evaluator = _wikes_evaluator(wikes_graph)
+    np.testing.assert_allclose(wikes_graph.entity_scores(metrics.F1, k, no_rel),
+                               evaluator.entity_f1_scores(k, no_rel))
+    np.testing.assert_allclose(wikes_graph.entity_scores(metrics.MAP, k, no_rel),
+                               evaluator.entity_map_scores(k, no_rel))
+    assert wikes_graph.f1_score(k, no_rel) == pytest.approx(evaluator.evaluate_f1(k, no_rel))
+    assert wikes_graph.map_score(k, no_rel) == pytest.approx(evaluator.evaluate_map(k, no_rel))
+
+
+@pytest.mark.parametrize('k', [5, 10])
+@pytest.mark.parametrize('no_rel', [False, True])
+def test_esbm_scores_match_reference(esbm_graph, k, no_rel):
+    evaluator = _esbm_evaluator(esbm_graph, k)
+    np.testing.assert_allclose(esbm_graph.entity_scores(metrics.F1, k, no_rel), evaluator.entity_f1_scores(no_rel))
+    np.testing.assert_allclose(esbm_graph.entity_scores(metrics.MAP, k, no_rel), evaluator.entity_map_scores(no_rel))
+    assert esbm_graph.f1_score(k, no_rel) == pytest.approx(evaluator.evaluate_f1(no_rel))
+    assert esbm_graph.map_score(k, no_rel) == pytest.approx(evaluator.evaluate_map(no_rel))
+
+
+def test_rescored_roots_match_reference(toolkit, wikes_dataset):
+    G = toolkit.load_graph(WikESGraph, wikes_dataset)
+    baselines.rank_candidates(G, baselines.DEGREE, top_k=30)
+    G.f1_score(10, True), G.map_score(10, True)
+    rng = np.random.default_rng(0)
+    for root_entity in rng.choice(G.root_entity_ids(), 5, replace=False).tolist():
+        candidates = G.candidate_triple_ids(root_entity)
+        G.mark_triple_ids_as_summaries(root_entity, rng.choice(candidates, min(10, len(candidates)), replace=False),
+                                       replace=True)
+    evaluator = _wikes_evaluator(G)
+    assert G.f1_score(10, True) == pytest.approx(evaluator.evaluate_f1(10, True))
+    assert G.map_score(10, True) == pytest.approx(evaluator.evaluate_map(10, True))
+
+
+def test_map_distinct_counts_gold_items_once(wikes_graph):
+    scores = wikes_graph.entity_metrics([metrics.MAP, metrics.MAP_DISTINCT], 10, no_rel=True)
+    assert (scores[metrics.MAP_DISTINCT] <= scores[metrics.MAP] + 1e-12).all()
+    assert metrics.MAP_DISTINCT not in metrics.DEFAULT_METRICS
+
+
+def test_hit_matrix_matches_count_repeats():
+    matrix = metrics.build_hit_matrix([np.array([1, 2])], [np.array([1, 1, 3, 2])], np.array([4]))
+    assert matrix.hits.tolist() == [[True, False, False, True]]
+    assert matrix.matches.tolist() == [[True, True, False, True]]
+    assert metrics.map_scores(matrix)[0] == pytest.approx((1 + 1 + 3 / 4) / 2)
+    assert metrics.map_distinct_scores(matrix)[0] == pytest.approx((1 + 2 / 4) / 2)
+
+
+def test_ground_truth_labels_are_binary(esbm_graph):
+    labels = esbm_graph.ground_truth_labels(5)
+    assert set(np.unique(labels).tolist()) == {0, 1}
+    gold = {triple for summaries in esbm_graph.all_gold_top_k(5).values() for summary in summaries
+            for triple in summary}
+    assert labels.sum() == np.count_nonzero(esbm_graph.triple_keys_to_ids(list(gold)) >= 0)
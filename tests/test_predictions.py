@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+
+from wikes_toolkit.wikes.wikes_graph import WikESGraph
+
+
+@pytest.fixture
+def graph(toolkit, wikes_dataset):
+    return toolkit.load_graph(WikESGraph, wikes_dataset)
+
+
+def _write_predictions(path, G, root_entities, per_root: int, offset: int = 0):
+    rows = [
+        {'root_entity': root_entity, 'subject': s, 'predicate': p, 'object': o, 'rank': rank}
+        for root_entity in root_entities
+        for rank, (s, p, o) in enumerate(
+            G.triple_ids_to_keys(G.candidate_triple_ids(root_entity)[offset:offset + per_root]))
+    ]
+    pd.DataFrame(rows).to_json(path, orient='records', lines=True)
+    return rows
+
+
+def test_load_predictions_replace(graph, tmp_path):
+    roots = graph.root_entity_ids()
+    _write_predictions(tmp_path / 'first.jsonl', graph, roots[:3], 2)
+    _write_predictions(tmp_path / 'second.jsonl', graph, roots[1:2], 2, offset=2)
+
+    graph.load_predictions(tmp_path / 'first.jsonl')
+    first = {root: list(triples) for root, triples in graph.predications().items() if triples}
+    graph.load_predictions(tmp_path / 'second.jsonl', replace=False)
+    summaries = graph.predications()
+    assert summaries[roots[0]] == first[roots[0]]
+    assert summaries[roots[2]] == first[roots[2]]
+    assert summaries[roots[1]][:2] == first[roots[1]] and len(summaries[roots[1]]) == 4
+
+    graph.load_predictions(tmp_path / 'second.jsonl')
+    assert {root for root, triples in graph.predications().items() if triples} == {roots[1]}
+    assert len(graph.predications()[roots[1]]) == 2
+
+
+def test_mark_triple_ids_appends_by_default(graph):
+    root_entity = graph.root_entity_ids()[0]
+    candidates = graph.candidate_triple_ids(root_entity)
+    graph.mark_triple_ids_as_summaries(root_entity, candidates[:2], replace=True)
+    graph.mark_all_triple_ids_as_summaries({root_entity: candidates[1:3]})
+    graph.mark_triple_ids_as_summaries(root_entity, candidates[3:4])
+    assert graph.predications()[root_entity] == graph.triple_ids_to_keys(candidates[:4])
+    graph.mark_all_triple_ids_as_summaries({root_entity: candidates[:1]}, replace=True)
+    assert graph.predications()[root_entity] == graph.triple_ids_to_keys(candidates[:1])
@@ -0,0 +1,30 @@
+import pytest
+
+from wikes_toolkit.esbm.esbm_graph import ESBMGraph
+from wikes_toolkit.esbm.esbm_pandas_graph import PandasESBMGraph
+
+
+def _edges(G):
+    return sorted((u, v, sorted(data.items())) for u, v, data in G.edges(data=True))
+
+
+def _gold_sets(G, k):
+    return {root: [set(summary) for summary in summaries if summary] for root, summaries in G.iter_gold_top_k(k)}
+
+
+@pytest.mark.parametrize('graph_class', [ESBMGraph, PandasESBMGraph])
+def test_esbm_rebuilds_released_graph(toolkit, esbm_dataset, graph_class):
+    G = toolkit.load_graph(graph_class, esbm_dataset, keep_networkx=False)
+    rebuilt = G.networkx_graph()
+    original = toolkit.load_graph(graph_class, esbm_dataset).networkx_graph()
+
+    assert list(rebuilt.nodes) == list(original.nodes)
+    assert {node: {name: value for name, value in data.items() if name != 'label'}
+            for node, data in original.nodes(data=True)} == dict(rebuilt.nodes(data=True))
+    if graph_class is PandasESBMGraph:
+        assert _edges(rebuilt) == _edges(original)
+
+    reloaded = graph_class(rebuilt, esbm_dataset)
+    assert reloaded.root_entity_ids() == G.root_entity_ids()
+    for k in (5, 10):
+        assert _gold_sets(reloaded, k) == _gold_sets(G, k)
@@ -0,0 +1,13 @@
+import numpy as np
+
+from wikes_toolkit import significance
+
+
+def test_randomization_test_reproducible():
+    rng = np.random.default_rng(3)
+    scores_a, scores_b = rng.random(80), rng.random(80)
+    result = significance.randomization_test(scores_a, scores_b, resamples=1_200, seed=5)
+    assert significance.randomization_test(scores_a, scores_b, resamples=1_200, seed=5) == result
+    assert significance.randomization_test(scores_a, scores_b, resamples=1_200, seed=5, processes=2) == result
+    assert significance.randomization_test(scores_a, scores_b, resamples=1_200, seed=6) != result
+
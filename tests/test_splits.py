@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from wikes_toolkit.base.graph_split import GraphSplit
+from wikes_toolkit.esbm.esbm_graph import ESBMGraph
+from wikes_toolkit.esbm.esbm_pandas_graph import PandasESBMGraph
+from wikes_toolkit.wikes.wikes_graph import WikESGraph
+from wikes_toolkit.wikes.wikes_pandas_graph import PandasWikESGraph
+
+
+def _splits(G, dataset):
+    roots = G.root_entity_ids()
+    return GraphSplit(G, dataset, roots[::2]), GraphSplit(G, dataset, roots[1::2])
+
+
+@pytest.fixture(params=[WikESGraph, PandasWikESGraph])
+def wikes_splits(request, toolkit, wikes_dataset):
+    return _splits(toolkit.load_graph(request.param, wikes_dataset), wikes_dataset)
+
+
+@pytest.fixture(params=[ESBMGraph, PandasESBMGraph])
+def esbm_splits(request, toolkit, esbm_dataset):
+    return _splits(toolkit.load_graph(request.param, esbm_dataset), esbm_dataset)
+
+
+def test_load_predictions_keeps_other_splits(wikes_splits, tmp_path):
+    train, test = wikes_splits
+    G = train.graph
+    rows = [
+        {'root_entity': root_entity, 'subject': s, 'predicate': p, 'object': o}
+        for root_entity in G.root_entity_ids()
+        for s, p, o in G.triple_ids_to_keys(G.candidate_triple_ids(root_entity)[:2])
+    ]
+    pd.DataFrame(rows).to_json(tmp_path / 'all.jsonl', orient='records', lines=True)
+    G.mark_all_triple_ids_as_summaries({root: G.candidate_triple_ids(root)[2:3] for root in test.root_entity_ids()},
+                                       replace=True)
+    marked = {root: list(G.predications()[root]) for root in test.root_entity_ids()}
+
+    report = train.load_predictions(tmp_path / 'all.jsonl')
+    assert report.root_entities == len(train)
+    assert report.outside_mask == sum(row['root_entity'] in set(test.root_entity_ids()) for row in rows)
+    assert {root: G.predications()[root] for root in test.root_entity_ids()} == marked
+    assert all(len(G.predications()[root]) == 2 for root in train.root_entity_ids())
+
+
+def test_wikes_ground_truths_restricted(wikes_splits):
+    train, test = wikes_splits
+    other = test.root_entity_ids()[0]
+    assert list(train.all_ground_truth_triple_ids()) == train.root_entity_ids()
+    assert [root for root, _ in train.iter_ground_truths(5)] == train.root_entity_ids()
+    assert len(train.root_entities()) == len(train)
+    with pytest.raises(ValueError):
+        train.ground_truths(other)
+    with pytest.raises(ValueError):
+        train.candidate_triple_ids(other)
+    with pytest.raises(ValueError):
+        train.mark_triple_ids_as_summaries(other, [])
+    with pytest.raises(AttributeError):
+        train.as_arrays()
+    labels = train.ground_truth_labels() + test.ground_truth_labels()
+    assert np.array_equal(labels > 0, train.graph.ground_truth_labels() > 0)
+
+
+def test_esbm_gold_restricted(esbm_splits):
+    train, test = esbm_splits
+    other = test.root_entity_ids()[0]
+    assert list(train.all_gold_top_k(5)) == train.root_entity_ids()
+    assert train.gold_tensor(5).codes.shape[0] == len(train)
+    with pytest.raises(ValueError):
+        train.gold_top_5(other, 0)
+    agreement = train.annotator_agreement(5)
+    assert 0.0 <= agreement['jaccard'] <= 1.0
+
+
+def test_subgraph_restricted(wikes_splits):
+    train, test = wikes_splits
+    assert [subgraph.entity_identifiers[0] for subgraph in train.subgraph()] == train.root_entity_ids()
+    root = train.root_entity_ids()[0]
+    assert train.subgraph(root, hops=2, max_edges=5)[0].entity_identifiers[0] == root
+    with pytest.raises(ValueError):
+        train.subgraph([root, test.root_entity_ids()[0]])
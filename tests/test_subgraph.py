@@ -0,0 +1,82 @@
+"""k-hop neighbourhoods of `BaseESGraph.subgraph` against networkx's `ego_graph`."""
+import networkx as nx
+import numpy as np
+import pytest
+
+from wikes_toolkit.wikes.wikes_graph import WikESGraph
+
+ROOTS = 8
+
+
+@pytest.fixture(scope='module')
+def reference(toolkit, wikes_dataset):
+    """The released multigraph, undirected for `ego_graph`, and its (subject, predicate, object) triples."""
+    G = toolkit.load_graph(WikESGraph, wikes_dataset).networkx_graph()
+    return nx.MultiGraph(G), [(s, data['predicate'], o) for s, o, data in G.edges(data=True)]
+
+
+@pytest.fixture(scope='module')
+def graph(toolkit, wikes_dataset, wikes_backend):
+    return toolkit.load_graph(wikes_backend, wikes_dataset)
+
+
+def _ego(reference, root, hops):
+    """Nodes within `hops` of `root`, and the triples reached from the nodes closer than `hops`."""
+    undirected, triples = reference
+    nodes = set(nx.ego_graph(undirected, root, radius=hops))
+    distances = nx.single_source_shortest_path_length(undirected, root, cutoff=hops)
+    edges = sorted((s, p, o) for s, p, o in triples
+                   if s in nodes and o in nodes and min(distances[s], distances[o]) < hops)
+    return nodes, edges
+
+
+def _check_layout(G, subgraph, root):
+    assert subgraph.entity_identifiers[0] == root
+    assert len(set(subgraph.entity_identifiers)) == len(subgraph.entity_identifiers)
+    subjects, _, objects = zip(*G.triple_ids_to_keys(subgraph.triple_ids)) if len(subgraph.triple_ids) else ((), (), ())
+    identifiers = np.array(subgraph.entity_identifiers, dtype=object)
+    assert identifiers[subgraph.edge_index[0]].tolist() == list(subjects)
+    assert identifiers[subgraph.edge_index[1]].tolist() == list(objects)
+    index = G.graph_index()
+    assert np.array_equal(subgraph.edge_type, index.predicates[subgraph.triple_ids])
+
+
+@pytest.mark.parametrize('hops', [0, 1, 2])
+def test_subgraph_matches_ego_graph(graph, reference, hops):
+    roots = graph.root_entity_ids()[:ROOTS]
+    batch = graph.subgraph(roots, hops)
+    assert len(batch) == len(roots)
+    assert batch.node_ptr[-1] == batch.node_ids.shape[0] and batch.edge_ptr[-1] == batch.triple_ids.shape[0]
+    for root, subgraph in zip(roots, batch):
+        nodes, edges = _ego(reference, root, hops)
+        assert set(subgraph.entity_identifiers) == nodes
+        assert sorted(graph.triple_ids_to_keys(subgraph.triple_ids)) == edges
+        _check_layout(graph, subgraph, root)
+
+
+@pytest.mark.parametrize('max_edges', [1, 5, 40])
+def test_subgraph_caps_edges_per_root(graph, max_edges):
+    roots = graph.root_entity_ids()[:ROOTS]
+    full = graph.subgraph(roots, 2)
+    capped = graph.subgraph(roots, 2, max_edges)
+    for root, full_subgraph, subgraph in zip(roots, full, capped):
+        triple_ids = set(subgraph.triple_ids.tolist())
+        assert len(triple_ids) == len(subgraph.triple_ids) == min(max_edges, len(full_subgraph.triple_ids))
+        assert triple_ids <= set(full_subgraph.triple_ids.tolist())
+        incident = set(graph.graph_index().incident_triples(graph.graph_index().entity_positions([root])[0]).tolist())
+        if len(incident) <= max_edges:
+            assert incident <= triple_ids
+        else:
+            assert triple_ids <= incident
+        endpoints = {identifier for s, _, o in graph.triple_ids_to_keys(subgraph.triple_ids) for identifier in (s, o)}
+        assert set(subgraph.entity_identifiers) == endpoints | {root}
+        _check_layout(graph, subgraph, root)
+
+
+def test_subgraph_defaults_to_root_entities(graph):
+    batch = graph.subgraph(hops=1)
+    assert [subgraph.entity_identifiers[0] for subgraph in batch] == graph.root_entity_ids()
+    with pytest.raises(ValueError):
+        graph.subgraph(['no-such-entity'])
+    with pytest.raises(ValueError):
+        graph.subgraph(hops=-1)
@@ -0,0 +1,22 @@
+import logging
+
+import pytest
+
+from wikes_toolkit.synthetic.synthetic_generator import generate_synthetic_dataset, SyntheticGraphGenerator
+from wikes_toolkit.toolkit import WikESToolkit
+from wikes_toolkit.wikes.wikes_graph import WikESGraph
+
+
+def test_generator_writes_total_triples(toolkit, wikes_dataset, esbm_dataset):
+    G = toolkit._read_graph(wikes_dataset)
+    assert G.number_of_edges() == 15_000
+    assert len(set(G.edges(data='predicate'))) == 15_000
+    assert toolkit._read_graph(esbm_dataset).number_of_edges() == 10_000
+
+
+def test_generator_fills_dense_graphs(tmp_path):
+    dataset = generate_synthetic_dataset(tmp_path, 'dense', total_entities=20, total_triples=1_000,
+                                         total_root_entities=2, total_predicates=3, seed=3)
+    assert WikESToolkit(tmp_path, logging.WARNING).load_graph(WikESGraph, dataset).total_triples() == 1_000
+    with pytest.raises(ValueError):
+        SyntheticGraphGenerator(total_entities=20, total_triples=2_000, total_root_entities=2, total_predicates=3)
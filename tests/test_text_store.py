@@ -0,0 +1,48 @@
+import logging
+import os
+
+from wikes_toolkit.base.text_store import TextStore, source_stamp
+from wikes_toolkit.synthetic.synthetic_generator import generate_synthetic_dataset
+from wikes_toolkit.toolkit import WikESToolkit
+from wikes_toolkit.wikes.wikes_graph import WikESGraph
+
+TEXT_FIELDS = ('wikidata_label', 'wikidata_description', 'wikipedia_title')
+
+
+def _text(G):
+    entities = [tuple(getattr(entity, name) for name in TEXT_FIELDS) for entity in G.entities()]
+    predicates = [(predicate.label, predicate.description) for predicate in G.predicates()]
+    return entities, predicates
+
+
+def test_offloaded_text_matches_graph(toolkit, wikes_dataset):
+    G = toolkit.load_graph(WikESGraph, wikes_dataset)
+    offloaded = toolkit.load_graph(WikESGraph, wikes_dataset, keep_networkx=False, offload_text=True)
+    assert _text(offloaded) == _text(G)
+    assert offloaded.fetch_root_entity(G.root_entity_ids()[0]).wikipedia_title is not None
+
+    entities = offloaded.entities()
+    assert len({id(entity.text) for entity in entities}) == 1
+    assert not any(name in entity.__dict__ for entity in entities for name in TEXT_FIELDS)
+    assert not any('wikipedia_title' in entity.__dict__ for entity in G.entities() if entity.wikipedia_title is None)
+
+
+def test_plain_text_store_follows_dataset(tmp_path):
+    toolkit = WikESToolkit(tmp_path, logging.WARNING)
+    settings = dict(total_entities=500, total_triples=2_000, total_root_entities=10, total_predicates=20)
+    dataset = generate_synthetic_dataset(tmp_path, 'text-store', seed=1, **settings)
+    dataset_path = toolkit.dataset_path(dataset)
+    toolkit.load_graph(WikESGraph, dataset, offload_text=True)
+    first = TextStore.open(toolkit.text_store_path(dataset)).source
+    assert first == source_stamp(dataset_path)
+
+    built = os.stat(toolkit.text_store_path(dataset)).st_mtime_ns
+    toolkit.load_graph(WikESGraph, dataset, offload_text=True)
+    assert os.stat(toolkit.text_store_path(dataset)).st_mtime_ns == built
+
+    generate_synthetic_dataset(tmp_path, 'text-store', seed=2, **settings)
+    os.utime(dataset_path, ns=(first['mtime_ns'] + 1, first['mtime_ns'] + 1))
+    G = toolkit.load_graph(WikESGraph, dataset, offload_text=True)
+    rebuilt = TextStore.open(toolkit.text_store_path(dataset)).source
+    assert rebuilt == source_stamp(dataset_path) != first
+    assert _text(G) == _text(toolkit.load_graph(WikESGraph, dataset))
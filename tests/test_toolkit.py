@@ -0,0 +1,10 @@
+import logging
+
+from wikes_toolkit.base.dataset_store import DatasetStore
+from wikes_toolkit.toolkit import WikESToolkit
+
+
+def test_locate_falls_back_to_plain_layout(save_path, wikes_dataset, tmp_path):
+    toolkit = WikESToolkit(save_path, logging.WARNING, store=DatasetStore(tmp_path / 'store'))
+    assert toolkit.locate(wikes_dataset) == toolkit.dataset_path(wikes_dataset)
+    assert toolkit.locate_converted(wikes_dataset) is None
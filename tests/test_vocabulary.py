@@ -0,0 +1,101 @@
+import copy
+import logging
+
+import numpy as np
+import pytest
+
+from wikes_toolkit.base.vocabulary import Vocabulary
+from wikes_toolkit.toolkit import WikESToolkit
+from wikes_toolkit.wikes.wikes_graph import WikESGraph
+from wikes_toolkit.wikes.wikes_pandas_graph import PandasWikESGraph
+
+
+def _networkx(toolkit, dataset):
+    return toolkit.load_graph(WikESGraph, dataset).networkx_graph()
+
+
+def _check_shared_edges(G):
+    assert G._adj is G._succ
+    for u, neighbors in G._succ.items():
+        for v, keys in neighbors.items():
+            assert G._pred[v][u] is keys
+            for key, data in keys.items():
+                assert G._pred[v][u][key] is data
+
+
+def test_intern_graph_keeps_structure(toolkit, wikes_dataset):
+    G = _networkx(toolkit, wikes_dataset)
+    reference = copy.deepcopy(G)
+    vocabulary = Vocabulary()
+    assert vocabulary.intern_graph(G) is G
+
+    assert list(G.nodes(data=True)) == list(reference.nodes(data=True))
+    assert list(G.edges(keys=True, data=True)) == list(reference.edges(keys=True, data=True))
+    assert list(G.in_edges(keys=True)) == list(reference.in_edges(keys=True))
+    _check_shared_edges(G)
+
+    other = _networkx(toolkit, wikes_dataset)
+    assert any(a is not b for a, b in zip(G.nodes, other.nodes))
+    vocabulary.intern_graph(other)
+    assert all(a is b for a, b in zip(G.nodes, other.nodes))
+    for (_, _, data), (_, _, other_data) in zip(G.edges(data=True), other.edges(data=True)):
+        assert data['predicate'] is other_data['predicate']
+    _check_shared_edges(other)
+
+    G.add_edge('Q1', 'Q2', predicate='P1')
+    assert G.has_edge('Q1', 'Q2') and 'Q1' in G.predecessors('Q2')
+
+
+def test_codes_survive_save_and_reload(toolkit, wikes_dataset, tmp_path):
+    G = _networkx(toolkit, wikes_dataset)
+    vocabulary = Vocabulary(tmp_path / 'vocabulary.npz')
+    vocabulary.intern_graph(G)
+    nodes = list(G.nodes)
+    codes = vocabulary.codes(nodes)
+    assert (codes >= 0).all()
+    assert vocabulary.codes(['not in the vocabulary']).tolist() == [-1]
+    assert vocabulary.strings(codes).tolist() == nodes
+    vocabulary.save()
+
+    reloaded = Vocabulary(tmp_path / 'vocabulary.npz')
+    assert len(reloaded) == len(vocabulary)
+    assert np.array_equal(reloaded.codes(nodes), codes)
+    assert [reloaded.string(i) for i in range(len(reloaded))] == [vocabulary.string(i) for i in range(len(vocabulary))]
+
+    other = _networkx(toolkit, wikes_dataset)
+    reloaded.intern_graph(other)
+    assert list(other.nodes(data=True)) == list(G.nodes(data=True))
+    assert list(other.edges(keys=True, data=True)) == list(G.edges(keys=True, data=True))
+    _check_shared_edges(other)
+    assert len(reloaded) == len(vocabulary)
+    assert np.array_equal(reloaded.codes(list(other.nodes)), codes)
+    assert reloaded.codes([reloaded.intern('new string')]).tolist() == [len(vocabulary)]
+
+
+def test_save_and_load_errors(tmp_path):
+    with pytest.raises(ValueError):
+        Vocabulary().save()
+    path = tmp_path / 'other.npz'
+    np.savez(path, format=np.frombuffer(b'something-else', dtype=np.uint8), version=np.array(1),
+             data=np.zeros(0, dtype=np.uint8), offsets=np.zeros(1, dtype=np.int64))
+    with pytest.raises(ValueError):
+        Vocabulary(path)
+
+
+def test_toolkit_codes_are_shared(save_path, wikes_dataset, tmp_path):
+    plain = WikESToolkit(save_path, logging.WARNING).load_graph(PandasWikESGraph, wikes_dataset)
+    vocabulary = Vocabulary(tmp_path / 'vocabulary.npz')
+    toolkit = WikESToolkit(save_path, logging.WARNING, vocabulary=vocabulary)
+    G = toolkit.load_graph(PandasWikESGraph, wikes_dataset)
+    triple_ids = np.arange(G.graph_index().total_triples)
+    assert G.triple_ids_to_keys(triple_ids) == plain.triple_ids_to_keys(triple_ids)
+    assert G.root_entity_ids() == plain.root_entity_ids()
+
+    codes = G.entity_codes(vocabulary)
+    assert (codes >= 0).all()
+    vocabulary.save()
+    reloaded = Vocabulary(tmp_path / 'vocabulary.npz')
+    again = WikESToolkit(save_path, logging.WARNING, vocabulary=reloaded).load_graph(WikESGraph, wikes_dataset)
+    assert np.array_equal(reloaded.codes(G.graph_index().entity_ids), codes)
+    assert np.array_equal(again.predicate_codes(reloaded), reloaded.codes(again.graph_index().predicate_ids))
+    assert len(reloaded) == len(vocabulary)